@@ -0,0 +1,89 @@
+# benchmarks/bench_convert.py
+"""
+PNG -> JPEG 변환의 최대 메모리와 처리량 벤치마크.
+기존 전체 크기 합성(split + 흰 배경 paste)과 띠 단위 합성(flatten_alpha), 불투명 알파의 합성 생략을 비교합니다.
+경우마다 새 인터프리터에서 실행하여 최대 RSS(ru_maxrss)를 잽니다. (resource 모듈이 없는 Windows에서는 메모리 생략)
+
+실행: python -m benchmarks.bench_convert [--megapixels 100] [--repeat 1]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+_PROBE = """
+import json, sys, time
+from PIL import Image
+from benchmarks.bench_convert import convert, peak_rss_mb
+Image.MAX_IMAGE_PIXELS = None
+t = time.perf_counter()
+size = convert(sys.argv[1], sys.argv[2])
+print(json.dumps({"seconds": time.perf_counter() - t, "peak_mb": peak_rss_mb(), "jpeg_bytes": size}))
+"""
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024 # macOS는 바이트, Linux는 KiB
+
+def _legacy_flatten(img):
+    """변경 전 구현 (비교 기준): 전체 크기 밴드 분리 + 흰 배경에 paste."""
+    from PIL import Image
+    background = Image.new('RGB', img.size, (255, 255, 255))
+    background.paste(img, mask=img.split()[3])
+    return background
+
+def convert(method: str, path: str) -> int:
+    """PNG를 열어 method 방식으로 합성한 뒤 JPEG로 인코딩하고, 인코딩한 크기를 반환합니다."""
+    import io
+    from PIL import Image
+    from src.convert.image_to_jpg import flatten_alpha
+    img = Image.open(path) # convert_to_jpg와 같이 합성 결과로 바꿔 원본 RGBA를 인코딩 전에 해제
+    img = _legacy_flatten(img) if method == "legacy" else flatten_alpha(img)
+    encoded = io.BytesIO()
+    img.save(encoded, "jpeg")
+    return encoded.tell()
+
+def _make_png(path: str, megapixels: float, opaque: bool):
+    """그라디언트로 만든 RGBA PNG. opaque이면 알파를 모두 255로 둡니다."""
+    from PIL import Image
+    Image.MAX_IMAGE_PIXELS = None
+    side = int((megapixels * 1_000_000) ** 0.5)
+    gradient = Image.linear_gradient('L').resize((side, side))
+    channels = [gradient, gradient.transpose(Image.Transpose.ROTATE_90), Image.radial_gradient('L').resize((side, side))]
+    alpha = Image.new('L', (side, side), 255) if opaque else gradient.transpose(Image.Transpose.ROTATE_270)
+    Image.merge('RGBA', channels + [alpha]).save(path, compress_level=1)
+
+def _run(method: str, path: str, repeat: int) -> dict:
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", _PROBE, method, path], capture_output=True, text=True, check=True)
+        runs.append(json.loads(out.stdout))
+    return min(runs, key=lambda r: r["seconds"])
+
+def main():
+    parser = argparse.ArgumentParser(description="PNG -> JPEG 변환 메모리/처리량 벤치마크")
+    parser.add_argument("--megapixels", type=float, default=100, help="테스트 이미지 크기 (메가픽셀)")
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for opaque in (False, True):
+            path = os.path.join(tmp_dir, f"scan_{'opaque' if opaque else 'alpha'}.png")
+            started = time.perf_counter()
+            _make_png(path, args.megapixels, opaque)
+            print(f"{'불투명' if opaque else '반투명'} 알파 {args.megapixels:g} MP PNG 생성: "
+                  f"{os.path.getsize(path) / 1024 ** 2:.1f} MiB ({time.perf_counter() - started:.1f}s)")
+            for method in ("legacy", "strip"):
+                result = _run(method, path, args.repeat)
+                memory = f"최대 RSS {result['peak_mb']:8.1f} MiB" if result["peak_mb"] is not None else "메모리 측정 불가"
+                print(f"  {method:<8} {result['seconds']:7.2f}s {args.megapixels / result['seconds']:7.1f} MP/s  {memory}")
+
+if __name__ == "__main__":
+    main()
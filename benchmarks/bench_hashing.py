@@ -0,0 +1,66 @@
+# benchmarks/bench_hashing.py
+"""
+calculate_md5 벤치마크.
+기존 8 KiB read 루프와 새 readinto/mmap 경로, 그리고 멀티스레드 해시 처리량을 비교합니다.
+
+실행: python -m benchmarks.bench_hashing [--size-mb 512] [--threads 4]
+"""
+import argparse
+import hashlib
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.scanner import calculate_md5
+
+def _legacy_md5(file_path, chunk_size=8192):
+    """변경 전 구현 (비교 기준)."""
+    hasher = hashlib.md5()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+def _measure(label, func, total_bytes):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    throughput = total_bytes / elapsed / (1024 * 1024)
+    print(f"{label:<32} {elapsed:8.3f}s {throughput:10.1f} MiB/s")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="calculate_md5 벤치마크")
+    parser.add_argument("--size-mb", type=int, default=256, help="테스트 파일 크기 (MiB)")
+    parser.add_argument("--threads", type=int, default=4, help="동시 해시 스레드 수")
+    args = parser.parse_args()
+
+    size = args.size_mb * 1024 * 1024
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = []
+        for i in range(args.threads):
+            path = os.path.join(tmp_dir, f"sample_{i}.bin")
+            with open(path, 'wb') as f:
+                remaining = size
+                while remaining > 0:
+                    block = os.urandom(min(remaining, 4 * 1024 * 1024))
+                    f.write(block)
+                    remaining -= len(block)
+            paths.append(path)
+
+        assert _legacy_md5(paths[0]) == calculate_md5(paths[0]) == calculate_md5(paths[0], use_mmap=True)
+
+        print(f"파일 크기: {args.size_mb} MiB, 스레드: {args.threads}")
+        base = _measure("legacy 8 KiB read", lambda: _legacy_md5(paths[0]), size)
+        new = _measure("readinto 1 MiB", lambda: calculate_md5(paths[0], use_mmap=False), size)
+        _measure("mmap", lambda: calculate_md5(paths[0], use_mmap=True), size)
+        print(f"단일 스레드 개선: {base / new:.2f}x")
+
+        total = size * len(paths)
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            _measure("legacy x threads", lambda: list(pool.map(_legacy_md5, paths)), total)
+            _measure("readinto x threads", lambda: list(pool.map(calculate_md5, paths)), total)
+
+if __name__ == "__main__":
+    main()
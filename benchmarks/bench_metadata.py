@@ -0,0 +1,86 @@
+# benchmarks/bench_metadata.py
+"""
+메타데이터 쓰기 처리량 벤치마크.
+형식별 기존 프로세서(JPG: piexif, MP4/MOV: ffmpeg 리먹스, CR3: ExifTool 1회 실행)와
+상주 ExifTool 세션 통합 백엔드(파일별 실행 / 여러 파일 일괄 실행)의 초당 처리 파일 수를 비교합니다.
+JPG 샘플은 자동으로 만들고, 동영상/CR3는 --sample로 준 파일을 복제해 사용합니다.
+바이너리가 없는 백엔드는 건너뜁니다.
+
+실행: python -m benchmarks.bench_metadata [--count 200] [--sample clip.mp4 --sample photo.cr3]
+"""
+import argparse
+import importlib
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from src.metadata.base import PROCESSOR_REGISTRY, METADATA_BACKENDS
+
+DATETIME = "2026:01:05 09:00:00"
+
+def _load(entry):
+    module_name, class_name = entry
+    module = importlib.import_module(f"src.metadata.{module_name}")
+    return getattr(module, class_name)()
+
+def _make_samples(directory: Path, source: Path, count: int) -> list:
+    paths = []
+    for i in range(count):
+        path = directory / f"sample_{i}{source.suffix.lower()}"
+        shutil.copyfile(source, path)
+        paths.append(path)
+    return paths
+
+def _measure(label: str, func, count: int, total_bytes: int):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {elapsed:8.3f}s {count / elapsed:10.1f} files/s {total_bytes / elapsed / 1024 ** 2:10.1f} MiB/s")
+
+def bench_format(source: Path, count: int, tmp_dir: Path):
+    extension = source.suffix.lower()
+    print(f"[{extension}] {count}개, 파일당 {source.stat().st_size / 1024:.0f} KiB")
+    total_bytes = source.stat().st_size * count
+    backends = [("기존 프로세서", PROCESSOR_REGISTRY[extension]), ("exiftool 세션", METADATA_BACKENDS['exiftool'])]
+    for label, entry in backends:
+        try:
+            processor = _load(entry)
+        except FileNotFoundError as e:
+            print(f"  {label:<28} 건너뜀 ({e})")
+            continue
+        run_dir = tmp_dir / f"{extension[1:]}_{entry[0]}"
+        run_dir.mkdir()
+        paths = _make_samples(run_dir, source, count)
+        try:
+            _measure(f"{label} (파일별)", lambda: [processor.write_metadata(str(p), DATETIME) for p in paths], count, total_bytes)
+            if hasattr(processor, "write_many"):
+                # 일괄 경로는 벤치마크 전용 (처리 파이프라인은 파일별 write_metadata 사용)
+                _measure(f"{label} (일괄)", lambda: processor.write_many([(str(p), DATETIME) for p in paths]), count, total_bytes)
+        finally:
+            close = getattr(processor, "close", None)
+            if close:
+                close()
+
+def main():
+    parser = argparse.ArgumentParser(description="메타데이터 쓰기 처리량 벤치마크")
+    parser.add_argument("--count", type=int, default=200, help="형식별 파일 수")
+    parser.add_argument("--sample", action="append", default=[], help="동영상/CR3 샘플 파일 (형식마다 하나, 반복 지정)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        from PIL import Image
+        jpg = tmp_dir / "source.jpg"
+        Image.new("RGB", (1920, 1080), (90, 120, 200)).save(jpg, quality=90)
+        for source in [jpg] + [Path(s) for s in args.sample]:
+            if source.suffix.lower() not in PROCESSOR_REGISTRY:
+                print(f"지원하지 않는 형식: {source}")
+                continue
+            bench_format(source, args.count, tmp_dir)
+    if os.name == "nt":
+        print("참고: Windows에서는 프로세스 생성 비용이 커서 세션 방식의 이득이 더 큽니다.")
+
+if __name__ == "__main__":
+    main()
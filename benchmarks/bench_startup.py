@@ -0,0 +1,94 @@
+# benchmarks/bench_startup.py
+"""
+시작 시간 및 파일당 프로세서 조회 오버헤드 벤치마크.
+- orchestrator 임포트 시간과, 임포트 직후 Pillow/piexif가 로드되었는지 여부
+- get_metadata_processor 호출당 비용 (캐시된 인스턴스 vs 매 호출 생성)
+- GUI 창 표시까지의 시간 (목표 200 ms 미만, 디스플레이가 없으면 건너뜀)과 백그라운드 시작 작업(도구 확인 + 예열) 시간
+
+실행: python -m benchmarks.bench_startup [--repeat 5]
+"""
+import argparse
+import json
+import subprocess
+import sys
+import timeit
+
+_IMPORT_PROBE = (
+    "import time, sys, json; t = time.perf_counter(); import src.orchestrator; "
+    "print(json.dumps({'seconds': time.perf_counter() - t, "
+    "'PIL': 'PIL' in sys.modules, 'piexif': 'piexif' in sys.modules}))"
+)
+
+_WINDOW_PROBE = (
+    "import time, json; t = time.perf_counter(); import tkinter as tk; from src.gui import MainApplication; "
+    "root = tk.Tk(); app = MainApplication(root); root.update(); shown = time.perf_counter() - t; "
+    "app.startup_tasks.join(); "
+    "print(json.dumps({'window_seconds': shown, 'background_seconds': time.perf_counter() - t, "
+    "'prewarm_seconds': app.startup_tasks.prewarm_seconds, 'versions': app.startup_tasks.versions})); root.destroy()"
+)
+
+def measure_window(repeat: int):
+    """새 인터프리터에서 Tk 창이 그려질 때까지의 시간을 측정합니다 (최솟값). 디스플레이가 없으면 None."""
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", _WINDOW_PROBE], capture_output=True, text=True)
+        if out.returncode != 0:
+            return None # TclError: no display name 등
+        runs.append(json.loads(out.stdout))
+    return min(runs, key=lambda r: r["window_seconds"])
+
+def measure_import(repeat: int) -> dict:
+    """새 인터프리터에서 orchestrator 임포트 시간을 측정합니다 (최솟값)."""
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", _IMPORT_PROBE], capture_output=True, text=True, check=True)
+        runs.append(json.loads(out.stdout))
+    best = min(runs, key=lambda r: r["seconds"])
+    return best
+
+def _legacy_jpg_lookup():
+    """변경 전 get_metadata_processor('.jpg')의 동작: 매 호출 임포트 문 3개 + 인스턴스 생성."""
+    from src.metadata.jpg_piexif import JpgPiexifProcessor
+    from src.metadata.video_ffmpeg import VideoFfmpegProcessor
+    from src.metadata.raw_exiftool import RawExiftoolProcessor
+    return JpgPiexifProcessor()
+
+def _legacy_video_binary_check():
+    """변경 전 VideoFfmpegProcessor.__init__의 파일당 비용: 경로 계산 2회 + os.path.exists 2회."""
+    import os
+    from src import paths
+    for getter in (paths.get_ffmpeg_path, paths.get_ffprobe_path):
+        os.path.exists(getter.__wrapped__())
+
+def measure_lookup(number: int = 20000) -> dict:
+    """파일당 프로세서 조회 비용 (초/호출)."""
+    from src.metadata.base import get_metadata_processor
+    get_metadata_processor('.jpg') # 워밍업
+    return {
+        "jpg_cached": timeit.timeit(lambda: get_metadata_processor('.jpg'), number=number) / number,
+        "jpg_legacy": timeit.timeit(_legacy_jpg_lookup, number=number) / number,
+        "video_binary_check_legacy": timeit.timeit(_legacy_video_binary_check, number=number) / number,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="시작 시간/프로세서 조회 벤치마크")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    result = measure_import(args.repeat)
+    print(f"orchestrator 임포트: {result['seconds'] * 1000:.1f} ms "
+          f"(PIL 로드: {result['PIL']}, piexif 로드: {result['piexif']})")
+    window = measure_window(args.repeat)
+    if window is None:
+        print("GUI 창 표시: 디스플레이가 없어 건너뜀")
+    else:
+        print(f"GUI 창 표시: {window['window_seconds'] * 1000:.1f} ms (목표 200 ms 미만), "
+              f"백그라운드 시작 작업 완료: {window['background_seconds'] * 1000:.1f} ms (예열 {window['prewarm_seconds'] * 1000:.1f} ms)")
+        print("외부 도구: " + ", ".join(f"{name}={version or '없음'}" for name, version in window["versions"].items()))
+    lookup = measure_lookup()
+    print(f"get_metadata_processor('.jpg'): 캐시 {lookup['jpg_cached'] * 1e6:.2f} us/호출, "
+          f"변경 전 {lookup['jpg_legacy'] * 1e6:.2f} us/호출")
+    print(f"동영상/RAW 파일당 바이너리 확인 (변경 전, 현재는 실행당 1회): {lookup['video_binary_check_legacy'] * 1e6:.2f} us/파일")
+
+if __name__ == "__main__":
+    main()
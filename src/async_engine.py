@@ -0,0 +1,225 @@
+# src/async_engine.py
+import os
+import asyncio
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Union
+
+from .scanner import scan_files, FileInfo, calculate_md5, get_result_root
+from .date_resolver import resolve_date
+from .naming import standardize_filename, handle_duplicates_and_rename, STAGING_PREFIX
+from .logging_i18n import get_log_message, log_error_to_file
+from .errors import ProcessingCancelled, FileOperationError
+from .control import RunControl, set_active_control, in_current_context
+from .external import get_scheduler, format_tool_stats
+from .metadata.base import reset_processor_cache
+from .summary import new_summary, create_summary_report
+from .steps import handle_conversion_or_copy_async, _handle_metadata_async
+from .context import PipelineContext, merge_counters
+from .preflight import apply_preflight
+from .manifest import prepare_manifest
+
+# 단계별 동시 실행 수 기본값
+DEFAULT_STAGE_LIMITS = {"produce": 4, "metadata": 4, "hash": 2}
+
+class _AsyncRun:
+    """비동기 실행 한 번의 공유 상태."""
+    def __init__(self, file_list, queue, control, stage_limits, executor):
+        self.file_list = file_list
+        self.queue = queue
+        self.control = control
+        self.executor = executor
+        self.limits = {name: asyncio.Semaphore(n) for name, n in stage_limits.items()}
+        self.time_offset_counters = defaultdict(int)
+        self.summary = new_summary()
+        self.completed = 0
+        self.staged_paths = {} # index -> 임시 이름의 결과 파일 경로 (취소 시 정리용)
+
+        # 같은 스코프 내 메타데이터 단계, 같은 결과 디렉토리 내 파일명 단계는 정렬 순서대로 실행한다.
+        loop = asyncio.get_running_loop()
+        self.metadata_done = [loop.create_future() for _ in file_list]
+        self.naming_done = [loop.create_future() for _ in file_list]
+        self.date_infos = [resolve_date(f.absolute_path) for f in file_list]
+        self.scope_predecessor = [None] * len(file_list)
+        self.dir_predecessor = [None] * len(file_list)
+        last_in_scope, last_in_dir = {}, {}
+        for index, file_info in enumerate(file_list):
+            date_info = self.date_infos[index]
+            if date_info["found"]:
+                scope_key = date_info["scope_key"]
+                self.scope_predecessor[index] = last_in_scope.get(scope_key)
+                last_in_scope[scope_key] = index
+            self.dir_predecessor[index] = last_in_dir.get(file_info.relative_path)
+            last_in_dir[file_info.relative_path] = index
+
+    async def run_stage(self, stage, coroutine_func, *args):
+        """단계별 동시 실행 수 제한 하에 코루틴을 실행합니다. (외부 도구는 ToolScheduler.run_async로 이벤트 루프에서 실행)"""
+        async with self.limits[stage]:
+            await self.checkpoint()
+            return await coroutine_func(*args)
+
+    async def run_blocking(self, stage, func, *args):
+        async with self.limits[stage]:
+            await self.checkpoint()
+            return await asyncio.get_running_loop().run_in_executor(self.executor, in_current_context(func), *args)
+
+    async def checkpoint(self):
+        """이벤트 루프를 막지 않는 취소/일시정지 확인."""
+        while self.control.is_paused and not self.control.is_cancelled:
+            await asyncio.sleep(0.2)
+        if self.control.is_cancelled:
+            raise ProcessingCancelled("작업이 사용자에 의해 취소되었습니다.")
+
+    async def wait_for(self, futures, index):
+        if index is not None:
+            await asyncio.shield(futures[index])
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+async def _process_one(run: _AsyncRun, index: int):
+    file_info: FileInfo = run.file_list[index]
+    date_info = run.date_infos[index]
+    log = PipelineContext(index) # 파일 하나의 로그와 요약을 모아 두었다가 처리 완료 시 한 번에 전달
+    local_summary = log.summary
+    staged_path = None
+    content_hash = None
+    try:
+        try:
+            if date_info["found"]:
+                log.put(('log', f"  기준 날짜 폴더 발견: {date_info['ymd']} (스코프: {date_info['scope_key'][0]})"))
+            else:
+                log.put(('log', "  기준 날짜 폴더를 찾지 못했습니다. 메타데이터 수정 스킵."))
+
+            # 1. 결과 파일 생성 (복사/변환) - 파일 간 순서 무관
+            result_dir = file_info.result_root / file_info.relative_path
+            os.makedirs(result_dir, exist_ok=True)
+            staged_path = await run.run_stage("produce", handle_conversion_or_copy_async, file_info, result_dir, local_summary, log, _staging_prefix(index), run.executor)
+            if staged_path:
+                run.staged_paths[index] = staged_path
+        finally:
+            # 2. 메타데이터 - 같은 스코프 내에서는 정렬 순서대로 (시간 오프셋 결정성)
+            try:
+                await run.wait_for(run.metadata_done, run.scope_predecessor[index])
+                if staged_path:
+                    await run.run_stage("metadata", _handle_metadata_async, Path(staged_path), date_info, run.time_offset_counters, local_summary, log, file_info.missing_tools)
+            finally:
+                _resolve(run.metadata_done[index])
+
+        if staged_path:
+            # 3. 해시 - 순서 무관
+            content_hash = await run.run_blocking("hash", calculate_md5, staged_path)
+            log.put(('log', f"  파일 콘텐츠 MD5 해시 계산 완료: {content_hash[:5]}..."))
+    finally:
+        # 4. 파일명 표준화 - 같은 결과 디렉토리 내에서는 정렬 순서대로 (중복 접미사 결정성)
+        try:
+            await run.wait_for(run.naming_done, run.dir_predecessor[index])
+            if staged_path and os.path.exists(staged_path) and not run.control.is_cancelled:
+                _finalize_name(staged_path, index, content_hash, local_summary, log)
+                run.staged_paths.pop(index, None)
+        finally:
+            _resolve(run.naming_done[index])
+            _report(run, index, log, local_summary)
+
+def _staging_prefix(index: int) -> str:
+    return f"{STAGING_PREFIX}{index}_"
+
+def _finalize_name(staged_path, index: int, content_hash, summary, log):
+    """임시 이름의 결과 파일에 최종 이름을 부여합니다. 해시가 없으면(앞 단계 실패) 원래 이름으로 둡니다."""
+    original_name = Path(staged_path).name[len(_staging_prefix(index)):]
+    if content_hash is None:
+        handle_duplicates_and_rename(str(staged_path), original_name, summary)
+        return
+    final_path = standardize_filename(str(staged_path), content_hash, summary, current_filename=original_name)
+    if os.path.basename(final_path) != original_name:
+        log.put(('log', f"  파일명 표준화: {original_name} -> {os.path.basename(final_path)}"))
+    else:
+        log.put(('log', f"  파일명 표준화: 변경 없음 ({original_name})"))
+
+def _report(run: _AsyncRun, index: int, log: PipelineContext, local_summary):
+    """파일 하나의 로그/요약/진행률을 GUI 큐에 반영합니다. (이벤트 루프 스레드에서만 호출)"""
+    file_info = run.file_list[index]
+    total = len(run.file_list)
+    run.queue.put(('log', f"[{index + 1}/{total}] 파일 처리 시작: {file_info.filename}"))
+    for event in log.events:
+        run.queue.put(event)
+    merge_counters(run.summary, local_summary)
+    run.completed += 1
+    progress_val = (run.completed / total) * 100
+    run.queue.put(('progress', progress_val, f"{run.completed}/{total} ({progress_val:.2f}%)"))
+
+async def _guarded(run: _AsyncRun, index: int):
+    try:
+        await _process_one(run, index)
+        run.summary['processed_files'] += 1
+    except ProcessingCancelled:
+        raise
+    except Exception as e:
+        file_info = run.file_list[index]
+        run.queue.put(('log', f"  {get_log_message('CONVERT_FAIL')} ({file_info.filename})"))
+        log_error_to_file(str(file_info.absolute_path), "MAIN_PIPELINE", e)
+        run.summary['failed_files'] += 1
+
+async def process_files_async(source_root, queue, control: Union[RunControl, None] = None, stage_limits: Union[dict, None] = None, output_root=None):
+    """
+    asyncio 기반 파이프라인 엔진.
+    복사/변환, 메타데이터, 해시 단계를 단계별 동시 실행 수 제한 하에 여러 파일에 걸쳐 겹쳐 실행합니다.
+    외부 도구(ffprobe/ffmpeg/exiftool/magick)는 ToolScheduler.run_async로 이벤트 루프에서 실행되며,
+    도구별 동시 실행 수 제한, 타임아웃, 통계, 취소 시 종료는 다른 엔진과 같습니다.
+    복사, PNG 변환(Pillow), 해시, 프로세스 안에서 끝나는 메타데이터 처리(piexif, 상주 ExifTool 세션)는 스레드 풀에서 실행됩니다.
+
+    결정성: 같은 날짜 스코프의 메타데이터 단계와 같은 결과 디렉토리의 파일명 단계는
+    정렬 순서대로 실행되므로, 시간 오프셋과 중복 접미사는 순차 실행(process_files)과 같습니다.
+    로그는 파일 단위로 모아서 전달되며, GUI 큐 이벤트와 요약 키는 process_files와 동일합니다.
+    파일명 해시는 md5 방식만 지원하므로, 다른 방식(naming_hash)으로 만든 결과 트리에는 이어서 쓰지 않습니다.
+
+    제한: 결과 파일을 먼저 복사/변환한 뒤 메타데이터 단계에서 다시 기록하므로, 날짜를 기록하는(SET) 파일은
+    결과 파일을 두 번 씁니다. 오프셋은 앞 파일의 메타데이터 단계가 끝나야 정해지므로, 원본에서 미리 판정하여
+    한 번에 기록하면(process_files의 plan_output) 같은 스코프 안에서 복사/변환을 겹쳐 실행할 수 없기 때문입니다.
+    """
+    control = control or RunControl()
+    try:
+        prepare_manifest(get_result_root(source_root, output_root), "md5")
+    except FileOperationError as e:
+        queue.put(('log', str(e)))
+        queue.put(('error', str(e)))
+        return
+    file_list = scan_files(source_root, output_root)
+    file_list.sort(key=lambda x: (str(x.relative_path), x.filename.lower()))
+    queue.put(('log', f"총 {len(file_list)}개의 처리 대상 파일을 찾았습니다."))
+    queue.put(('log', "파일 목록을 결정적 순서로 정렬했습니다."))
+
+    skipped_summary = new_summary()
+    file_list = apply_preflight(file_list, source_root, skipped_summary, queue)
+
+    limits = dict(DEFAULT_STAGE_LIMITS)
+    limits.update(stage_limits or {})
+    set_active_control(control)
+    get_scheduler().reset_stats()
+    reset_processor_cache()
+    with ThreadPoolExecutor(max_workers=sum(limits.values())) as executor:
+        run = _AsyncRun(file_list, queue, control, limits, executor)
+        merge_counters(run.summary, skipped_summary)
+        try:
+            results = await asyncio.gather(*(_guarded(run, i) for i in range(len(file_list))), return_exceptions=True)
+        finally:
+            set_active_control(None)
+
+    cancelled = any(isinstance(r, ProcessingCancelled) for r in results)
+    if cancelled:
+        for staged_path in run.staged_paths.values():
+            if os.path.exists(staged_path):
+                os.remove(staged_path)
+        run.summary['cancelled_files'] = len(file_list) - run.summary['processed_files'] - run.summary['failed_files']
+
+    queue.put(('log', create_summary_report(run.summary) + format_tool_stats(get_scheduler().stats_snapshot())))
+    if cancelled:
+        queue.put(('cancelled', "작업이 취소되었습니다. 완료된 파일까지의 결과가 유지됩니다."))
+    else:
+        queue.put(('done', "모든 파일 처리가 완료되었습니다."))
+
+def run_async_pipeline(source_root, queue, control: Union[RunControl, None] = None, stage_limits: Union[dict, None] = None, output_root=None):
+    """process_files와 같은 시그니처로 비동기 엔진을 실행합니다. (Worker 스레드에서 호출)"""
+    asyncio.run(process_files_async(source_root, queue, control=control, stage_limits=stage_limits, output_root=output_root))
@@ -0,0 +1,95 @@
+# src/batching.py
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Union
+
+from .date_resolver import resolve_date
+from .naming import NameIndex
+
+# 다음 디렉토리를 미리 읽을 때 파일마다 실제로 읽어 두는 앞부분 크기 (EXIF 등 메타데이터는 대부분 앞부분에 있음)
+PREFETCH_HEAD_BYTES = 64 * 1024
+# 배치 하나에서 커널에 미리 읽기(WILLNEED)를 요청할 최대 바이트 수. 수 GB 동영상이 페이지 캐시를 밀어내지 않게 함
+PREFETCH_BATCH_BUDGET = 256 * 1024 * 1024
+
+class DirectoryBatch:
+    """
+    같은 소스 디렉토리(= 같은 결과 디렉토리)에 속한 파일 묶음.
+    같은 디렉토리의 파일은 기준 날짜도 같으므로 날짜 탐색, 결과 디렉토리 생성,
+    중복 검사용 디렉토리 나열을 배치당 한 번만 수행합니다.
+    """
+    def __init__(self, relative_path: Path, files: list, result_root: Path):
+        self.relative_path = relative_path
+        self.files = files
+        self.result_dir = result_root / relative_path
+        self.date_info = None
+        self.name_index: Union[NameIndex, None] = None
+
+    def resolve(self):
+        """읽기 전용 준비: 기준 날짜 탐색. (프리페치 스레드에서도 호출 가능)"""
+        if self.date_info is None:
+            self.date_info = resolve_date(self.files[0].absolute_path)
+        return self.date_info
+
+    def prepare(self):
+        """처리 직전 준비: 결과 디렉토리 생성(1회)과 파일명 인덱스 구성(디렉토리 나열 1회)."""
+        self.resolve()
+        os.makedirs(self.result_dir, exist_ok=True)
+        self.name_index = NameIndex.from_directory(self.result_dir)
+
+def group_by_directory(file_list: list, result_root: Path) -> list:
+    """
+    결정적 순서로 정렬된 파일 목록을 디렉토리 배치로 묶습니다.
+    정렬 키의 첫 번째 항목이 relative_path이므로 같은 디렉토리의 파일은 연속해 있습니다.
+    """
+    batches = []
+    for file_info in file_list:
+        if batches and batches[-1].relative_path == file_info.relative_path:
+            batches[-1].files.append(file_info)
+        else:
+            batches.append(DirectoryBatch(file_info.relative_path, [file_info], result_root))
+    return batches
+
+def _warm_file(path: Path, budget: int) -> int:
+    """
+    파일 앞부분(PREFETCH_HEAD_BYTES)을 읽어 페이지 캐시에 올립니다. 메타데이터를 따로 파싱하지는 않습니다.
+    남은 예산(budget) 안에서만 파일의 나머지도 커널에 미리 읽기를 요청하며, 예산을 넘는 큰 파일은 앞부분만 요청합니다.
+    Returns:
+        int: 예산에서 사용한 바이트 수
+    """
+    try:
+        with open(path, 'rb', buffering=0) as f:
+            advised = 0
+            if hasattr(os, 'posix_fadvise'):
+                size = os.fstat(f.fileno()).st_size
+                advised = size if size <= budget else 0
+                os.posix_fadvise(f.fileno(), 0, advised or PREFETCH_HEAD_BYTES, os.POSIX_FADV_WILLNEED)
+            f.read(PREFETCH_HEAD_BYTES)
+            return advised
+    except OSError:
+        return 0 # 프리페치는 최적화일 뿐이므로 실패해도 본 처리에서 다시 시도됨
+
+def _warm_batch(batch: DirectoryBatch):
+    batch.resolve()
+    budget = PREFETCH_BATCH_BUDGET
+    for file_info in batch.files:
+        budget -= _warm_file(file_info.absolute_path, budget)
+
+class DirectoryPrefetcher:
+    """
+    현재 디렉토리 배치를 처리(쓰기)하는 동안 다음 배치를 백그라운드 스레드에서 미리 읽습니다.
+    네트워크 공유(SMB)처럼 왕복 지연이 큰 소스에서 읽기와 쓰기를 겹치게 합니다.
+    """
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mdns-prefetch")
+        self._pending = None
+
+    def prefetch(self, batch: Union[DirectoryBatch, None]):
+        if batch is None:
+            return
+        self._pending = self._executor.submit(_warm_batch, batch)
+
+    def close(self):
+        if self._pending is not None:
+            self._pending.cancel()
+        self._executor.shutdown(wait=True)
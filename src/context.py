@@ -0,0 +1,110 @@
+# src/context.py
+import threading
+import multiprocessing
+from collections import defaultdict, deque
+from typing import Union
+
+class PipelineContext:
+    """
+    작업 하나(파일 하나의 한 단계)를 실행하는 동안 쓰는 상태. 피클 가능하여 프로세스 사이로 전달할 수 있습니다.
+    - summary: 이 작업에서만 증가한 로컬 카운터. 부모 프로세스에서 merge_counters로 합칩니다.
+    - put(): queue.Queue 대신 단계 함수에 넘기는 이벤트 수집기. 모은 이벤트는 send()로 이벤트 채널에 보냅니다.
+    공유 defaultdict나 queue.Queue를 직접 건드리지 않으므로 스레드/프로세스 어디서 실행해도 같습니다.
+    """
+    def __init__(self, index: int):
+        self.index = index
+        self.summary = defaultdict(int)
+        self.events = []
+
+    def put(self, event):
+        self.events.append(event)
+
+    def send(self):
+        """모은 이벤트를 현재 프로세스의 이벤트 채널로 보냅니다. 채널이 없으면 그대로 둡니다."""
+        if self.events and _worker_channel is not None:
+            _worker_channel.put((self.index, self.events))
+            self.events = []
+
+    def counters(self) -> dict:
+        return dict(self.summary)
+
+def merge_counters(target, source: dict):
+    """로컬 카운터를 요약 딕셔너리에 더합니다."""
+    for key, value in source.items():
+        target[key] += value
+
+# 워커 프로세스의 이벤트 채널 (init_worker에서 설정)
+_worker_channel = None
+
+def init_worker(channel_queue):
+    """ProcessPoolExecutor의 initializer. 워커 프로세스에 이벤트 채널 큐를 연결합니다."""
+    global _worker_channel
+    _worker_channel = channel_queue
+
+class EventChannel:
+    """
+    워커 프로세스에서 부모 프로세스로 이벤트를 전달하는 채널 (multiprocessing 큐).
+    워커는 PipelineContext.send()로 (작업 번호, 이벤트 목록)을 보내고,
+    부모의 수신 스레드가 handler(index, events)를 순서대로 호출합니다.
+    큐 객체는 ProcessPoolExecutor(initializer=init_worker, initargs=(channel.queue,))로 워커에 넘깁니다.
+    """
+    def __init__(self, handler, mp_context=None):
+        self.queue = (mp_context or multiprocessing.get_context()).Queue()
+        self._handler = handler
+        self._thread = threading.Thread(target=self._pump, daemon=True)
+        self._thread.start()
+
+    def _pump(self):
+        while True:
+            message = self.queue.get()
+            if message is None:
+                return
+            self._handler(*message)
+
+    def close(self):
+        """모든 워커가 종료된 뒤 호출합니다. 이미 보낸 이벤트를 모두 전달한 뒤 반환합니다."""
+        self.queue.put(None)
+        self._thread.join()
+        self.queue.close()
+
+class OffsetAllocator:
+    """
+    스코프별 시간 오프셋의 결정적 중앙 할당기. (부모 프로세스에서만 사용)
+    스코프 안의 파일은 등록 순서(정렬 순서)대로 한 번에 하나씩 차례를 받고,
+    앞 파일이 오프셋을 실제로 사용했는지 확정된 뒤에 다음 파일의 오프셋이 정해집니다.
+    따라서 작업자 수나 완료 순서와 관계없이 순차 실행(process_files)과 같은 오프셋이 할당됩니다.
+    """
+    def __init__(self, counters: Union[dict, None] = None):
+        self.counters = defaultdict(int, counters or {})
+        self._waiting = defaultdict(deque) # 스코프 -> 차례를 기다리는 작업 번호 (등록 순서)
+        self._ready = {} # 작업 번호 -> 차례가 오면 오프셋을 받을지 (False면 건너뜀)
+        self._active = {} # 스코프 -> 오프셋을 받아 결과를 기다리는 작업 번호
+
+    def register(self, scope_key, index: int):
+        self._waiting[scope_key].append(index)
+
+    def ready(self, scope_key, index: int, needs_offset: bool = True) -> list:
+        """
+        작업이 오프셋을 받을 준비가 되었음을 알립니다. needs_offset=False이면 차례만 넘깁니다. (앞 단계 실패 등)
+        Returns:
+            list: 지금 실행할 수 있게 된 (작업 번호, 오프셋) 목록.
+        """
+        self._ready[index] = needs_offset
+        return self._dispatch(scope_key)
+
+    def complete(self, scope_key, index: int, used_offset: bool) -> list:
+        """오프셋을 받은 작업의 결과를 확정하고, 다음 차례의 (작업 번호, 오프셋) 목록을 반환합니다."""
+        if self._active.pop(scope_key, None) != index:
+            raise ValueError(f"오프셋 차례가 아닌 작업입니다: {index}")
+        if used_offset:
+            self.counters[scope_key] += 1
+        return self._dispatch(scope_key)
+
+    def _dispatch(self, scope_key) -> list:
+        waiting = self._waiting[scope_key]
+        while scope_key not in self._active and waiting and waiting[0] in self._ready:
+            index = waiting.popleft()
+            if self._ready.pop(index):
+                self._active[scope_key] = index
+                return [(index, self.counters[scope_key])]
+        return []
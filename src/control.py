@@ -0,0 +1,83 @@
+# src/control.py
+import functools
+import threading
+import contextvars
+from typing import Union
+
+from .errors import ProcessingCancelled
+
+class RunControl:
+    """
+    실행 중인 작업의 협조적 취소/일시정지를 제어합니다.
+    GUI 스레드에서 cancel()/pause()/resume()을 호출하고, 워커는 파일/단계 사이마다
+    checkpoint()를 호출하여 일시정지 중이면 대기하고 취소되었으면 ProcessingCancelled를 발생시킵니다.
+    취소 시 실행 중인 외부 도구 프로세스도 종료합니다.
+    """
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+        self._lock = threading.Lock()
+        self._processes = set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def is_paused(self) -> bool:
+        return not self._running.is_set()
+
+    def pause(self):
+        self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    def cancel(self):
+        """취소를 요청하고 실행 중인 외부 프로세스를 종료합니다."""
+        self._cancelled.set()
+        self._running.set() # 일시정지 중인 워커를 깨워 취소를 인지하게 한다
+        with self._lock:
+            processes = list(self._processes)
+        for proc in processes:
+            try:
+                proc.terminate()
+            except OSError:
+                pass # 이미 종료된 프로세스
+
+    def checkpoint(self):
+        """일시정지 중이면 재개될 때까지 대기하고, 취소되었으면 ProcessingCancelled를 발생시킵니다."""
+        while not self._running.wait(timeout=0.5):
+            pass
+        if self._cancelled.is_set():
+            raise ProcessingCancelled("작업이 사용자에 의해 취소되었습니다.")
+
+    def register_process(self, proc):
+        with self._lock:
+            self._processes.add(proc)
+        if self._cancelled.is_set():
+            proc.terminate()
+
+    def unregister_process(self, proc):
+        with self._lock:
+            self._processes.discard(proc)
+
+# 실행 동안 활성화되는 제어 객체. 메타데이터/변환 모듈의 외부 도구 호출이 참조한다.
+# 실행(스레드, asyncio 작업)마다 컨텍스트에 따로 두므로, 같은 프로세스에서 먼저 끝난 실행이 지워도
+# 다른 실행(GUI 실행 옆의 감시 모드, 라이브러리 호출 등)의 취소에는 영향이 없다.
+_active_control: contextvars.ContextVar = contextvars.ContextVar("mdns_active_control", default=None)
+
+def set_active_control(control: Union[RunControl, None]):
+    """현재 컨텍스트(스레드 또는 asyncio 작업)의 제어 객체를 설정합니다."""
+    _active_control.set(control)
+
+def get_active_control() -> Union[RunControl, None]:
+    return _active_control.get()
+
+def in_current_context(func):
+    """
+    func을 지금의 컨텍스트(활성 제어 객체 포함)에서 실행하는 호출 가능 객체를 반환합니다.
+    스레드 풀의 스레드는 빈 컨텍스트로 시작하므로, 외부 도구를 실행할 수 있는 작업은 이것으로 감싸서 넘깁니다.
+    """
+    return functools.partial(contextvars.copy_context().run, func)
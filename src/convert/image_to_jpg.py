@@ -1,29 +1,67 @@
+import io
 import os
-import subprocess
 from pathlib import Path
-from PIL import Image # For PNG conversion
 from typing import Union
 
 from ..paths import get_magick_path # Assuming ImageMagick for HEIC
-from ..errors import ExternalToolError, ConversionError
+from ..errors import ExternalToolError, ConversionError, ProcessingCancelled
+from ..external import run_steps, run_steps_async
 from ..logging_i18n import get_log_message, log_error_to_file
 
-def convert_to_jpg(source_path: Path, destination_path: Path, summary: dict, queue) -> Union[Path, None]:
+# 알파 합성을 나눠 처리하는 행 수. 합성에 쓰는 임시 메모리는 (이미지 폭 x 이 값)에 비례합니다.
+ALPHA_STRIP_ROWS = 256
+
+def flatten_alpha(img, strip_rows: int = ALPHA_STRIP_ROWS):
+    """
+    RGBA 이미지를 흰 배경에 합성한 RGB 이미지를 반환합니다.
+    알파가 모두 255(불투명)이면 합성 없이 RGB로 바꾸기만 합니다. (결과 픽셀은 합성한 것과 같음)
+    합성은 strip_rows 행씩 나눠 하므로, 전체 크기의 알파 채널 복사본이나 RGB 변환 복사본을 따로 만들지 않습니다.
+    (최대 메모리: 디코딩한 RGBA + 결과 RGB + 띠 하나)
+    """
+    from PIL import Image
+    if img.getextrema()[3][0] == 255: # 밴드별 (최솟값, 최댓값), 복사본 없이 계산
+        return img.convert('RGB')
+    flattened = Image.new('RGB', img.size, (255, 255, 255))
+    width, height = img.size
+    for top in range(0, height, strip_rows):
+        box = (0, top, width, min(top + strip_rows, height))
+        strip = img.crop(box)
+        flattened.paste(strip, box, mask=strip) # RGBA 마스크는 알파 밴드를 사용 (밴드 분리/변환 복사 없음)
+    return flattened
+
+def convert_to_jpg(source_path: Path, destination_path: Path, summary: dict, queue, write=None) -> Union[Path, None]:
     """
     PNG 또는 HEIC 파일을 JPG로 변환합니다.
+    write가 주어지면 변환한 JPEG bytes를 write(jpeg_bytes, destination_path)로 기록합니다.
+    (메타데이터를 넣어 결과 파일을 한 번에 기록할 때 사용. PNG는 메모리에 인코딩하고, HEIC는 ImageMagick의 표준 출력으로 받음)
     """
+    return run_steps(_convert_steps(source_path, destination_path, summary, queue, write))
+
+async def convert_to_jpg_async(source_path: Path, destination_path: Path, summary: dict, queue) -> Union[Path, None]:
+    """
+    convert_to_jpg의 asyncio 버전. ImageMagick을 이벤트 루프에서 실행합니다.
+    PNG 변환(Pillow)은 이벤트 루프를 막으므로 HEIC에만 사용하고, PNG는 스레드 풀에서 convert_to_jpg로 변환합니다.
+    """
+    return await run_steps_async(_convert_steps(source_path, destination_path, summary, queue))
+
+def _convert_steps(source_path: Path, destination_path: Path, summary: dict, queue, write=None):
+    """변환 과정. 외부 도구 호출은 yield하여 run_steps/run_steps_async가 실행합니다."""
     file_extension = source_path.suffix.lower()
     
     try:
         if file_extension == '.png':
             # PNG to JPG conversion using Pillow
+            from PIL import Image # 지연 임포트: PNG가 없는 실행에서는 Pillow를 불러오지 않음
             img = Image.open(source_path)
             if img.mode == 'RGBA':
-                # Create a white background for transparent PNGs
-                background = Image.new('RGB', img.size, (255, 255, 255))
-                background.paste(img, mask=img.split()[3]) # 3 is the alpha channel
-                img = background
-            img.save(destination_path, "jpeg")
+                # Create a white background for transparent PNGs (원본 RGBA는 인코딩 전에 해제됨)
+                img = flatten_alpha(img)
+            if write is None:
+                img.save(destination_path, "jpeg")
+            else:
+                encoded = io.BytesIO()
+                img.save(encoded, "jpeg")
+                write(encoded.getvalue(), destination_path)
             queue.put(('log', f"  {get_log_message('CONVERT_PNG_TO_JPG')}"))
             summary['converted_to_jpg'] += 1
             return destination_path
@@ -39,13 +77,15 @@ def convert_to_jpg(source_path: Path, destination_path: Path, summary: dict, que
                 magick_path,
                 'convert',
                 str(source_path),
-                str(destination_path)
+                str(destination_path) if write is None else 'jpg:-' # write: 결과를 표준 출력으로 받아 직접 기록
             ]
             
-            # DEV_GUIDE: ImageMagick 타임아웃 30초
-            result = subprocess.run(command, capture_output=True, text=True, check=True, encoding='utf-8', errors='ignore', timeout=30)
+            # DEV_GUIDE: ImageMagick 타임아웃 30초 (대용량은 크기 비례로 스케줄러가 늘림)
+            result = yield (command, 'magick', source_path, write is not None)
             
             if result.returncode == 0:
+                if write is not None:
+                    write(result.stdout, destination_path)
                 queue.put(('log', f"  {get_log_message('CONVERT_HEIC_TO_JPG')}"))
                 summary['converted_to_jpg'] += 1
                 return destination_path
@@ -61,6 +101,11 @@ def convert_to_jpg(source_path: Path, destination_path: Path, summary: dict, que
         log_error_to_file(str(source_path), "CONVERSION", e)
         summary['conversion_failed'] += 1
         return None
+    except ProcessingCancelled:
+        # 취소로 중단된 변환의 불완전한 결과물 정리
+        if destination_path.exists():
+            os.remove(destination_path)
+        raise
     except FileNotFoundError as e:
         queue.put(('log', f"  {get_log_message('CONVERT_FAIL')} (External tool not found: {e}) ({source_path.name})"))
         log_error_to_file(str(source_path), "CONVERSION", e)
@@ -0,0 +1,123 @@
+# src/copy_engine.py
+import os
+import shutil
+import threading
+from pathlib import Path
+
+from .errors import FileOperationError
+
+# 이중 버퍼 복사의 버퍼 하나 크기
+COPY_BUFFER_SIZE = 4 * 1024 * 1024
+# 여유 공간 검사 시 계획된 용량에 더하는 최소 여유분
+FREE_SPACE_MARGIN_BYTES = 256 * 1024 * 1024
+
+def _same_device(source_path, destination_dir) -> bool:
+    try:
+        return os.stat(source_path).st_dev == os.stat(destination_dir).st_dev
+    except OSError:
+        return True
+
+def _double_buffered_copy(source_path, destination_path, buffer_size: int = COPY_BUFFER_SIZE):
+    """
+    읽기 스레드가 한 버퍼를 채우는 동안 현재 스레드가 다른 버퍼를 씁니다.
+    원본과 대상이 서로 다른 장치일 때 읽기와 쓰기가 겹쳐 진행됩니다.
+    """
+    buffers = [bytearray(buffer_size), bytearray(buffer_size)]
+    filled = [0, 0]
+    ready = [threading.Semaphore(0), threading.Semaphore(0)] # 버퍼가 채워짐
+    free = [threading.Semaphore(1), threading.Semaphore(1)]  # 버퍼가 비워짐
+    errors = []
+    stop = threading.Event()
+
+    def reader(src):
+        index = 0
+        try:
+            while not stop.is_set():
+                free[index].acquire()
+                if stop.is_set():
+                    break
+                filled[index] = src.readinto(buffers[index])
+                ready[index].release()
+                if not filled[index]:
+                    break
+                index ^= 1
+        except BaseException as e:
+            errors.append(e)
+            filled[index] = 0
+            ready[index].release()
+
+    with open(source_path, 'rb', buffering=0) as src, open(destination_path, 'wb', buffering=0) as dst:
+        if hasattr(os, 'posix_fadvise'):
+            try:
+                os.posix_fadvise(src.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            except OSError:
+                pass
+        thread = threading.Thread(target=reader, args=(src,), name="mdns-copy-reader", daemon=True)
+        thread.start()
+        index = 0
+        try:
+            while True:
+                ready[index].acquire()
+                size = filled[index]
+                if not size:
+                    break
+                with memoryview(buffers[index]) as view:
+                    written = 0
+                    while written < size:
+                        written += dst.write(view[written:size])
+                free[index].release()
+                index ^= 1
+        finally:
+            stop.set()
+            for semaphore in free:
+                semaphore.release() # 대기 중인 읽기 스레드를 깨워 종료시킴
+            thread.join()
+    if errors:
+        raise errors[0]
+
+def copy_file(source_path, destination_path) -> Path:
+    """
+    파일을 복사하고 메타데이터(수정 시각 등)를 보존합니다. (shutil.copy2 대체)
+    같은 장치이면 커널 복사 경로를 쓰는 shutil.copy2를, 다른 장치이면 이중 버퍼 복사를 사용합니다.
+    """
+    destination_path = Path(destination_path)
+    if _same_device(source_path, destination_path.parent):
+        shutil.copy2(source_path, destination_path)
+        return destination_path
+    try:
+        _double_buffered_copy(source_path, destination_path)
+    except BaseException:
+        if destination_path.exists():
+            os.remove(destination_path)
+        raise
+    shutil.copystat(source_path, destination_path)
+    return destination_path
+
+def check_free_space(file_list: list, result_root) -> int:
+    """
+    결과물 루트가 있는 장치의 여유 공간이 계획된 총 용량보다 충분한지 확인합니다.
+    계획 용량 = 대상 파일 크기 합 + 가장 큰 파일 1개 (ffmpeg/exiftool 재기록 시 임시 사본) + 여유분.
+
+    Returns:
+        int: 계획된 총 용량 (바이트).
+    Raises:
+        FileOperationError: 여유 공간이 부족한 경우.
+    """
+    sizes = []
+    for file_info in file_list:
+        try:
+            sizes.append(os.stat(file_info.absolute_path).st_size)
+        except OSError:
+            continue
+    planned = sum(sizes) + (max(sizes) if sizes else 0) + FREE_SPACE_MARGIN_BYTES
+
+    # 결과 폴더가 아직 없으면 가장 가까운 상위 폴더 기준으로 확인
+    probe = Path(result_root)
+    while not probe.exists() and probe != probe.parent:
+        probe = probe.parent
+    free = shutil.disk_usage(probe).free
+    if free < planned:
+        raise FileOperationError(
+            f"결과 폴더의 여유 공간이 부족합니다: 필요 {planned / 1024 ** 3:.2f} GB, 남음 {free / 1024 ** 3:.2f} GB ({result_root})"
+        )
+    return planned
@@ -0,0 +1,203 @@
+# src/daemon.py
+import os
+import sys
+import json
+import time
+import queue as queue_module
+import argparse
+import threading
+from collections import defaultdict, deque
+from typing import Union
+
+from .scanner import FileInfo, get_result_root, HASH_SCHEMES
+from .journal import RunJournal
+from .summary import new_summary, create_summary_report
+from .control import RunControl, set_active_control
+from .errors import ProcessingCancelled, FileOperationError
+from .manifest import prepare_manifest
+from .external import get_scheduler
+from .metadata.base import reset_processor_cache
+from .records import RecordWriter
+from .thumbnails import ThumbnailCache
+from .logging_i18n import log_error_to_file
+from .orchestrator import _restore_from_journal, _run_pipeline
+from .watcher import Debouncer, create_watcher
+
+METRICS_FILENAME = ".mdns_watch_metrics.json"
+
+class WatchMetrics:
+    """감시 모드의 처리량과 대기열 길이. snapshot()을 결과 루트의 JSON 파일로도 내보냅니다."""
+    def __init__(self, window_seconds: float = 300.0, clock=time.monotonic):
+        self.window_seconds = window_seconds
+        self._clock = clock
+        self.started = clock()
+        self.batches = 0
+        self.files = 0
+        self.bytes = 0
+        self.last_batch_seconds = 0.0
+        self._recent = deque() # (완료 시각, 파일 수, 바이트)
+
+    def record_batch(self, files: int, size: int, seconds: float):
+        now = self._clock()
+        self.batches += 1
+        self.files += files
+        self.bytes += size
+        self.last_batch_seconds = seconds
+        self._recent.append((now, files, size))
+
+    def snapshot(self, queue_depth: int, summary: dict) -> dict:
+        now = self._clock()
+        while self._recent and now - self._recent[0][0] > self.window_seconds:
+            self._recent.popleft()
+        window = min(self.window_seconds, max(now - self.started, 1e-9))
+        return {
+            "uptime_seconds": round(now - self.started, 1),
+            "queue_depth": queue_depth,
+            "batches": self.batches,
+            "files": self.files,
+            "bytes": self.bytes,
+            "files_per_second": round(sum(r[1] for r in self._recent) / window, 3),
+            "bytes_per_second": round(sum(r[2] for r in self._recent) / window, 1),
+            "last_batch_seconds": round(self.last_batch_seconds, 3),
+            "processed_files": summary.get('processed_files', 0),
+            "failed_files": summary.get('failed_files', 0),
+        }
+
+class WatchDaemon:
+    """
+    소스 폴더를 감시하며 새로 들어온 파일만 처리하는 감시(데몬) 모드.
+    - 시작 시 저널을 이어서 열어 스코프별 시간 오프셋 카운터를 복원하고, 완료되지 않은 기존 파일을 먼저 처리합니다.
+    - 이후 기록이 끝난(디바운스된) 새 파일을 모아 정렬한 뒤 순차 파이프라인(_run_pipeline)으로 처리합니다.
+      같은 스코프에 나중에 들어온 파일은 이어지는 오프셋을 받으며, 카운터는 저널에 남으므로 재시작 후에도 유지됩니다.
+    - 처리량과 대기열 길이는 metrics_snapshot()과 결과 루트의 .mdns_watch_metrics.json으로 확인할 수 있습니다.
+    - 파일명 해시 방식(naming_hash)은 결과 루트의 실행 매니페스트와 같아야 하며, 다르면 시작 시 FileOperationError가 발생합니다.
+    """
+    def __init__(self, source_root, queue, output_root=None, settle_seconds: float = 5.0, poll_interval: float = 10.0,
+                 use_inotify: bool = True, thumbnails: bool = False, control: Union[RunControl, None] = None, naming_hash: str = "md5"):
+        self.source_root = source_root
+        self.output_root = output_root
+        self.queue = queue
+        self.control = control or RunControl()
+        self.result_root = get_result_root(source_root, output_root)
+        self.naming_hash = naming_hash
+        prepare_manifest(self.result_root, naming_hash, resume=True) # 감시 모드는 항상 기존 결과 트리에 이어서 씀
+        self.journal = RunJournal(self.result_root, resume=True)
+        self.time_offset_counters = defaultdict(int)
+        self.summary = new_summary()
+        self.records = RecordWriter(self.result_root, resume=True)
+        self.thumbnail_cache = ThumbnailCache(self.result_root, resume=True) if thumbnails else None
+        self.debouncer = Debouncer(settle_seconds)
+        self.metrics = WatchMetrics()
+        self.watcher = create_watcher(source_root, self.result_root, poll_interval, use_inotify)
+        queue.put(('log', f"감시 시작: {source_root} ({type(self.watcher).__name__}), 결과 폴더: {self.result_root}"))
+        _restore_from_journal(self.journal, [], self.time_offset_counters, {}, queue)
+        for path in self.watcher.existing():
+            self.debouncer.touch(path) # 이전 실행 이후 들어온 파일 (완료된 파일은 처리 시 걸러짐)
+
+    def metrics_snapshot(self) -> dict:
+        return self.metrics.snapshot(len(self.debouncer), self.summary)
+
+    def _write_metrics(self):
+        path = self.result_root / METRICS_FILENAME
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.metrics_snapshot(), f, ensure_ascii=False, indent=1)
+        os.replace(temp_path, path)
+
+    def run_once(self, timeout: float = 1.0) -> int:
+        """이벤트를 한 번 받아 준비된 파일을 처리합니다. 처리한 파일 수를 반환합니다."""
+        for path in self.watcher.poll(timeout):
+            self.debouncer.touch(path)
+        ready = [FileInfo(path, self.source_root, self.output_root) for path in self.debouncer.ready()]
+        ready = [f for f in ready if not self.journal.is_done(RunJournal.key_for(f))]
+        if not ready:
+            return 0
+        ready.sort(key=lambda x: (str(x.relative_path), x.filename.lower()))
+        started = time.perf_counter()
+        processed_before = self.summary['processed_files'] + self.summary['failed_files']
+        self.queue.put(('log', f"새 파일 {len(ready)}개 처리 시작 (대기 중 {len(self.debouncer)}개)"))
+        _run_pipeline(ready, self.journal, {}, {}, None, self.time_offset_counters, self.summary, self.queue, self.control, self.thumbnail_cache, self.records, self.naming_hash)
+        self.records.flush()
+        size = sum(os.path.getsize(f.absolute_path) for f in ready if os.path.exists(f.absolute_path))
+        self.metrics.record_batch(len(ready), size, time.perf_counter() - started)
+        self._write_metrics()
+        done = self.summary['processed_files'] + self.summary['failed_files'] - processed_before
+        self.queue.put(('log', f"새 파일 {done}개 처리 완료 (누적 처리 {self.summary['processed_files']}개, 실패 {self.summary['failed_files']}개)"))
+        return len(ready)
+
+    def run(self, poll_timeout: float = 1.0):
+        """
+        control이 취소될 때까지 감시하며 처리합니다. (Worker 스레드나 CLI에서 호출)
+        감시나 메트릭 기록 중 예외(inotify 감시 한도 초과, 디스크 오류 등)로 멈추면 error.log에 기록하고 'error' 이벤트를 보냅니다.
+        """
+        set_active_control(self.control)
+        get_scheduler().reset_stats()
+        reset_processor_cache()
+        error = None
+        try:
+            while not self.control.is_cancelled:
+                self.control.checkpoint()
+                self.run_once(poll_timeout)
+        except ProcessingCancelled:
+            pass
+        except Exception as e:
+            error = e
+            log_error_to_file(str(self.source_root), "WATCH", e)
+        finally:
+            set_active_control(None)
+            try:
+                self.close()
+            finally:
+                self.queue.put(('log', create_summary_report(self.summary)))
+                if error is not None:
+                    self.queue.put(('error', f"감시가 오류로 중단되었습니다: {error}"))
+                else:
+                    self.queue.put(('cancelled', "감시를 종료했습니다."))
+
+    def close(self):
+        self.watcher.close()
+        self.journal.close()
+        self.records.close()
+        if self.thumbnail_cache:
+            self.thumbnail_cache.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MDNS 감시 모드: 소스 폴더에 새로 들어온 파일만 처리")
+    parser.add_argument("source_root")
+    parser.add_argument("--output", default=None, help="결과물 루트 (기본값 [Source]/result)")
+    parser.add_argument("--settle", type=float, default=5.0, help="파일 기록이 끝났다고 보는 무변경 시간(초)")
+    parser.add_argument("--poll-interval", type=float, default=10.0, help="폴링 감시 주기(초)")
+    parser.add_argument("--polling", action="store_true", help="inotify 대신 폴링 사용 (네트워크 파일 시스템 등)")
+    parser.add_argument("--thumbnails", action="store_true")
+    parser.add_argument("--naming-hash", choices=HASH_SCHEMES, default="md5", help="파일명 해시 방식 (결과 트리의 매니페스트와 같아야 함)")
+    args = parser.parse_args(argv)
+
+    events = queue_module.Queue()
+    try:
+        daemon = WatchDaemon(args.source_root, events, args.output, args.settle, args.poll_interval,
+                             use_inotify=not args.polling, thumbnails=args.thumbnails, naming_hash=args.naming_hash)
+    except FileOperationError as e:
+        print(e, file=sys.stderr)
+        return 1
+    worker = threading.Thread(target=daemon.run, daemon=True)
+    worker.start()
+    exit_code = 0
+    try:
+        while True:
+            event = events.get()
+            if event[0] == 'log':
+                print(event[1], flush=True)
+            elif event[0] == 'error':
+                print(event[1], file=sys.stderr, flush=True)
+                exit_code = 1
+                break
+            elif event[0] == 'cancelled':
+                break
+    except KeyboardInterrupt:
+        daemon.control.cancel()
+        worker.join()
+    print(json.dumps(daemon.metrics_snapshot(), ensure_ascii=False))
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+# src/dedup.py
+import os
+import hashlib
+import shutil
+from collections import defaultdict
+from pathlib import Path
+from typing import Union
+
+from .scanner import FileInfo, calculate_md5
+from .date_resolver import resolve_date
+from .naming import handle_duplicates_and_rename
+from .logging_i18n import get_log_message, log_error_to_file
+
+# 중복 처리 모드
+# - skip: 첫 번째 파일만 처리하고 나머지는 건너뜀
+# - hardlink: 첫 번째 파일의 결과물을 하드링크로 연결 (실패 시 복사).
+#   결과물에는 keeper의 날짜와 시간 오프셋이 기록되어 있으므로 날짜 스코프가 같은 중복만 연결하고,
+#   스코프가 다른 중복은 평소처럼 처리(복사 + 자기 스코프의 날짜/오프셋 기록)한다
+# - report: 로그로만 알리고 평소처럼 처리
+DEDUP_MODES = ('skip', 'hardlink', 'report')
+
+# 부분 해시에 사용할 앞부분 크기. 이 크기 이하의 파일은 부분 해시가 곧 전체 해시이다.
+PARTIAL_HASH_SIZE = 64 * 1024
+
+class DuplicateGroup:
+    """내용이 동일한 파일 묶음. keeper는 정렬 순서상 가장 앞선 파일입니다."""
+    def __init__(self, keeper: FileInfo, duplicates: list, size: int):
+        self.keeper = keeper
+        self.duplicates = duplicates
+        self.size = size
+
+def _partial_md5(file_path: Path, size: int = PARTIAL_HASH_SIZE) -> str:
+    """파일 앞부분만 읽어 MD5를 계산합니다."""
+    with open(file_path, 'rb') as f:
+        return hashlib.md5(f.read(size)).hexdigest()
+
+def find_duplicates(file_list: list) -> list:
+    """
+    크기 -> 부분 해시 -> 전체 해시 순으로 후보를 좁혀 내용이 같은 파일 그룹을 찾습니다.
+    크기가 유일한 파일은 전혀 읽지 않으며, 부분 해시까지 일치한 파일만 전체 해시를 계산합니다.
+
+    Args:
+        file_list (list[FileInfo]): 결정적 순서로 정렬된 파일 목록.
+
+    Returns:
+        list[DuplicateGroup]: 중복 그룹 목록 (keeper의 정렬 순서 기준).
+    """
+    order = {id(file_info): index for index, file_info in enumerate(file_list)}
+
+    by_size = defaultdict(list)
+    for file_info in file_list:
+        try:
+            by_size[os.stat(file_info.absolute_path).st_size].append(file_info)
+        except OSError:
+            continue # 읽을 수 없는 파일은 본 처리 단계에서 오류로 기록된다
+
+    groups = []
+    for size, same_size in by_size.items():
+        if len(same_size) < 2:
+            continue
+        by_partial = defaultdict(list)
+        for file_info in same_size:
+            try:
+                by_partial[_partial_md5(file_info.absolute_path)].append(file_info)
+            except OSError:
+                continue
+        for partial_hash, candidates in by_partial.items():
+            if len(candidates) < 2:
+                continue
+            if size <= PARTIAL_HASH_SIZE:
+                by_full = {partial_hash: candidates}
+            else:
+                by_full = defaultdict(list)
+                for file_info in candidates:
+                    try:
+                        by_full[calculate_md5(file_info.absolute_path)].append(file_info)
+                    except OSError:
+                        continue
+            for members in by_full.values():
+                if len(members) < 2:
+                    continue
+                members.sort(key=lambda x: order[id(x)])
+                groups.append(DuplicateGroup(members[0], members[1:], size))
+
+    groups.sort(key=lambda g: order[id(g.keeper)])
+    return groups
+
+def build_duplicate_map(groups: list) -> dict:
+    """중복 파일의 절대 경로 -> keeper FileInfo 매핑을 만듭니다."""
+    duplicate_of = {}
+    for group in groups:
+        for duplicate in group.duplicates:
+            duplicate_of[duplicate.absolute_path] = group.keeper
+    return duplicate_of
+
+def same_scope(file_info: FileInfo, keeper: FileInfo) -> bool:
+    """두 파일의 날짜 스코프(scope_key)가 같은지. 둘 다 날짜 폴더가 없으면 메타데이터를 쓰지 않으므로 같은 것으로 봅니다."""
+    return resolve_date(file_info.absolute_path).get("scope_key") == resolve_date(keeper.absolute_path).get("scope_key")
+
+def link_duplicate(file_info: FileInfo, keeper_output: str, result_dir: Path, summary, queue, name_index=None) -> Union[str, None]:
+    """
+    keeper의 최종 결과물을 중복 파일의 결과 디렉토리에 하드링크로 연결합니다.
+    하드링크를 지원하지 않는 파일 시스템에서는 복사로 대체합니다.
+    이름은 keeper의 최종 파일명을 사용하며, 충돌 시 기존 규칙대로 숫자 접미사가 붙습니다.
+    """
+    os.makedirs(result_dir, exist_ok=True)
+    desired_name = os.path.basename(keeper_output)
+    temp_path = os.path.join(result_dir, f".mdns_link_{os.getpid()}_{desired_name}")
+    try:
+        try:
+            os.link(keeper_output, temp_path)
+        except OSError:
+            shutil.copy2(keeper_output, temp_path)
+        if name_index is not None:
+            name_index.add(os.path.basename(temp_path))
+        final_path = handle_duplicates_and_rename(temp_path, desired_name, summary, name_index=name_index)
+    except Exception as e:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+            if name_index is not None:
+                name_index.discard(os.path.basename(temp_path))
+        log_error_to_file(str(file_info.absolute_path), "DEDUP", e)
+        return None
+    queue.put(('log', f"  {get_log_message('DEDUP_HARDLINK', original=os.path.basename(keeper_output))} -> {os.path.basename(final_path)}"))
+    summary['duplicate_hardlinked'] += 1
+    return final_path
@@ -16,6 +16,10 @@ class FileOperationError(MDNSError):
     """파일 복사, 이동, 이름 변경 등 파일 시스템 작업 중 발생하는 오류입니다."""
     pass
 
+class NameConflictError(FileOperationError):
+    """계획한 파일명을 적용하기 직전에 다른 파일이 먼저 사용한 경우의 오류입니다."""
+    pass
+
 class ExternalToolError(MDNSError):
     """ffmpeg, ExifTool 등 외부 도구 실행 중 발생하는 오류입니다."""
     def __init__(self, message, stdout=None, stderr=None):
@@ -26,4 +30,8 @@ class ExternalToolError(MDNSError):
     def __str__(self):
         return f"{super().__str__()}\nSTDOUT: {self.stdout}\nSTDERR: {self.stderr}"
 
+class ProcessingCancelled(MDNSError):
+    """사용자가 작업을 취소했을 때 처리 흐름을 중단하기 위해 발생하는 예외입니다."""
+    pass
+
 # TODO: (v0.1) 필요에 따라 더 구체적인 예외 타입 추가
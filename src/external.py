@@ -0,0 +1,372 @@
+# src/external.py
+import os
+import errno
+import asyncio
+import time
+import threading
+import subprocess
+from typing import Union
+
+from .control import get_active_control
+from .errors import ProcessingCancelled, ExternalToolError
+
+class ToolPolicy:
+    """
+    외부 도구별 실행 정책.
+    타임아웃은 base_timeout + 입력 크기(GB) * seconds_per_gb 로 계산하며 max_timeout을 넘지 않습니다.
+    """
+    def __init__(self, max_concurrency: int, base_timeout: float, seconds_per_gb: float, max_timeout: float, retries: int = 2):
+        self.max_concurrency = max_concurrency
+        self.base_timeout = base_timeout
+        self.seconds_per_gb = seconds_per_gb
+        self.max_timeout = max_timeout
+        self.retries = retries
+
+# DEV_GUIDE 7.2의 권장 타임아웃(ffprobe 10초, ffmpeg 60초, exiftool/magick 30초)을 기본값으로 사용하고,
+# 대용량 파일은 크기에 비례해 늘린다. (예: 20 GB 리먹스는 60초에 강제 종료되지 않음)
+DEFAULT_TOOL_POLICIES = {
+    "ffprobe": ToolPolicy(max_concurrency=4, base_timeout=10, seconds_per_gb=2, max_timeout=120),
+    "ffmpeg": ToolPolicy(max_concurrency=2, base_timeout=60, seconds_per_gb=30, max_timeout=3600),
+    "exiftool": ToolPolicy(max_concurrency=4, base_timeout=30, seconds_per_gb=10, max_timeout=600),
+    "magick": ToolPolicy(max_concurrency=2, base_timeout=30, seconds_per_gb=60, max_timeout=600),
+}
+_FALLBACK_POLICY = ToolPolicy(max_concurrency=2, base_timeout=60, seconds_per_gb=30, max_timeout=3600)
+
+# 재시도할 일시적 실행 오류 (프로세스 생성 실패 등)
+TRANSIENT_ERRNOS = {errno.EAGAIN, errno.ENOMEM, errno.EMFILE, errno.ENFILE, errno.ETXTBSY}
+RETRY_BACKOFF_SECONDS = 0.5
+# run_async가 다른 호출이 점유한 도구 세마포어를 다시 확인하는 간격
+SEMAPHORE_POLL_SECONDS = 0.02
+
+class ToolStats:
+    """도구별 실행 통계."""
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.retries = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.input_bytes = 0
+        self.active = 0
+        self.peak_concurrency = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls, "failures": self.failures, "timeouts": self.timeouts,
+            "retries": self.retries, "total_seconds": round(self.total_seconds, 3),
+            "max_seconds": round(self.max_seconds, 3), "input_bytes": self.input_bytes,
+            "peak_concurrency": self.peak_concurrency,
+        }
+
+def _decode(output) -> str:
+    return output.decode('utf-8', errors='ignore') if output else ""
+
+class _AsyncProcessHandle:
+    """
+    RunControl에 등록하는 asyncio 프로세스 핸들.
+    cancel()은 GUI 스레드에서 호출되므로 종료 요청을 프로세스를 실행한 이벤트 루프로 넘깁니다.
+    """
+    def __init__(self, proc, loop):
+        self._proc = proc
+        self._loop = loop
+
+    def terminate(self):
+        try:
+            self._loop.call_soon_threadsafe(self._terminate)
+        except RuntimeError: # 이벤트 루프가 이미 닫힘
+            pass
+
+    def _terminate(self):
+        if self._proc.returncode is None:
+            try:
+                self._proc.terminate()
+            except ProcessLookupError:
+                pass
+
+class ToolScheduler:
+    """
+    외부 도구 실행을 중앙에서 관리합니다.
+    - 도구별 동시 실행 수 제한 (멈춘 도구 하나가 다른 도구의 실행을 막지 않음). 동기(run)와 asyncio(run_async) 호출이 함께 따름
+    - 입력 크기에 비례한 타임아웃
+    - 일시적 실패(프로세스 생성 실패)에 대한 지수 백오프 재시도
+    - 타임아웃은 재시도하지 않고 바로 실패 (멈춘 도구가 파이프라인을 더 오래 붙잡지 않도록,
+      강제 종료된 쓰기 작업이 남긴 파일 위에 다시 실행하지 않도록)
+    - 도구별 호출 수/실패/소요 시간/최대 동시 실행 수 통계
+    """
+    def __init__(self, policies: Union[dict, None] = None):
+        self.policies = dict(DEFAULT_TOOL_POLICIES if policies is None else policies)
+        self._semaphores = {name: threading.BoundedSemaphore(p.max_concurrency) for name, p in self.policies.items()}
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def policy_for(self, tool: str) -> ToolPolicy:
+        return self.policies.get(tool, _FALLBACK_POLICY)
+
+    def timeout_for(self, tool: str, input_size: int = 0) -> float:
+        policy = self.policy_for(tool)
+        timeout = policy.base_timeout + (input_size / (1024 ** 3)) * policy.seconds_per_gb
+        return min(timeout, policy.max_timeout)
+
+    def _semaphore(self, tool: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if tool not in self._semaphores:
+                self._semaphores[tool] = threading.BoundedSemaphore(self.policy_for(tool).max_concurrency)
+            return self._semaphores[tool]
+
+    def _stats_for(self, tool: str) -> ToolStats:
+        # self._lock을 잡은 상태에서 호출
+        if tool not in self._stats:
+            self._stats[tool] = ToolStats()
+        return self._stats[tool]
+
+    def _prepare(self, tool: str, input_path, timeout) -> tuple:
+        """(타임아웃, 입력 크기, 정책). timeout이 None이면 정책과 input_path의 크기로 계산합니다."""
+        input_size = 0
+        if input_path is not None:
+            try:
+                input_size = os.path.getsize(input_path)
+            except OSError:
+                pass
+        if timeout is None:
+            timeout = self.timeout_for(tool, input_size)
+        return timeout, input_size, self.policy_for(tool)
+
+    def _retry_delay(self, tool: str, error: OSError, attempt: int, policy: ToolPolicy) -> float:
+        """일시적 실행 오류이면 다음 시도까지 기다릴 시간, 재시도하지 않을 오류이면 그대로 발생시킵니다."""
+        control = get_active_control()
+        if error.errno not in TRANSIENT_ERRNOS or attempt >= policy.retries or (control and control.is_cancelled):
+            raise error
+        with self._lock:
+            self._stats_for(tool).retries += 1
+        return RETRY_BACKOFF_SECONDS * (2 ** attempt)
+
+    def _begin(self, tool: str, input_size: int) -> ToolStats:
+        with self._lock:
+            stats = self._stats_for(tool)
+            stats.calls += 1
+            stats.input_bytes += input_size
+            stats.active += 1
+            stats.peak_concurrency = max(stats.peak_concurrency, stats.active)
+        return stats
+
+    def _end(self, stats: ToolStats, elapsed: float, failed: bool):
+        with self._lock:
+            stats.active -= 1
+            stats.total_seconds += elapsed
+            stats.max_seconds = max(stats.max_seconds, elapsed)
+            if failed:
+                stats.failures += 1
+
+    def _check_result(self, tool: str, command: list, returncode: int, stdout: str, stderr: str, control) -> subprocess.CompletedProcess:
+        if control and control.is_cancelled:
+            raise ProcessingCancelled(f"외부 도구 실행이 취소되었습니다: {tool}")
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, command, output=stdout, stderr=stderr)
+        return subprocess.CompletedProcess(command, returncode, stdout, stderr)
+
+    def run(self, tool: str, command: list, input_path=None, timeout=None, binary: bool = False) -> subprocess.CompletedProcess:
+        """
+        도구를 실행합니다. timeout이 None이면 정책과 input_path의 크기로 계산합니다.
+        실패 시 subprocess.run(check=True)과 같은 예외를 발생시킵니다.
+        타임아웃은 한 번의 시도 후 프로세스를 종료하고 ExternalToolError를 발생시킵니다.
+        binary이면 stdout을 bytes로 그대로 반환합니다. (변환 결과를 표준 출력으로 받을 때. stderr는 항상 문자열)
+        """
+        timeout, input_size, policy = self._prepare(tool, input_path, timeout)
+        attempt = 0
+        while True:
+            try:
+                return self._run_once(tool, command, timeout, input_size, binary)
+            except subprocess.TimeoutExpired as e:
+                raise ExternalToolError(f"{tool} timed out after {timeout:.0f}s and was killed", stdout=None if binary else e.output, stderr=e.stderr)
+            except OSError as e:
+                delay = self._retry_delay(tool, e, attempt, policy)
+                attempt += 1
+                time.sleep(delay)
+
+    def _run_once(self, tool: str, command: list, timeout, input_size: int, binary: bool = False) -> subprocess.CompletedProcess:
+        control = get_active_control()
+        with self._semaphore(tool):
+            stats = self._begin(tool, input_size)
+            start = time.perf_counter()
+            failed = True
+            try:
+                text_mode = {} if binary else {'text': True, 'encoding': 'utf-8', 'errors': 'ignore'}
+                proc = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, **text_mode)
+                if control:
+                    control.register_process(proc)
+                try:
+                    try:
+                        stdout, stderr = proc.communicate(timeout=timeout)
+                    except subprocess.TimeoutExpired:
+                        proc.kill()
+                        stdout, stderr = proc.communicate()
+                        with self._lock:
+                            stats.timeouts += 1
+                        raise subprocess.TimeoutExpired(command, timeout, output=stdout, stderr=_decode(stderr) if binary else stderr)
+                    except BaseException:
+                        proc.kill()
+                        proc.wait()
+                        raise
+                finally:
+                    if control:
+                        control.unregister_process(proc)
+                if binary:
+                    stderr = _decode(stderr)
+                result = self._check_result(tool, command, proc.returncode, stdout, stderr, control)
+                failed = False
+                return result
+            finally:
+                self._end(stats, time.perf_counter() - start, failed)
+
+    async def run_async(self, tool: str, command: list, input_path=None, timeout=None, binary: bool = False) -> subprocess.CompletedProcess:
+        """
+        run()의 asyncio 버전. 이벤트 루프에서 asyncio.create_subprocess_exec로 실행하므로 대기하는 동안 스레드를 점유하지 않습니다.
+        도구별 동시 실행 수 제한(run()과 같은 세마포어), 타임아웃, 재시도, 통계, 취소 시 프로세스 종료는 run()과 같습니다.
+        """
+        timeout, input_size, policy = self._prepare(tool, input_path, timeout)
+        attempt = 0
+        while True:
+            try:
+                return await self._run_once_async(tool, command, timeout, input_size, binary)
+            except subprocess.TimeoutExpired as e:
+                raise ExternalToolError(f"{tool} timed out after {timeout:.0f}s and was killed", stdout=None if binary else e.output, stderr=e.stderr)
+            except OSError as e:
+                delay = self._retry_delay(tool, e, attempt, policy)
+                attempt += 1
+                await asyncio.sleep(delay)
+
+    async def _run_once_async(self, tool: str, command: list, timeout, input_size: int, binary: bool = False) -> subprocess.CompletedProcess:
+        control = get_active_control()
+        semaphore = self._semaphore(tool)
+        # 동기 호출과 같은 세마포어를 쓰므로 이벤트 루프를 막지 않도록 비차단으로 획득을 반복한다
+        while not semaphore.acquire(blocking=False):
+            if control and control.is_cancelled:
+                raise ProcessingCancelled(f"외부 도구 실행이 취소되었습니다: {tool}")
+            await asyncio.sleep(SEMAPHORE_POLL_SECONDS)
+        try:
+            stats = self._begin(tool, input_size)
+            start = time.perf_counter()
+            failed = True
+            try:
+                proc = await asyncio.create_subprocess_exec(*command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+                handle = _AsyncProcessHandle(proc, asyncio.get_running_loop())
+                if control:
+                    control.register_process(handle)
+                try:
+                    try:
+                        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+                    except asyncio.TimeoutError:
+                        proc.kill()
+                        stdout, stderr = await proc.communicate()
+                        with self._lock:
+                            stats.timeouts += 1
+                        raise subprocess.TimeoutExpired(command, timeout, output=_decode(stdout), stderr=_decode(stderr))
+                    except BaseException:
+                        if proc.returncode is None:
+                            proc.kill()
+                            await proc.wait()
+                        raise
+                finally:
+                    if control:
+                        control.unregister_process(handle)
+                result = self._check_result(tool, command, proc.returncode, stdout if binary else _decode(stdout), _decode(stderr), control)
+                failed = False
+                return result
+            finally:
+                self._end(stats, time.perf_counter() - start, failed)
+        finally:
+            semaphore.release()
+
+    def record(self, tool: str, elapsed: float, input_size: int = 0, failed: bool = False, timed_out: bool = False):
+        """프로세스를 새로 실행하지 않는 호출(상주 세션 등)의 통계를 기록합니다."""
+        with self._lock:
+            stats = self._stats_for(tool)
+            stats.calls += 1
+            stats.input_bytes += input_size
+            stats.total_seconds += elapsed
+            stats.max_seconds = max(stats.max_seconds, elapsed)
+            stats.failures += failed
+            stats.timeouts += timed_out
+
+    def stats_snapshot(self) -> dict:
+        with self._lock:
+            return {tool: stats.as_dict() for tool, stats in self._stats.items()}
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats = {}
+
+_scheduler = ToolScheduler()
+
+def get_scheduler() -> ToolScheduler:
+    return _scheduler
+
+def run_tool(command: list, tool: Union[str, None] = None, input_path=None, timeout=None, binary: bool = False) -> subprocess.CompletedProcess:
+    """
+    외부 도구(ffmpeg/ffprobe/exiftool/magick)를 중앙 스케줄러를 통해 실행합니다.
+    subprocess.run(..., capture_output=True, text=True, check=True)과 동일하게 동작하되,
+    실행 중인 프로세스를 활성 RunControl에 등록하여 취소 시 즉시 종료될 수 있게 합니다.
+    binary이면 stdout을 디코딩하지 않고 bytes로 반환합니다.
+
+    Raises:
+        subprocess.CalledProcessError: 종료 코드가 0이 아닌 경우.
+        ExternalToolError: 타임아웃을 초과한 경우 (프로세스는 강제 종료되며 재시도하지 않음).
+        ProcessingCancelled: 실행 중에 작업이 취소된 경우.
+    """
+    if tool is None:
+        tool = os.path.splitext(os.path.basename(command[0]))[0].lower()
+    return _scheduler.run(tool, command, input_path=input_path, timeout=timeout, binary=binary)
+
+async def run_tool_async(command: list, tool: Union[str, None] = None, input_path=None, timeout=None, binary: bool = False) -> subprocess.CompletedProcess:
+    """run_tool의 asyncio 버전 (ToolScheduler.run_async). 예외는 run_tool과 같습니다."""
+    if tool is None:
+        tool = os.path.splitext(os.path.basename(command[0]))[0].lower()
+    return await _scheduler.run_async(tool, command, input_path=input_path, timeout=timeout, binary=binary)
+
+def _binary_step(call: tuple) -> bool:
+    return len(call) > 3 and call[3]
+
+def run_steps(steps):
+    """
+    외부 도구 호출을 (command, tool, input_path[, binary])로 yield하는 제너레이터를 run_tool로 실행하고 반환값을 돌려줍니다.
+    도구의 결과는 yield 식의 값으로, 예외는 yield 지점에서 발생하므로 제너레이터 안의 오류 처리가 그대로 적용됩니다.
+    같은 제너레이터를 run_steps_async로 실행하면 비동기 엔진에서 같은 명령과 결과 해석을 공유할 수 있습니다.
+    """
+    try:
+        call = next(steps)
+        while True:
+            try:
+                result = run_tool(call[0], tool=call[1], input_path=call[2], binary=_binary_step(call))
+            except BaseException as e:
+                call = steps.throw(e)
+            else:
+                call = steps.send(result)
+    except StopIteration as stop:
+        return stop.value
+
+async def run_steps_async(steps):
+    """run_steps의 asyncio 버전. 외부 도구를 run_tool_async로 실행합니다."""
+    try:
+        call = next(steps)
+        while True:
+            try:
+                result = await run_tool_async(call[0], tool=call[1], input_path=call[2], binary=_binary_step(call))
+            except BaseException as e:
+                call = steps.throw(e)
+            else:
+                call = steps.send(result)
+    except StopIteration as stop:
+        return stop.value
+
+def format_tool_stats(stats: dict) -> str:
+    """도구별 통계를 요약 보고용 문자열로 변환합니다."""
+    if not stats:
+        return ""
+    lines = ["--- 외부 도구 사용 통계 ---"]
+    for tool, s in sorted(stats.items()):
+        lines.append(
+            f"{tool}: 호출 {s['calls']}회, 실패 {s['failures']}회, 타임아웃 {s['timeouts']}회, 재시도 {s['retries']}회, "
+            f"총 {s['total_seconds']:.1f}초 (최대 {s['max_seconds']:.1f}초), 최대 동시 실행 {s['peak_concurrency']}"
+        )
+    return "\n".join(lines) + "\n"
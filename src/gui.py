@@ -6,6 +6,9 @@ import threading
 import queue # Keep queue for inter-thread communication
 import os # For os.startfile or webbrowser.open
 
+from .control import RunControl
+from .startup import StartupTasks
+
 # TODO: (v0.1) orchestrator 모듈 임포트
 # from .orchestrator import process_files
 
@@ -14,23 +17,32 @@ class Worker(threading.Thread):
     백그라운드에서 실제 작업을 수행하는 워커 스레드입니다.
     GUI 스레드에 이벤트를 전달하기 위해 gui_queue를 사용합니다.
     """
-    def __init__(self, gui_queue, source_path, orchestrator_process_files):
+    def __init__(self, gui_queue, source_path, orchestrator_process_files, options=None):
         super().__init__()
         self.gui_queue = gui_queue
         self.source_path = source_path
         self.orchestrator_process_files = orchestrator_process_files
+        self.options = options or {} # process_files에 전달할 추가 옵션 (예: resume)
+        self.control = RunControl()
         self.running = True
 
     def run(self):
         self.gui_queue.put(('log', f"워커 스레드 시작. 소스: {self.source_path}"))        
         # Call the actual orchestrator process_files function
-        self.orchestrator_process_files(self.source_path, self.gui_queue)
+        self.orchestrator_process_files(self.source_path, self.gui_queue, control=self.control, **self.options)
         # The orchestrator will send 'done' message when finished
         self.gui_queue.put(('log', "워커 스레드 종료."))
 
     def stop(self):
-        """워커 스레드를 안전하게 중단하기 위한 메서드."""
+        """워커 스레드를 안전하게 중단하기 위한 메서드. 다음 확인 지점에서 작업이 취소됩니다."""
         self.running = False
+        self.control.cancel()
+
+    def pause(self):
+        self.control.pause()
+
+    def resume(self):
+        self.control.resume()
 
 class MainApplication:
     """
@@ -44,11 +56,18 @@ class MainApplication:
 
         self.result_folder_path = None # To store the path of the result folder
         self.source_dir = tk.StringVar()
+        self.output_dir = tk.StringVar() # 비어 있으면 [Source]/result
+        self.resume_var = tk.BooleanVar(value=False)
+        self.thumbnails_var = tk.BooleanVar(value=False)
         self.queue = queue.Queue()
         self.worker_thread = None # Keep track of the worker thread
 
         self._init_widgets()
 
+        # 외부 도구 확인과 모듈 예열은 창이 그려진 뒤 백그라운드에서 실행 (창 표시를 막지 않음)
+        self.startup_tasks = StartupTasks(self.queue)
+        self.root.after_idle(self._start_background_tasks)
+
         # TODO: (TASK-01-01) UI 레이아웃 완성
         # - 프레임 사용하여 위젯 그룹화
         # - 스타일 적용
@@ -62,9 +81,24 @@ class MainApplication:
         browse_button = tk.Button(self.root, text="폴더 선택", command=self.browse_folder)
         browse_button.pack(pady=5)
 
+        # --- 출력 폴더 선택 (선택 사항) ---
+        tk.Label(self.root, text="출력 폴더 (비우면 소스/result):").pack(pady=5)
+        tk.Entry(self.root, textvariable=self.output_dir, width=80).pack(pady=5)
+        tk.Button(self.root, text="출력 폴더 선택", command=self.browse_output_folder).pack(pady=5)
+
+        # --- 처리 옵션 ---
+        tk.Checkbutton(self.root, text="중단된 작업 이어서 처리", variable=self.resume_var).pack()
+        tk.Checkbutton(self.root, text="결과 썸네일 캐시 생성", variable=self.thumbnails_var).pack()
+
         # --- 변환 시작 버튼 ---
-        self.start_button = tk.Button(self.root, text="변환 시작", command=self.start_processing)
-        self.start_button.pack(pady=20)
+        control_frame = tk.Frame(self.root)
+        control_frame.pack(pady=20)
+        self.start_button = tk.Button(control_frame, text="변환 시작", command=self.start_processing)
+        self.start_button.pack(side=tk.LEFT, padx=5)
+        self.pause_button = tk.Button(control_frame, text="일시정지", state=tk.DISABLED, command=self.toggle_pause)
+        self.pause_button.pack(side=tk.LEFT, padx=5)
+        self.cancel_button = tk.Button(control_frame, text="취소", state=tk.DISABLED, command=self.cancel_processing)
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
 
         # --- 진행률 바 ---
         self.progress = Progressbar(self.root, orient=tk.HORIZONTAL, length=400, mode='determinate')
@@ -77,8 +111,20 @@ class MainApplication:
         self.log_area.pack(pady=10)
 
         # --- 결과 폴더 열기 버튼 ---
-        self.open_result_button = tk.Button(self.root, text="결과 폴더 열기", state=tk.DISABLED, command=self.open_result_folder)
-        self.open_result_button.pack(pady=10)
+        result_frame = tk.Frame(self.root)
+        result_frame.pack(pady=10)
+        self.open_result_button = tk.Button(result_frame, text="결과 폴더 열기", state=tk.DISABLED, command=self.open_result_folder)
+        self.open_result_button.pack(side=tk.LEFT, padx=5)
+        self.thumbnail_button = tk.Button(result_frame, text="썸네일 보기", state=tk.DISABLED, command=self.open_thumbnail_view)
+        self.thumbnail_button.pack(side=tk.LEFT, padx=5)
+
+    def _start_background_tasks(self):
+        self.startup_tasks.start()
+        self.root.after(100, self.poll_queue)
+
+    def _is_polling_needed(self):
+        worker_alive = self.worker_thread and self.worker_thread.is_alive()
+        return worker_alive or self.startup_tasks.is_alive()
 
     def browse_folder(self):
         """'폴더 선택' 대화상자를 열어 소스 디렉토리를 설정합니다."""
@@ -87,6 +133,16 @@ class MainApplication:
             self.source_dir.set(directory)
             self.log("소스 폴더 선택: " + directory)
 
+    def browse_output_folder(self):
+        """결과물을 다른 위치(다른 디스크 등)에 만들 때 출력 폴더를 선택합니다."""
+        directory = filedialog.askdirectory()
+        if directory:
+            self.output_dir.set(directory)
+            self.log("출력 폴더 선택: " + directory)
+
+    def _result_root(self, source_path):
+        return self.output_dir.get() or os.path.join(source_path, "result")
+
     def start_processing(self):
         """'변환 시작' 버튼 클릭 시 워커 스레드를 시작합니다."""
         source_path = self.source_dir.get()
@@ -97,6 +153,7 @@ class MainApplication:
         self.log("변환 작업을 시작합니다...")
         self.start_button.config(state=tk.DISABLED)
         self.open_result_button.config(state=tk.DISABLED)
+        self.thumbnail_button.config(state=tk.DISABLED)
 
         # Clear log area for new processing
         self.log_area.config(state=tk.NORMAL)
@@ -105,14 +162,40 @@ class MainApplication:
 
         # TASK-01-02: 워커 스레드 생성 및 시작
         from .orchestrator import process_files # Import here to avoid circular dependency if orchestrator imports gui
-        self.worker_thread = Worker(self.queue, source_path, process_files)
+        options = {'resume': self.resume_var.get(), 'output_root': self.output_dir.get() or None, 'thumbnails': self.thumbnails_var.get()}
+        self.worker_thread = Worker(self.queue, source_path, process_files, options)
         self.worker_thread.start()
+        self.pause_button.config(state=tk.NORMAL, text="일시정지")
+        self.cancel_button.config(state=tk.NORMAL)
 
-        # TASK-01-02: 주기적으로 큐를 확인하는 after() 메서드 호출
-        self.root.after(100, self.poll_queue)
+        # TASK-01-02: 주기적으로 큐를 확인하는 after() 메서드 호출 (시작 작업이 아직 실행 중이면 이미 폴링 중)
+        if not self.startup_tasks.is_alive():
+            self.root.after(100, self.poll_queue)
 
         self.log("오케스트레이터 스레드를 시작했습니다.")
 
+    def toggle_pause(self):
+        """'일시정지'/'재개' 버튼. 현재 파일의 진행 중인 단계가 끝난 뒤 멈춥니다."""
+        if not self.worker_thread or not self.worker_thread.is_alive():
+            return
+        if self.worker_thread.control.is_paused:
+            self.worker_thread.resume()
+            self.pause_button.config(text="일시정지")
+            self.log("작업을 재개합니다.")
+        else:
+            self.worker_thread.pause()
+            self.pause_button.config(text="재개")
+            self.log("현재 단계가 끝나면 작업을 일시정지합니다.")
+
+    def cancel_processing(self):
+        """'취소' 버튼. 실행 중인 외부 도구를 종료하고 부분 요약을 출력합니다."""
+        if self.worker_thread and self.worker_thread.is_alive():
+            if messagebox.askyesno("작업 취소", "진행 중인 작업을 취소하시겠습니까?"):
+                self.worker_thread.stop()
+                self.cancel_button.config(state=tk.DISABLED)
+                self.pause_button.config(state=tk.DISABLED)
+                self.log("작업 취소를 요청했습니다...")
+
     def poll_queue(self):
         """주기적으로 큐를 확인하여 UI를 업데이트합니다."""
         try:
@@ -123,8 +206,8 @@ class MainApplication:
         except queue.Empty:
             pass
         finally:
-            # 워커 스레드가 살아있으면 계속 폴링
-            if self.worker_thread and self.worker_thread.is_alive():
+            # 워커 스레드나 시작 작업이 살아있으면 계속 폴링
+            if self._is_polling_needed():
                 self.root.after(100, self.poll_queue)
 
     def handle_message(self, event_type, *args):
@@ -143,11 +226,28 @@ class MainApplication:
             # 결과 폴더 경로 설정 및 버튼 활성화
             source_path = self.source_dir.get()
             if source_path:
-                self.result_folder_path = os.path.join(source_path, "result")
+                self.result_folder_path = self._result_root(source_path)
                 self.open_result_button.config(state=tk.NORMAL)
+                if os.path.exists(self._thumbnail_cache_path()):
+                    self.thumbnail_button.config(state=tk.NORMAL)
             else:
                 self.open_result_button.config(state=tk.DISABLED)
             # 요약 보고서는 orchestrator에서 'log' 메시지로 이미 전송됨
+            self.pause_button.config(state=tk.DISABLED)
+            self.cancel_button.config(state=tk.DISABLED)
+        elif event_type == 'error':
+            # 시작 전 검사(여유 공간 등) 실패
+            self.log(args[0])
+            messagebox.showerror("오류", args[0])
+            self.start_button.config(state=tk.NORMAL)
+            self.pause_button.config(state=tk.DISABLED)
+            self.cancel_button.config(state=tk.DISABLED)
+        elif event_type == 'cancelled':
+            self.log(args[0])
+            messagebox.showinfo("작업 취소", "작업이 취소되었습니다. 부분 요약을 로그에서 확인해주세요.")
+            self.start_button.config(state=tk.NORMAL)
+            self.pause_button.config(state=tk.DISABLED)
+            self.cancel_button.config(state=tk.DISABLED)
 
     def log(self, message):
         """로그 창에 메시지를 추가합니다."""
@@ -156,6 +256,20 @@ class MainApplication:
         self.log_area.see(tk.END)
         self.log_area.config(state=tk.DISABLED)
 
+    def _thumbnail_cache_path(self):
+        from .thumbnails import THUMBNAIL_CACHE_FILENAME
+        return os.path.join(self.result_folder_path or "", THUMBNAIL_CACHE_FILENAME)
+
+    def open_thumbnail_view(self):
+        """결과 이미지를 탐색기 대신 썸네일 캐시로 빠르게 훑어봅니다. (원본 이미지 디코딩 없음)"""
+        cache_path = self._thumbnail_cache_path()
+        if not os.path.exists(cache_path):
+            messagebox.showwarning("경고", "썸네일 캐시가 없습니다. '결과 썸네일 캐시 생성'을 켜고 다시 처리하세요.")
+            return
+        from .thumbnail_view import ThumbnailGrid
+        ThumbnailGrid(self.root, cache_path)
+        self.log(f"썸네일 보기: {cache_path}")
+
     def open_result_folder(self):
         """'결과 폴더 열기' 기능을 구현합니다."""
         if self.result_folder_path and os.path.exists(self.result_folder_path):
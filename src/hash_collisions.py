@@ -0,0 +1,83 @@
+# src/hash_collisions.py
+import os
+import sys
+import argparse
+from collections import defaultdict
+from pathlib import Path
+
+from . import scanner
+from .scanner import calculate_md5, calculate_sampled_hash
+from .manifest import read_manifest
+
+# 파일명에 쓰는 해시 자리수 (IMG_<HASH5>)
+NAME_HASH_LENGTH = 5
+
+def _result_files(result_root):
+    for root, _, files in os.walk(result_root):
+        for name in sorted(files):
+            if not name.startswith("."): # 저널, 레코드 등 상태 파일 제외
+                yield Path(root) / name
+
+def _name_collisions(entries: list, index: int) -> int:
+    """한 디렉토리에서 파일명 해시 앞자리가 겹치는 내용이 다른 파일 수 (중복 접미사 _1이 붙는 파일)."""
+    by_prefix = defaultdict(set)
+    for entry in entries:
+        by_prefix[entry[index][:NAME_HASH_LENGTH]].add(entry[1])
+    return sum(len(contents) - 1 for contents in by_prefix.values())
+
+def analyze(result_roots: list) -> dict:
+    """
+    결과 트리의 파일마다 전체 MD5와 표본 해시(sampled-v1)를 계산하여 두 방식의 충돌을 비교합니다.
+    - sampled_false_matches: 표본 해시는 같지만 내용(MD5)은 다른 파일 쌍 수
+    - name_collisions: 디렉토리별로 파일명 해시 앞 5자리가 겹치는 내용이 다른 파일 수 (방식별)
+    - expected_name_collisions: 해시가 균등하다고 볼 때의 기대값 (디렉토리별 n(n-1)/2 / 16^5의 합)
+    """
+    by_directory = defaultdict(list) # 디렉토리 -> [(크기, MD5, 표본 해시)]
+    report = {"files": 0, "large_files": 0, "bytes": 0, "sampled_bytes_read": 0, "manifests": {}}
+    for result_root in result_roots:
+        report["manifests"][str(result_root)] = (read_manifest(result_root) or {}).get("naming_hash", "md5 (매니페스트 없음)")
+        for path in _result_files(result_root):
+            size = path.stat().st_size
+            md5 = calculate_md5(path)
+            large = size >= scanner.SAMPLED_HASH_MIN_SIZE
+            sampled = calculate_sampled_hash(path) if large else md5
+            by_directory[path.parent].append((size, md5, sampled))
+            report["files"] += 1
+            report["bytes"] += size
+            if large:
+                report["large_files"] += 1
+                report["sampled_bytes_read"] += (2 + scanner.SAMPLED_HASH_MIDDLE_BLOCKS) * scanner.SAMPLED_HASH_BLOCK_SIZE
+            else:
+                report["sampled_bytes_read"] += size
+
+    contents_by_sampled = defaultdict(set)
+    for entries in by_directory.values():
+        for _, md5, sampled in entries:
+            contents_by_sampled[sampled].add(md5)
+    report["sampled_false_matches"] = sum(len(c) * (len(c) - 1) // 2 for c in contents_by_sampled.values())
+    report["name_collisions"] = {
+        "md5": sum(_name_collisions(entries, 1) for entries in by_directory.values()),
+        "sampled-v1": sum(_name_collisions(entries, 2) for entries in by_directory.values()),
+    }
+    space = 16 ** NAME_HASH_LENGTH
+    report["expected_name_collisions"] = sum(len(e) * (len(e) - 1) / 2 / space for e in by_directory.values())
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MDNS 파일명 해시 방식(md5 / sampled-v1) 충돌 분석")
+    parser.add_argument("result_roots", nargs="+", help="분석할 결과 폴더 (여러 개 가능)")
+    args = parser.parse_args(argv)
+
+    report = analyze([Path(p) for p in args.result_roots])
+    for root, scheme in report["manifests"].items():
+        print(f"{root}: 파일명 해시 방식 {scheme}")
+    print(f"파일 {report['files']}개 ({report['bytes'] / 1024 ** 3:.2f} GB), 표본 해시 대상(>= {scanner.SAMPLED_HASH_MIN_SIZE // 1024 ** 2} MiB) {report['large_files']}개")
+    if report["bytes"]:
+        print(f"해시 계산 시 읽는 양: md5 {report['bytes'] / 1024 ** 3:.2f} GB, sampled-v1 {report['sampled_bytes_read'] / 1024 ** 3:.2f} GB")
+    print(f"표본 해시가 같지만 내용이 다른 파일 쌍: {report['sampled_false_matches']}")
+    print(f"파일명 해시 앞 {NAME_HASH_LENGTH}자리 충돌 (디렉토리별): md5 {report['name_collisions']['md5']}, "
+          f"sampled-v1 {report['name_collisions']['sampled-v1']} (기대값 {report['expected_name_collisions']:.4f})")
+    return 1 if report["sampled_false_matches"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
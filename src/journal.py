@@ -0,0 +1,134 @@
+# src/journal.py
+import os
+import json
+import threading
+from pathlib import Path
+
+from .scanner import SUPPORTED_EXTENSIONS
+from .naming import STAGING_PREFIX
+
+JOURNAL_FILENAME = ".mdns_journal.jsonl"
+
+# 파일별로 기록되는 처리 단계
+STAGE_OUTPUT = "output"     # 결과 파일 생성(복사/변환) 완료
+STAGE_METADATA = "metadata" # 메타데이터 기록 완료 (스코프 카운터 사용)
+STAGE_DONE = "done"         # 파일명 표준화까지 완료
+# 결과 디렉토리별로 기록되는 파일명 변경 계획 (적용 전에 기록)
+STAGE_RENAME_PLAN = "rename_plan"
+RENAME_PLAN_KEY_PREFIX = "rename:"
+
+class RunJournal:
+    """
+    실행 단위의 선행 기록(write-ahead) 저널.
+    파일별 완료 단계를 JSON Lines로 추가 기록하며, 각 줄은 한 번의 write 후 fsync되므로
+    프로그램이나 장비가 중간에 종료되어도 마지막으로 완료된 단계까지는 보존됩니다.
+    마지막 줄이 잘려 있으면 로드 시 무시합니다.
+    filename은 같은 결과 루트를 여러 실행이 나눠 쓸 때(샤드 모드) 실행별 저널 파일 이름입니다.
+    """
+    def __init__(self, result_root, resume: bool = False, filename: str = JOURNAL_FILENAME):
+        self.result_root = Path(result_root)
+        self.path = self.result_root / filename
+        self.records = {} # key -> {stage: data}
+        self._lock = threading.Lock()
+        os.makedirs(self.result_root, exist_ok=True)
+        if resume:
+            self.records = self._load()
+        self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+
+    def _load(self) -> dict:
+        records = {}
+        if not self.path.exists():
+            return records
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue # 기록 도중 끊긴 줄
+                records.setdefault(entry["key"], {})[entry["stage"]] = entry.get("data", {})
+        return records
+
+    @staticmethod
+    def key_for(file_info) -> str:
+        """소스 루트 기준 상대 경로를 저널 키로 사용합니다."""
+        return (file_info.relative_path / file_info.filename).as_posix()
+
+    def record(self, key: str, stage: str, **data):
+        """단계 완료를 기록하고 디스크에 반영될 때까지 기다립니다."""
+        line = json.dumps({"key": key, "stage": stage, "data": data}, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.records.setdefault(key, {})[stage] = data
+
+    def record_rename_plan(self, result_dir, entries: list):
+        """
+        결과 디렉토리의 파일명 변경 계획을 적용 전에 기록합니다.
+        entries: [(파일 키, 현재 경로 또는 None(하드링크), 최종 경로)]
+        """
+        self.record(RENAME_PLAN_KEY_PREFIX + str(result_dir), STAGE_RENAME_PLAN, entries=[list(e) for e in entries])
+
+    def rename_plans(self):
+        """기록된 파일명 변경 계획의 항목 목록들을 반환합니다."""
+        return [stages[STAGE_RENAME_PLAN]["entries"] for key, stages in self.records.items() if STAGE_RENAME_PLAN in stages]
+
+    def is_done(self, key: str) -> bool:
+        return STAGE_DONE in self.records.get(key, {})
+
+    def completed_items(self):
+        """완료된 파일의 (key, done 기록) 목록을 반환합니다."""
+        return [(key, stages[STAGE_DONE]) for key, stages in self.records.items() if STAGE_DONE in stages]
+
+    def incomplete_items(self):
+        """시작했지만 완료되지 않은 파일의 (key, 단계 기록) 목록을 반환합니다."""
+        return [(key, stages) for key, stages in self.records.items() if STAGE_DONE not in stages and not key.startswith(RENAME_PLAN_KEY_PREFIX)]
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+def reconcile_partial_outputs(journal: RunJournal, queue, directories=None) -> int:
+    """
+    재개 전에 중단된 실행의 잔여물을 정리합니다.
+    - 완료되지 않은 파일의 중간 결과물 (해당 파일은 원본에서 다시 처리됨)
+    - VideoFfmpegProcessor가 남긴 temp_<name> 임시 파일
+    - ExifTool이 남긴 <name>_original 백업 파일
+    - 저널 기록 전에 중단된 임시 이름(.mdns_stage_*)의 결과 파일과 하드링크 임시 파일(.mdns_link_*)
+    - 파일명 변경 계획이 적용되던 중 중단되어 최종 이름으로 남은, 완료되지 않은 파일의 결과물
+    directories가 주어지면 임시/백업 파일은 그 디렉토리들에서만 찾습니다. (다른 샤드가 쓰는 디렉토리는 건드리지 않음)
+    Returns:
+        int: 삭제한 파일 수.
+    """
+    removed = 0
+    # temp_<name>은 <name>이 남아 있을 때만 판별 가능하므로 중간 결과물보다 먼저 정리한다
+    if directories is None:
+        listings = ((root, files) for root, _, files in os.walk(journal.result_root))
+    else:
+        listings = ((str(d), os.listdir(d)) for d in directories if os.path.isdir(d))
+    for root, files in listings:
+        names = set(files)
+        for name in files:
+            is_ffmpeg_temp = name.startswith("temp_") and name[len("temp_"):] in names
+            is_exiftool_backup = name.endswith("_original") and Path(name[:-len("_original")]).suffix.lower() in SUPPORTED_EXTENSIONS
+            is_staged = name.startswith(STAGING_PREFIX) or name.startswith(".mdns_link_")
+            if is_ffmpeg_temp or is_exiftool_backup or is_staged:
+                os.remove(os.path.join(root, name))
+                removed += 1
+                queue.put(('log', f"  임시/백업 파일 정리: {os.path.join(root, name)}"))
+
+    for _, stages in journal.incomplete_items():
+        output_path = stages.get(STAGE_OUTPUT, {}).get("path")
+        if output_path and os.path.exists(output_path):
+            os.remove(output_path)
+            removed += 1
+            queue.put(('log', f"  미완료 결과물 정리: {output_path}"))
+
+    # 계획의 최종 이름은 계획 시점에 비어 있던 이름이므로, 완료 기록이 없는 파일의 최종 이름은 중단된 적용의 결과물이다
+    for entries in journal.rename_plans():
+        for file_key, _, final_path in entries:
+            if not journal.is_done(file_key) and os.path.lexists(final_path):
+                os.remove(final_path)
+                removed += 1
+                queue.put(('log', f"  미완료 결과물 정리: {final_path}"))
+    return removed
@@ -30,6 +30,12 @@ LOG_MESSAGES = {
     "COPY_TO_RESULT": "복사: result 폴더로 복사",
     "COPY_FAIL": "복사: 실패(오류 로그 확인)",
 
+    # 중복
+    "DEDUP_REPORT": "중복: 동일한 내용의 파일 발견(원본: {original})",
+    "DEDUP_SKIP": "중복: 동일한 내용의 파일이라 건너뜀(원본: {original})",
+    "DEDUP_HARDLINK": "중복: 원본 결과물에 하드링크로 연결({original})",
+    "DEDUP_SCOPE_DIFFERS": "중복: 원본과 날짜 스코프가 달라 따로 처리(원본: {original})",
+
     # 외부 도구 (DEV_GUIDE 6.2에는 없지만, ExternalToolError 발생 시 유용)
     "EXTERNAL_TOOL_NOT_FOUND": "외부 도구({tool_name})를 찾을 수 없습니다.",
     "EXTERNAL_TOOL_ERROR": "외부 도구({tool_name}) 실행 실패(오류 로그 확인)",
@@ -0,0 +1,62 @@
+# src/manifest.py
+import os
+import json
+from pathlib import Path
+from typing import Union
+
+from .errors import FileOperationError
+from .scanner import HASH_SCHEMES, SAMPLED_HASH_MIN_SIZE, SAMPLED_HASH_BLOCK_SIZE, SAMPLED_HASH_MIDDLE_BLOCKS
+
+MANIFEST_FILENAME = ".mdns_manifest.json"
+MANIFEST_VERSION = 1
+
+def build_manifest(naming_hash: str) -> dict:
+    """결과 트리를 만든 규칙. 파일명 해시 방식과 (표본 해시이면) 표본 설정을 함께 기록합니다."""
+    manifest = {"manifest_version": MANIFEST_VERSION, "naming_hash": naming_hash}
+    if naming_hash.startswith("sampled"):
+        manifest["naming_hash_params"] = {
+            "min_size": SAMPLED_HASH_MIN_SIZE,
+            "block_size": SAMPLED_HASH_BLOCK_SIZE,
+            "middle_blocks": SAMPLED_HASH_MIDDLE_BLOCKS,
+        }
+    return manifest
+
+def read_manifest(result_root) -> Union[dict, None]:
+    path = Path(result_root) / MANIFEST_FILENAME
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+def _has_outputs(result_root) -> bool:
+    """결과 루트에 이전 실행의 결과물이 있는지. 숨김 상태 파일(.mdns_*)은 결과물로 보지 않습니다."""
+    try:
+        return any(not name.startswith('.') for name in os.listdir(result_root))
+    except OSError:
+        return False
+
+def prepare_manifest(result_root, naming_hash: str, resume: bool = False) -> dict:
+    """
+    실행 매니페스트를 확인하고 기록합니다.
+    재개하거나 결과물이 있는 결과 트리에 이어서 쓸 때 이전 실행과 파일명 해시 방식이 다르면
+    한 결과 트리에 두 방식의 이름이 섞이므로 중단합니다. (매니페스트가 없는 이전 결과 트리는 md5 방식으로 간주)
+    결과물이 없는 결과 트리에 새로 실행하는 경우에만 다른 방식의 매니페스트를 덮어씁니다.
+    Raises:
+        ValueError: 알 수 없는 해시 방식.
+        FileOperationError: 이어서 쓸 결과 트리의 해시 방식이 다른 경우.
+    """
+    if naming_hash not in HASH_SCHEMES:
+        raise ValueError(f"Unknown naming hash scheme: {naming_hash}")
+    has_outputs = _has_outputs(result_root)
+    previous = read_manifest(result_root) or ({"naming_hash": "md5"} if has_outputs else None)
+    if previous is not None and (resume or has_outputs) and previous.get("naming_hash") != naming_hash:
+        raise FileOperationError(f"이전 실행의 파일명 해시 방식({previous.get('naming_hash')})과 다릅니다: {naming_hash}")
+    manifest = build_manifest(naming_hash)
+    os.makedirs(result_root, exist_ok=True)
+    path = Path(result_root) / MANIFEST_FILENAME
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp") # 샤드가 동시에 같은 내용을 기록할 수 있음
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(temp_path, path)
+    return manifest
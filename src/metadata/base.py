@@ -1,7 +1,13 @@
 # src/metadata/base.py
+import os
+import asyncio
+import importlib
+import threading
 from abc import ABC, abstractmethod
 from typing import Union
 
+from ..copy_engine import copy_file
+from ..control import in_current_context
 
 class MetadataProcessor(ABC):
     """
@@ -9,10 +15,11 @@ class MetadataProcessor(ABC):
     모든 포맷별 메타데이터 프로세서는 이 클래스를 상속받아야 합니다.
     """
     @abstractmethod
-    def read_metadata(self, file_path) -> Union[dict[str, str], None]:
+    def read_metadata(self, file_path) -> Union[dict, None]:
         """
         파일에서 메타데이터를 읽습니다.
         :return: {'ymd': 'YYYY-MM-DD'} 또는 날짜 정보가 없으면 None
+                 (프로세서에 따라 'thumbnail' 등 부가 키를 포함할 수 있음)
         """
         pass
 
@@ -25,20 +32,111 @@ class MetadataProcessor(ABC):
         """
         pass
 
+    async def read_metadata_async(self, file_path) -> Union[dict, None]:
+        """
+        비동기 엔진용 read_metadata. 기본 구현은 스레드 풀에서 read_metadata를 실행합니다.
+        외부 도구를 실행하는 프로세서는 ToolScheduler.run_async로 실행하도록 재정의합니다.
+        """
+        return await asyncio.get_running_loop().run_in_executor(None, in_current_context(self.read_metadata), file_path)
+
+    async def write_metadata_async(self, file_path, new_datetime_str) -> bool:
+        """비동기 엔진용 write_metadata. 기본 구현과 재정의 방식은 read_metadata_async와 같습니다."""
+        return await asyncio.get_running_loop().run_in_executor(None, in_current_context(self.write_metadata), file_path, new_datetime_str)
+
+    # write_metadata_to의 source로 파일 내용(bytes)도 받을 수 있는지 (PNG 변환 결과를 메모리에서 바로 기록)
+    supports_bytes_source = False
+
+    def write_metadata_to(self, source_path, destination_path, new_datetime_str) -> bool:
+        """
+        원본을 읽어 새 날짜/시간을 넣은 결과 파일을 destination_path에 만듭니다. 원본은 바꾸지 않습니다.
+        기본 구현은 복사 후 제자리 기록(쓰기 두 번)이며, 한 번의 쓰기로 만들 수 있는 프로세서는 재정의합니다.
+        :return: 성공 시 True, 실패 시 False (결과 파일이 남아 있을 수 있음)
+        """
+        copy_file(source_path, destination_path)
+        return self.write_metadata(str(destination_path), new_datetime_str)
+
+# 확장자 -> (모듈, 클래스) 디스패치 테이블.
+# 모듈은 해당 형식의 파일을 처음 만났을 때 임포트하므로, 동영상만 처리하는 실행에서는 piexif를 불러오지 않는다.
+PROCESSOR_REGISTRY = {
+    '.jpg': ('jpg_piexif', 'JpgPiexifProcessor'),
+    '.jpeg': ('jpg_piexif', 'JpgPiexifProcessor'),
+    '.mp4': ('video_ffmpeg', 'VideoFfmpegProcessor'),
+    '.mov': ('video_ffmpeg', 'VideoFfmpegProcessor'),
+    '.avi': ('video_ffmpeg', 'VideoFfmpegProcessor'), # AVI is handled internally by VideoFfmpegProcessor to skip
+    '.cr3': ('raw_exiftool', 'RawExiftoolProcessor'),
+}
+
+# (선택) 확장자별로 고를 수 있는 통합 백엔드: 상주 ExifTool 세션 하나로 모든 형식의 날짜 태그를 읽고 쓴다.
+METADATA_BACKENDS = {
+    'exiftool': ('exiftool_unified', 'ExiftoolUnifiedProcessor'),
+}
+EXIFTOOL_BACKEND_EXTENSIONS = ('.jpg', '.jpeg', '.mp4', '.mov', '.cr3')
+# 확장자 -> 백엔드 이름. 프로세스 풀 워커(spawn)에도 전달되도록 환경 변수에 함께 기록한다.
+# 예: MDNS_METADATA_BACKENDS=".jpg=exiftool,.mp4=exiftool"
+BACKEND_ENV_VAR = "MDNS_METADATA_BACKENDS"
+
+def _load_backend_overrides() -> dict:
+    overrides = {}
+    for item in os.environ.get(BACKEND_ENV_VAR, "").split(","):
+        extension, _, backend = item.partition("=")
+        if backend in METADATA_BACKENDS:
+            overrides[extension.strip().lower()] = backend
+    return overrides
+
+_backend_overrides = _load_backend_overrides()
+
+def set_metadata_backend(backend, extensions=EXIFTOOL_BACKEND_EXTENSIONS):
+    """
+    주어진 확장자의 메타데이터 처리를 backend로 바꿉니다. backend가 None이면 기본 프로세서로 되돌립니다.
+    캐시된 프로세서 인스턴스는 버려지므로 다음 get_metadata_processor 호출부터 적용됩니다.
+    """
+    if backend is not None and backend not in METADATA_BACKENDS:
+        raise ValueError(f"Unknown metadata backend: {backend}")
+    for extension in extensions:
+        if backend is None:
+            _backend_overrides.pop(extension.lower(), None)
+        else:
+            _backend_overrides[extension.lower()] = backend
+    os.environ[BACKEND_ENV_VAR] = ",".join(f"{ext}={name}" for ext, name in sorted(_backend_overrides.items()))
+    reset_processor_cache()
+
+def resolve_processor_entry(file_extension: str):
+    """확장자에 사용할 (모듈, 클래스). 지원하지 않는 형식이면 None."""
+    extension = file_extension.lower()
+    backend = _backend_overrides.get(extension)
+    if backend is not None:
+        return METADATA_BACKENDS[backend]
+    return PROCESSOR_REGISTRY.get(extension)
+
+# 실행 단위로 재사용하는 프로세서 인스턴스. 프로세서는 바이너리 경로 외의 상태를 갖지 않으므로 스레드 간 공유 가능.
+_processor_instances = {}
+_processor_lock = threading.Lock()
+
 def get_metadata_processor(file_extension: str) -> Union[MetadataProcessor, None]:
     """
     파일 확장자에 따라 적절한 메타데이터 프로세서 인스턴스를 반환하는 팩토리 함수.
+    같은 프로세서 클래스는 reset_processor_cache() 전까지 하나의 인스턴스를 재사용합니다.
+    (바이너리 경로 확인도 인스턴스 생성 시 한 번만 수행)
     """
-    from .jpg_piexif import JpgPiexifProcessor
-    from .video_ffmpeg import VideoFfmpegProcessor
-    from .raw_exiftool import RawExiftoolProcessor
-
-    ext = file_extension.lower()
-    if ext in ['.jpg', '.jpeg']:
-        return JpgPiexifProcessor()
-    elif ext in ['.mp4', '.mov', '.avi']: # AVI is handled internally by VideoFfmpegProcessor to skip
-        return VideoFfmpegProcessor()
-    elif ext == '.cr3':
-        return RawExiftoolProcessor()
-    else:
+    entry = resolve_processor_entry(file_extension)
+    if entry is None:
         return None # 지원하지 않는 형식
+
+    with _processor_lock:
+        processor = _processor_instances.get(entry)
+        if processor is None:
+            module_name, class_name = entry
+            module = importlib.import_module(f".{module_name}", __package__)
+            processor = getattr(module, class_name)() # 바이너리가 없으면 FileNotFoundError (캐시하지 않음)
+            _processor_instances[entry] = processor
+    return processor
+
+def reset_processor_cache():
+    """실행 시작 시 호출하여, 실행 사이에 설치/교체된 바이너리를 다시 확인하게 합니다."""
+    with _processor_lock:
+        processors = list(_processor_instances.values())
+        _processor_instances.clear()
+    for processor in processors:
+        close = getattr(processor, "close", None) # 상주 세션을 가진 프로세서
+        if close:
+            close()
@@ -0,0 +1,170 @@
+# src/metadata/exiftool_session.py
+import os
+import queue
+import time
+import threading
+import subprocess
+from typing import Union
+
+from ..control import get_active_control
+from ..errors import ExternalToolError, ProcessingCancelled
+from ..external import get_scheduler
+
+# 모든 명령에 공통으로 붙는 인자. 인자 파일은 UTF-8로 쓰므로 파일명도 UTF-8로 해석하게 한다.
+COMMON_ARGS = ("-charset", "filename=utf8", "-api", "largefilesupport=1")
+
+class ExiftoolSession:
+    """
+    `exiftool -stay_open True -@ -`로 띄운 상주 ExifTool 프로세스 하나.
+    명령마다 인자를 한 줄에 하나씩 표준 입력(인자 파일)으로 보내고 -execute로 실행하므로,
+    파일마다 Perl 인터프리터를 새로 띄우는 비용(수십~수백 ms)이 없습니다.
+    stdout/stderr는 수신 스레드가 읽어 두며, 명령의 끝은 {readyN} 표식으로 구분합니다.
+    한 세션은 한 번에 명령 하나만 실행합니다. (여러 스레드에서는 ExiftoolSessionPool 사용)
+    """
+    def __init__(self, exiftool_path: str):
+        self.exiftool_path = exiftool_path
+        self._proc = None
+        self._sequence = 0
+
+    def _start(self):
+        self._proc = subprocess.Popen(
+            [self.exiftool_path, "-stay_open", "True", "-@", "-", "-common_args", *COMMON_ARGS],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            text=True, encoding='utf-8', errors='ignore', bufsize=1,
+        )
+        self._stdout, self._stderr = queue.Queue(), queue.Queue()
+        for stream, lines in ((self._proc.stdout, self._stdout), (self._proc.stderr, self._stderr)):
+            threading.Thread(target=self._read_lines, args=(stream, lines), daemon=True).start()
+
+    @staticmethod
+    def _read_lines(stream, lines: queue.Queue):
+        for line in stream:
+            lines.put(line)
+        lines.put(None) # 프로세스 종료
+
+    @property
+    def alive(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    def execute_many(self, commands: list, timeout: float) -> list:
+        """
+        여러 명령의 인자를 한 번에 보내고, 명령별 (stdout, stderr)를 순서대로 반환합니다.
+        timeout은 전체 명령에 대한 제한 시간(초)입니다. 초과하거나 프로세스가 종료되면 세션을 닫고 예외를 발생시킵니다.
+        """
+        if not self.alive:
+            self._start()
+        tokens, script = [], []
+        for args in commands:
+            self._sequence += 1
+            token = f"{{ready{self._sequence}}}"
+            tokens.append(token)
+            script.extend(str(arg).replace("\n", " ") for arg in args)
+            script.extend(("-echo4", token, f"-execute{self._sequence}"))
+        proc = self._proc
+        control = get_active_control()
+        if control:
+            control.register_process(proc) # 취소 시 세션 프로세스를 종료하여 즉시 중단
+        try:
+            proc.stdin.write("\n".join(script) + "\n")
+            proc.stdin.flush()
+            deadline = time.monotonic() + timeout
+            return [(self._read_until(self._stdout, token, deadline), self._read_until(self._stderr, token, deadline)) for token in tokens]
+        except (OSError, ExternalToolError, subprocess.TimeoutExpired) as e:
+            self.close(kill=isinstance(e, subprocess.TimeoutExpired)) # 멈춘 세션은 종료 요청을 읽지 않으므로 강제 종료
+            if control and control.is_cancelled:
+                raise ProcessingCancelled("외부 도구 실행이 취소되었습니다: exiftool")
+            raise
+        finally:
+            if control:
+                control.unregister_process(proc)
+
+    def execute(self, args: list, timeout: float) -> tuple:
+        return self.execute_many([args], timeout)[0]
+
+    def _read_until(self, lines: queue.Queue, token: str, deadline: float) -> str:
+        output = []
+        while True:
+            try:
+                line = lines.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                raise subprocess.TimeoutExpired(self.exiftool_path, 0)
+            if line is None:
+                raise ExternalToolError("ExifTool 세션이 예기치 않게 종료되었습니다.", stdout="".join(output))
+            if line.rstrip("\r\n") == token:
+                return "".join(output)
+            output.append(line)
+
+    def close(self, kill: bool = False):
+        """세션을 닫습니다. kill이면 종료 요청 없이 강제 종료합니다. (멈춘 세션)"""
+        if self._proc is None:
+            return
+        proc, self._proc = self._proc, None
+        if not kill and proc.poll() is None:
+            try:
+                proc.stdin.write("-stay_open\nFalse\n")
+                proc.stdin.flush()
+                proc.wait(timeout=5)
+                return
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+        proc.kill()
+        proc.wait()
+
+class ExiftoolSessionPool:
+    """
+    스레드마다 상주 세션을 빌려 쓰는 풀. 세션 수는 스케줄러의 exiftool 동시 실행 제한을 넘지 않습니다.
+    """
+    def __init__(self, exiftool_path: str, max_sessions: Union[int, None] = None):
+        self.exiftool_path = exiftool_path
+        self.max_sessions = max_sessions or get_scheduler().policy_for("exiftool").max_concurrency
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._sessions = []
+
+    def run(self, commands: list, input_path=None) -> list:
+        """
+        명령들을 한 세션에서 실행합니다. 제한 시간과 통계는 외부 도구 스케줄러 정책을 따릅니다.
+        Raises:
+            ExternalToolError: 제한 시간 초과(세션은 강제 종료) 또는 세션이 예기치 않게 종료된 경우.
+        """
+        input_size = 0
+        if input_path is not None:
+            try:
+                input_size = os.path.getsize(input_path)
+            except OSError:
+                pass
+        scheduler = get_scheduler()
+        timeout = scheduler.timeout_for("exiftool", input_size) * len(commands)
+        session = self._acquire()
+        start = time.perf_counter()
+        failed, timed_out = True, False
+        try:
+            results = session.execute_many(commands, timeout)
+            failed = False
+            return results
+        except subprocess.TimeoutExpired as e:
+            # ToolScheduler.run과 같이 타임아웃은 ExternalToolError로 보고 (세션은 강제 종료되어 다음 호출에서 새로 시작)
+            timed_out = True
+            raise ExternalToolError(f"exiftool timed out after {timeout:.0f}s and was killed") from e
+        finally:
+            scheduler.record("exiftool", time.perf_counter() - start, input_size, failed=failed, timed_out=timed_out)
+            self._idle.put(session)
+
+    def _acquire(self) -> ExiftoolSession:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.max_sessions:
+                self._created += 1
+                session = ExiftoolSession(self.exiftool_path)
+                self._sessions.append(session)
+                return session
+        return self._idle.get()
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions:
+                session.close()
@@ -0,0 +1,107 @@
+# src/metadata/exiftool_unified.py
+import os
+import json
+from pathlib import Path
+
+from .base import MetadataProcessor
+from .exiftool_session import ExiftoolSessionPool
+from ..paths import get_exiftool_path
+from ..errors import ExternalToolError, MetadataError, ProcessingCancelled
+
+VIDEO_EXTENSIONS = {'.mp4', '.mov'}
+READ_TAGS = ("-DateTimeOriginal", "-CreateDate", "-ModifyDate")
+
+def write_args(file_path, new_datetime_str: str) -> list:
+    """
+    날짜 태그 쓰기 인자. 모든 형식에 DateTimeOriginal/CreateDate/ModifyDate를 쓰고,
+    동영상은 QuickTime CreateDate도 씁니다. (VideoFfmpegProcessor와 같이 시각을 그대로 UTC 값으로 기록)
+    """
+    args = [
+        f"-DateTimeOriginal={new_datetime_str}",
+        f"-CreateDate={new_datetime_str}",
+        f"-ModifyDate={new_datetime_str}",
+    ]
+    if Path(file_path).suffix.lower() in VIDEO_EXTENSIONS:
+        args.append(f"-QuickTime:CreateDate={new_datetime_str}")
+    args.append(str(file_path))
+    return args
+
+class ExiftoolUnifiedProcessor(MetadataProcessor):
+    """
+    상주 ExifTool 세션으로 JPG, 동영상(MP4/MOV), CR3의 날짜 태그를 읽고 쓰는 통합 백엔드.
+    형식별 프로세서(piexif, ffmpeg 리먹스, ExifTool 1회 실행) 대신 set_metadata_backend('exiftool')로 선택합니다.
+    동영상도 스트림을 다시 쓰지 않고 태그만 수정하므로 ffmpeg 리먹스보다 I/O가 적습니다.
+    """
+
+    def __init__(self):
+        self.exiftool_path = get_exiftool_path()
+        if not self.exiftool_path or not os.path.exists(self.exiftool_path):
+            raise FileNotFoundError(f"ExifTool executable not found at {self.exiftool_path}")
+        self.sessions = ExiftoolSessionPool(self.exiftool_path)
+
+    def read_metadata(self, file_path):
+        """DateTimeOriginal -> CreateDate -> ModifyDate 순으로 날짜를 찾습니다. (동영상은 QuickTime CreateDate)"""
+        try:
+            stdout, stderr = self.sessions.run([["-j", "-d", "%Y:%m:%d %H:%M:%S", *READ_TAGS, str(file_path)]], input_path=file_path)[0]
+            try:
+                tags = json.loads(stdout)[0] if stdout.strip() else {}
+            except (json.JSONDecodeError, IndexError) as e:
+                raise MetadataError(f"ExifTool JSON parse failed for {file_path}: {e} {stderr.strip()}")
+            for tag in ("DateTimeOriginal", "CreateDate", "ModifyDate"):
+                value = tags.get(tag)
+                if isinstance(value, str) and value[:4].isdigit() and not value.startswith("0000"):
+                    return {"ymd": value.split(' ')[0].replace(':', '-')}
+            return None
+        except (ProcessingCancelled, MetadataError):
+            raise
+        except ExternalToolError:
+            raise
+        except Exception as e:
+            raise MetadataError(f"Failed to read metadata from {file_path}: {e}")
+
+    def write_metadata(self, file_path, new_datetime_str) -> bool:
+        return self.write_many([(file_path, new_datetime_str)])[0]
+
+    def write_metadata_to(self, source_path, destination_path, new_datetime_str) -> bool:
+        """-o로 원본을 읽어 날짜 태그를 바꾼 결과 파일을 바로 만듭니다. (복사 후 재기록 없음)"""
+        args = write_args(source_path, new_datetime_str)
+        args[-1:-1] = ["-o", str(destination_path)]
+        try:
+            stdout, stderr = self.sessions.run([args], input_path=source_path)[0]
+            if "1 image files created" not in stdout:
+                raise ExternalToolError(f"ExifTool write operation for {destination_path} did not confirm creation.", stdout=stdout, stderr=stderr)
+            return True
+        except BaseException:
+            if os.path.exists(destination_path):
+                os.remove(destination_path)
+            raise
+
+    def write_many(self, items: list) -> list:
+        """
+        여러 파일의 날짜 태그를 한 세션에 한 번에 보내 기록합니다. (파일마다 -execute 한 번)
+        처리 파이프라인(_run_pipeline)은 파일마다 쓰기 성공 여부로 시간 오프셋을 정하므로 write_metadata로 한 파일씩 기록하며,
+        여러 파일을 묶어 보내는 경로는 벤치마크(benchmarks/bench_metadata.py)에서만 사용합니다.
+        RawExiftoolProcessor와 같이 -overwrite_original 없이 쓰고 남은 백업 파일(_original)을 삭제합니다.
+        Returns:
+            list[bool]: 파일별 성공 여부. 실패한 파일은 ExternalToolError로 보고합니다.
+        """
+        commands = [write_args(file_path, new_datetime_str) for file_path, new_datetime_str in items]
+        try:
+            results = self.sessions.run(commands, input_path=items[0][0] if len(items) == 1 else None)
+        finally:
+            for file_path, _ in items:
+                backup = f"{file_path}_original"
+                if os.path.exists(backup):
+                    os.remove(backup)
+        outcomes = []
+        for (file_path, _), (stdout, stderr) in zip(items, results):
+            if "1 image files updated" not in stdout:
+                if len(items) == 1:
+                    raise ExternalToolError(f"ExifTool write operation for {file_path} did not confirm update.", stdout=stdout, stderr=stderr)
+                outcomes.append(False)
+                continue
+            outcomes.append(True)
+        return outcomes
+
+    def close(self):
+        self.sessions.close()
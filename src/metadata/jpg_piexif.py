@@ -5,19 +5,26 @@ from ..errors import MetadataError
 
 class JpgPiexifProcessor(MetadataProcessor):
     """piexif를 사용하여 JPG/JPEG 파일의 Exif 메타데이터를 처리합니다."""
+    supports_bytes_source = True
 
     def read_metadata(self, file_path):
         """
-        DateTimeOriginal 태그를 읽어 YYYY-MM-DD 형식으로 반환합니다.
+        DateTimeOriginal 태그를 읽어 YYYY-MM-DD 형식으로 반환합니다. file_path는 경로 또는 JPEG bytes입니다.
+        EXIF에 내장 썸네일이 있으면 'thumbnail' 키로 함께 반환합니다. (썸네일 캐시용, 추가 읽기 없음)
         """
         try:
             exif_dict = piexif.load(file_path)
+            result = {}
+            if exif_dict.get("thumbnail"):
+                result["thumbnail"] = exif_dict["thumbnail"]
             datetime_original = exif_dict.get("Exif", {}).get(piexif.ExifIFD.DateTimeOriginal)
             if datetime_original:
                 # "YYYY:MM:DD HH:MM:SS" -> "YYYY-MM-DD"
-                return {"ymd": datetime_original.decode('utf-8').split(' ')[0].replace(':', '-')}
+                result["ymd"] = datetime_original.decode('utf-8').split(' ')[0].replace(':', '-')
+            if result:
+                return result
         except Exception as e:
-            raise MetadataError(f"Failed to read EXIF from {file_path}: {e}")
+            raise MetadataError(f"Failed to read EXIF from {'JPEG bytes' if isinstance(file_path, bytes) else file_path}: {e}")
         # return None # 읽기 실패 시 날짜 정보 없음으로 간주 (이제 예외를 발생시키므로 필요 없음)
         return None
 
@@ -38,3 +45,17 @@ class JpgPiexifProcessor(MetadataProcessor):
         except Exception as e:
             raise MetadataError(f"Failed to write EXIF to {file_path}: {e}")
         # return False (이제 예외를 발생시키므로 필요 없음)
+
+    def write_metadata_to(self, source_path, destination_path, new_datetime_str):
+        """
+        원본(경로 또는 JPEG bytes)의 Exif에 DateTimeOriginal을 넣은 결과 파일을 한 번에 기록합니다.
+        결과는 복사 후 write_metadata를 호출한 것과 같은 바이트입니다.
+        """
+        try:
+            source = source_path if isinstance(source_path, bytes) else str(source_path)
+            exif_dict = piexif.load(source)
+            exif_dict["Exif"][piexif.ExifIFD.DateTimeOriginal] = new_datetime_str.encode('utf-8')
+            piexif.insert(piexif.dump(exif_dict), source, str(destination_path))
+            return True
+        except Exception as e:
+            raise MetadataError(f"Failed to write EXIF to {destination_path}: {e}")
@@ -4,7 +4,8 @@ import os
 import json
 from .base import MetadataProcessor
 from ..paths import get_exiftool_path
-from ..errors import ExternalToolError, MetadataError
+from ..errors import ExternalToolError, MetadataError, ProcessingCancelled
+from ..external import run_steps, run_steps_async
 
 class RawExiftoolProcessor(MetadataProcessor):
     """ExifTool을 사용하여 RAW 파일(예: CR3)의 메타데이터를 처리합니다."""
@@ -19,6 +20,22 @@ class RawExiftoolProcessor(MetadataProcessor):
 
     def read_metadata(self, file_path) -> dict[str, str] | None:
         """ExifTool을 호출하여 주요 날짜 태그를 읽습니다."""
+        return run_steps(self._read_steps(file_path))
+
+    async def read_metadata_async(self, file_path) -> dict[str, str] | None:
+        return await run_steps_async(self._read_steps(file_path))
+
+    def write_metadata(self, file_path, new_datetime_str) -> bool:
+        return run_steps(self._write_steps(file_path, new_datetime_str))
+
+    async def write_metadata_async(self, file_path, new_datetime_str) -> bool:
+        return await run_steps_async(self._write_steps(file_path, new_datetime_str))
+
+    def write_metadata_to(self, source_path, destination_path, new_datetime_str) -> bool:
+        return run_steps(self._write_to_steps(source_path, destination_path, new_datetime_str))
+
+    def _read_steps(self, file_path):
+        """읽기 명령을 yield하고 결과를 해석합니다. (run_steps/run_steps_async로 실행)"""
         try:
             # -d %Y:%m:%d %H:%M:%S: 날짜 태그 출력 형식 지정
             # -api largefilesupport=1: 대용량 파일 지원
@@ -32,7 +49,7 @@ class RawExiftoolProcessor(MetadataProcessor):
                 "-j",
                 str(file_path) # pathlib.Path 객체를 str로 변환
             ]
-            result = subprocess.run(command, capture_output=True, text=True, check=True, encoding='utf-8', errors='ignore')
+            result = yield (command, 'exiftool', file_path)
 
             try:
                 exif_data = json.loads(result.stdout)
@@ -65,10 +82,12 @@ class RawExiftoolProcessor(MetadataProcessor):
             raise ExternalToolError(f"ExifTool read failed for {file_path}: {e.stderr}", stdout=e.stdout, stderr=e.stderr)
         except FileNotFoundError:
             raise FileNotFoundError(f"ExifTool executable not found at {self.exiftool_path}")
+        except ProcessingCancelled:
+            raise
         except Exception as e:
             raise MetadataError(f"Failed to read metadata from {file_path}: {e}")
 
-    def write_metadata(self, file_path, new_datetime_str) -> bool:
+    def _write_steps(self, file_path, new_datetime_str):
         """
         ExifTool을 호출하여 주요 날짜/시간 태그를 모두 업데이트합니다.
         (DateTimeOriginal, CreateDate, ModifyDate)
@@ -86,7 +105,7 @@ class RawExiftoolProcessor(MetadataProcessor):
                 f"-ModifyDate={new_datetime_str}",
                 str(file_path) # pathlib.Path 객체를 str로 변환
             ]
-            result = subprocess.run(command, capture_output=True, text=True, check=True, encoding='utf-8', errors='ignore')
+            result = yield (command, 'exiftool', file_path)
 
             # ExifTool은 성공 시 백업 파일을 생성하고 "1 image files updated" 메시지를 출력
             if "1 image files updated" in result.stdout:
@@ -111,7 +130,38 @@ class RawExiftoolProcessor(MetadataProcessor):
             raise ExternalToolError(f"ExifTool write failed for {file_path}: {e.stderr}", stdout=e.stdout, stderr=e.stderr)
         except FileNotFoundError:
             raise FileNotFoundError(f"ExifTool executable not found at {self.exiftool_path}")
+        except ProcessingCancelled:
+            if os.path.exists(original_file_backup):
+                os.remove(original_file_backup)
+            raise
         except Exception as e:
             if os.path.exists(original_file_backup):
                 os.remove(original_file_backup)
             raise MetadataError(f"Failed to write metadata to {file_path}: {e}")
+
+    def _write_to_steps(self, source_path, destination_path, new_datetime_str):
+        """
+        ExifTool의 -o로 원본을 읽어 날짜 태그를 바꾼 결과 파일을 바로 만듭니다. (복사 후 재기록과 백업 파일 없음)
+        """
+        try:
+            command = [
+                self.exiftool_path,
+                f"-DateTimeOriginal={new_datetime_str}",
+                f"-CreateDate={new_datetime_str}",
+                f"-ModifyDate={new_datetime_str}",
+                "-o", str(destination_path),
+                str(source_path)
+            ]
+            result = yield (command, 'exiftool', source_path)
+            if "1 image files created" not in result.stdout:
+                raise ExternalToolError(
+                    f"ExifTool write operation for {destination_path} did not confirm creation. Output: {result.stdout.strip()}",
+                    stdout=result.stdout, stderr=result.stderr
+                )
+            return True
+        except BaseException as e:
+            if os.path.exists(destination_path):
+                os.remove(destination_path)
+            if isinstance(e, subprocess.CalledProcessError):
+                raise ExternalToolError(f"ExifTool write failed for {source_path}: {e.stderr}", stdout=e.stdout, stderr=e.stderr)
+            raise
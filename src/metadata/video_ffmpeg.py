@@ -6,7 +6,8 @@ from datetime import datetime
 from pathlib import Path
 from .base import MetadataProcessor
 from ..paths import get_ffmpeg_path, get_ffprobe_path
-from ..errors import ExternalToolError, MetadataError
+from ..errors import ExternalToolError, MetadataError, ProcessingCancelled
+from ..external import run_steps, run_steps_async
 
 class VideoFfmpegProcessor(MetadataProcessor):
     """ffmpeg/ffprobe를 사용하여 동영상 파일의 메타데이터를 처리합니다."""
@@ -22,6 +23,26 @@ class VideoFfmpegProcessor(MetadataProcessor):
 
     def read_metadata(self, file_path):
         """ffprobe를 사용하여 creation_time을 읽습니다."""
+        return run_steps(self._read_steps(file_path))
+
+    async def read_metadata_async(self, file_path):
+        return await run_steps_async(self._read_steps(file_path))
+
+    def write_metadata(self, file_path, new_datetime_str):
+        return run_steps(self._write_steps(file_path, new_datetime_str))
+
+    async def write_metadata_async(self, file_path, new_datetime_str):
+        return await run_steps_async(self._write_steps(file_path, new_datetime_str))
+
+    def write_metadata_to(self, source_path, destination_path, new_datetime_str):
+        """원본에서 결과 파일로 바로 리먹스하며 creation_time을 기록합니다. (복사 + 재기록 대신 한 번의 쓰기)"""
+        if Path(source_path).suffix.lower() == '.avi':
+            return False
+        run_steps(self._remux_steps(source_path, destination_path, new_datetime_str))
+        return True
+
+    def _read_steps(self, file_path):
+        """ffprobe 명령을 yield하고 결과를 해석합니다. (run_steps/run_steps_async로 실행)"""
         file_extension = Path(file_path).suffix.lower()
         if file_extension == '.avi':
             # DTL TASK-07-02: AVI 스킵. Orchestrator에서 이 반환값을 보고 스킵 처리할 수 있도록 함.
@@ -35,8 +56,8 @@ class VideoFfmpegProcessor(MetadataProcessor):
                 '-show_format',
                 str(file_path)
             ]
-            # DEV_GUIDE: ffprobe 타임아웃 10초
-            result = subprocess.run(command, capture_output=True, text=True, check=True, encoding='utf-8', errors='ignore', timeout=10)
+            # DEV_GUIDE: ffprobe 타임아웃 10초 (대용량은 크기 비례로 스케줄러가 늘림)
+            result = yield (command, 'ffprobe', file_path)
             
             metadata = json.loads(result.stdout)
             creation_time_str = metadata.get('format', {}).get('tags', {}).get('creation_time')
@@ -60,19 +81,28 @@ class VideoFfmpegProcessor(MetadataProcessor):
             raise FileNotFoundError(f"ffprobe executable not found at {self.ffprobe_path}")
         except json.JSONDecodeError:
             raise MetadataError(f"Failed to parse ffprobe JSON output for {file_path}")
+        except ProcessingCancelled:
+            raise
         except Exception as e:
             raise MetadataError(f"Failed to read metadata from {file_path}: {e}")
 
-    def write_metadata(self, file_path, new_datetime_str):
+    def _write_steps(self, file_path, new_datetime_str):
         """
         ffmpeg를 사용하여 creation_time 메타데이터를 수정합니다.
-        스트림을 재인코딩하지 않고 메타데이터만 변경합니다.
+        스트림을 재인코딩하지 않고 메타데이터만 변경합니다. (임시 파일로 리먹스한 뒤 교체)
         """
         file_extension = Path(file_path).suffix.lower()
         if file_extension == '.avi':
             # DTL TASK-07-02: AVI 스킵. Orchestrator에서 이 반환값을 보고 스킵 처리할 수 있도록 함.
             return False
+        temp_output_path = Path(file_path).parent / f"temp_{Path(file_path).name}"
+        yield from self._remux_steps(file_path, temp_output_path, new_datetime_str)
+        # If ffmpeg command was successful, replace the original file with the temporary one
+        os.replace(temp_output_path, file_path)
+        return True
 
+    def _remux_steps(self, input_path, output_path, new_datetime_str):
+        """input_path를 재인코딩 없이 output_path로 리먹스하며 creation_time을 설정합니다. 실패 시 output_path를 삭제합니다."""
         # new_datetime_str is expected in "YYYY:MM:DD HH:MM:SS" format from orchestrator
         # ffmpeg expects ISO 8601 for creation_time, e.g., "YYYY-MM-DDTHH:MM:SSZ"
         try:
@@ -81,33 +111,33 @@ class VideoFfmpegProcessor(MetadataProcessor):
         except ValueError as e:
             raise MetadataError(f"Invalid datetime format for writing: {new_datetime_str}. Expected YYYY:MM:DD HH:MM:SS. Error: {e}")
 
-        temp_output_path = Path(file_path).parent / f"temp_{Path(file_path).name}"
-        
+        output_path = Path(output_path)
         try:
             command = [
                 self.ffmpeg_path,
-                '-i', str(file_path),
+                '-i', str(input_path),
                 '-c', 'copy', # Copy streams without re-encoding
                 '-map_metadata', '0', # Copy all metadata from input to output
                 '-metadata', f'creation_time={ffmpeg_datetime_str}',
                 '-y', # Overwrite output files without asking
-                str(temp_output_path)
+                str(output_path)
             ]
-            # DEV_GUIDE: ffmpeg 타임아웃 60초
-            result = subprocess.run(command, capture_output=True, text=True, check=True, encoding='utf-8', errors='ignore', timeout=60)
-            
-            # If ffmpeg command was successful, replace the original file with the temporary one
-            os.replace(temp_output_path, file_path)
-            return True
+            # DEV_GUIDE: ffmpeg 타임아웃 60초 (대용량은 크기 비례로 스케줄러가 늘림)
+            yield (command, 'ffmpeg', input_path)
         except subprocess.CalledProcessError as e:
             # Clean up temp file if it was created
-            if temp_output_path.exists():
-                os.remove(temp_output_path)
-            raise ExternalToolError(f"ffmpeg write failed for {file_path}: {e.stderr}", stdout=e.stdout, stderr=e.stderr)
+            if output_path.exists():
+                os.remove(output_path)
+            raise ExternalToolError(f"ffmpeg write failed for {input_path}: {e.stderr}", stdout=e.stdout, stderr=e.stderr)
         except FileNotFoundError:
             raise FileNotFoundError(f"ffmpeg executable not found at {self.ffmpeg_path}")
+        except ProcessingCancelled:
+            # 취소로 종료된 ffmpeg가 남긴 임시 파일 정리
+            if output_path.exists():
+                os.remove(output_path)
+            raise
         except Exception as e:
             # Clean up temp file if it was created
-            if temp_output_path.exists():
-                os.remove(temp_output_path)
-            raise MetadataError(f"Failed to write metadata to {file_path}: {e}")
+            if output_path.exists():
+                os.remove(output_path)
+            raise MetadataError(f"Failed to write metadata to {input_path}: {e}")
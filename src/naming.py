@@ -1,20 +1,57 @@
 # src/naming.py
 import os
 import re
+import sys
+import shutil
 import hashlib
 
+from .errors import NameConflictError
+
 # TODO: (TASK-02-01) PRD의 PASS 정규식 확정 (대소문자 무관)
 # PASS 판정 정규식(대소문자 무관): ^img_\d+[a-zA-Z]*\..+$
 # DEV_GUIDE: suffix: 영문 0개 이상(대/소문자 모두 허용)
 PASS_REGEX = re.compile(r"^img_\d+[a-zA-Z]*\..+$", re.IGNORECASE)
 
+class NameIndex:
+    """
+    디렉토리 한 곳의 파일명 목록을 메모리에 유지하여, 중복 검사 시 파일마다 stat을 호출하지 않게 합니다.
+    대소문자를 구분하지 않는 파일 시스템(Windows/macOS 기본값)에서는 os.path.exists와 같게 대소문자 무시 비교를 합니다.
+    """
+    def __init__(self, names=(), case_insensitive=None):
+        if case_insensitive is None:
+            case_insensitive = sys.platform.startswith('win') or sys.platform == 'darwin'
+        self.case_insensitive = case_insensitive
+        self._names = set()
+        for name in names:
+            self.add(name)
+
+    @classmethod
+    def from_directory(cls, directory):
+        """디렉토리를 한 번 나열하여 인덱스를 만듭니다."""
+        try:
+            return cls(os.listdir(directory))
+        except FileNotFoundError:
+            return cls()
+
+    def _key(self, name):
+        return name.casefold() if self.case_insensitive else name
+
+    def __contains__(self, name):
+        return self._key(name) in self._names
+
+    def add(self, name):
+        self._names.add(self._key(name))
+
+    def discard(self, name):
+        self._names.discard(self._key(name))
+
 def is_pass_filename(filename):
     """
     주어진 파일명이 MDNS의 PASS 패턴에 맞는지 확인합니다.
     """
     return bool(PASS_REGEX.match(filename))
 
-def standardize_filename(file_path, content_hash_or_original, summary):
+def standardize_filename(file_path, content_hash_or_original, summary, current_filename=None, name_index=None):
     """
     파일명을 표준 규칙(PASS/해시)에 따라 변경합니다.
     - PASS: `img_` 접두사를 `IMG_`로 정규화.
@@ -25,11 +62,15 @@ def standardize_filename(file_path, content_hash_or_original, summary):
         file_path (str): 현재 파일의 전체 경로 (result 폴더 내).
         content_hash (str): PASS가 아닌 경우 사용할 파일 내용의 MD5 해시 (5자리 이상).
         summary (dict): 처리 결과를 기록할 요약 딕셔너리.
+        current_filename (str | None): 파일이 임시 이름으로 놓여 있을 때 판정에 사용할 원래 파일명.
+            None이면 file_path의 파일명을 사용.
+        name_index (NameIndex | None): 디렉토리 파일명 인덱스. 주어지면 stat 대신 사용하고 rename 후 갱신.
 
     Returns:
         str: 최종적으로 변경된 파일의 전체 경로.
     """
-    current_filename = os.path.basename(file_path)
+    if current_filename is None:
+        current_filename = os.path.basename(file_path)
     new_filename_base = ""
 
     is_pass = is_pass_filename(current_filename)
@@ -45,7 +86,7 @@ def standardize_filename(file_path, content_hash_or_original, summary):
         new_filename_base = generate_hash_name(current_filename, content_hash_or_original, summary)
 
     # 4. (TASK-02-04) 중복 처리 및 최종 rename
-    final_path = handle_duplicates_and_rename(file_path, new_filename_base, summary)
+    final_path = handle_duplicates_and_rename(file_path, new_filename_base, summary, name_index=name_index)
     return final_path
 
 
@@ -84,13 +125,14 @@ def generate_hash_name(current_filename, content_hash, summary):
     return new_name
 
 
-def handle_duplicates_and_rename(current_full_path, desired_new_filename, summary):
+def handle_duplicates_and_rename(current_full_path, desired_new_filename, summary, name_index=None):
     """
     중복을 처리하고 실제 파일명을 변경합니다.
     Args:
         current_full_path (str): 현재 파일의 전체 경로 (result 폴더 내).
         desired_new_filename (str): 중복 처리 전 원하는 새 파일명 (확장자 포함).
         summary (dict): 처리 결과를 기록할 요약 딕셔너리.
+        name_index (NameIndex | None): 디렉토리 파일명 인덱스. 주어지면 os.path.exists 대신 사용.
     Returns:
         str: 최종적으로 변경된 파일의 전체 경로.
     """
@@ -98,13 +140,17 @@ def handle_duplicates_and_rename(current_full_path, desired_new_filename, summar
     base_name, ext = os.path.splitext(desired_new_filename)
     
     final_new_full_path = os.path.join(parent_dir, desired_new_filename)
+    if name_index is not None:
+        exists = lambda path: os.path.basename(path) in name_index
+    else:
+        exists = os.path.exists
     
     counter = 0
     
     # Loop while a file with the desired name (or suffixed name) already exists
     # AND it's not the file we are currently processing.
     # This prevents infinite loops if the file already has its final desired name.
-    while os.path.exists(final_new_full_path) and final_new_full_path != current_full_path:
+    while exists(final_new_full_path) and final_new_full_path != current_full_path:
         counter += 1
         # DTL TASK-02-04: 언더바 없이 숫자 suffix
         final_new_filename = f"{base_name}{counter}{ext}"
@@ -120,4 +166,209 @@ def handle_duplicates_and_rename(current_full_path, desired_new_filename, summar
         return current_full_path
     
     os.rename(current_full_path, final_new_full_path)
+    if name_index is not None:
+        name_index.discard(os.path.basename(current_full_path))
+        name_index.add(os.path.basename(final_new_full_path))
     return final_new_full_path
+
+# 결과 파일을 파일명 표준화 전까지 놓아두는 임시 이름의 접두사.
+# PASS/해시 이름과 절대 겹치지 않으므로, 같은 디렉토리의 다른 파일이 먼저 놓여 있어도
+# 중복 판정 결과가 "복사 직후 바로 이름 변경"과 같아진다.
+STAGING_PREFIX = ".mdns_stage_"
+
+class RenameRequest:
+    """
+    디렉토리 배치의 파일명 결정 요청 하나. (처리 순서대로 전달)
+    - content_hash가 있으면 standardize_filename과 같은 규칙(PASS/해시)으로 이름을 정합니다.
+    - content_hash가 None이면 original_name을 그대로 원하는 이름으로 사용합니다. (앞 단계 실패 시)
+    - link_to가 주어지면 같은 배치의 link_to번째 요청의 최종 이름으로 새 하드링크를 만듭니다. (current_name 없음)
+    """
+    def __init__(self, current_name, content_hash=None, original_name=None, link_to=None):
+        self.current_name = current_name
+        self.content_hash = content_hash
+        self.original_name = original_name or current_name
+        self.link_to = link_to
+
+class RenamePlanEntry:
+    """이름 변경 계획의 항목. action은 파일명 규칙 이벤트 코드(NAME_PASS 등) 또는 None."""
+    def __init__(self, current_name, final_name, action=None, suffixed=False, link_to=None):
+        self.current_name = current_name
+        self.final_name = final_name
+        self.action = action
+        self.suffixed = suffixed
+        self.link_to = link_to
+
+    @property
+    def changes(self) -> bool:
+        return self.link_to is not None or self.final_name != self.current_name
+
+def _classify(requests: list) -> list:
+    """요청 전체의 (원하는 이름, 이벤트 코드)를 한 번에 계산합니다."""
+    desired = []
+    for request in requests:
+        name = request.original_name
+        if request.link_to is not None or request.content_hash is None:
+            desired.append((name, None))
+        elif PASS_REGEX.match(name):
+            if name.lower().startswith("img_") and not name.startswith("IMG_"):
+                desired.append(("IMG_" + name[4:], "NAME_SET_UPPERCASE"))
+            else:
+                desired.append((name, "NAME_PASS"))
+        else:
+            desired.append((f"IMG_{request.content_hash[:5].upper()}{os.path.splitext(name)[1]}", "NAME_SET_HASH"))
+    return desired
+
+def _suffix_families(key_name):
+    """
+    이름 하나가 될 수 있는 (기본 이름 키, 접미사 번호) 조합을 모두 반환합니다.
+    예: 'img_a12.jpg' -> (('img_a12', '.jpg'), 0), (('img_a1', '.jpg'), 2), (('img_a', '.jpg'), 12)
+    """
+    stem, ext = os.path.splitext(key_name)
+    yield (stem, ext), 0
+    digit_count = len(stem) - len(stem.rstrip("0123456789"))
+    for k in range(1, digit_count + 1):
+        digits = stem[-k:]
+        if digits[0] != "0": # 접미사는 앞자리 0 없이 붙으므로
+            yield (stem[:-k], ext), int(digits)
+
+def plan_batch_renames(requests: list, name_index: NameIndex, summary) -> list:
+    """
+    디렉토리 배치 하나의 최종 파일명을 한 번에 결정합니다.
+    요청 순서대로 standardize_filename(name_index 사용)을 호출한 것과 같은 이름과 summary를 만들되,
+    같은 이름을 원하는 파일이 많을 때 매번 1부터 접미사를 탐색하지 않도록
+    기본 이름별로 '여기까지는 모두 사용 중'인 접미사 번호를 기억합니다.
+    name_index는 계획이 적용된 뒤의 상태로 갱신됩니다.
+
+    Returns:
+        list[RenamePlanEntry]: 요청과 같은 순서의 계획.
+    """
+    key = name_index._key
+    next_free = {} # 기본 이름 키 -> 이 번호 미만의 후보는 모두 사용 중
+    plan = []
+    counts = {}
+    for request, (desired, action) in zip(requests, _classify(requests)):
+        if request.link_to is not None:
+            desired = plan[request.link_to].final_name
+        base_name, ext = os.path.splitext(desired)
+        family = os.path.splitext(key(desired))
+        current = request.current_name
+
+        def candidate(counter):
+            return desired if counter == 0 else f"{base_name}{counter}{ext}"
+
+        counter = next_free.get(family, 0)
+        # 건너뛴 후보 중 현재 파일 자신의 이름이 있으면 순차 처리와 같이 거기서 멈춘다
+        if current is not None and counter:
+            for current_family, current_counter in _suffix_families(key(current)):
+                if current_family == family and current_counter < counter and candidate(current_counter) == current:
+                    counter = current_counter
+                    break
+        while candidate(counter) in name_index and candidate(counter) != current:
+            counter += 1
+        final_name = candidate(counter)
+        next_free[family] = counter + 1
+
+        if current is not None and final_name != current:
+            name_index.discard(current)
+            for current_family, current_counter in _suffix_families(key(current)):
+                if next_free.get(current_family, 0) > current_counter:
+                    next_free[current_family] = current_counter
+        name_index.add(final_name)
+
+        if action:
+            counts[action] = counts.get(action, 0) + 1
+        if counter:
+            counts["NAME_DUPLICATE_SUFFIX"] = counts.get("NAME_DUPLICATE_SUFFIX", 0) + 1
+        plan.append(RenamePlanEntry(current, final_name, action, bool(counter), request.link_to))
+
+    for code, count in counts.items():
+        summary[code] = summary.get(code, 0) + count
+    return plan
+
+def _exclusive_rename(current_path, final_path):
+    """
+    final_path가 비어 있을 때만 이름을 바꿉니다. 이미 있으면 FileExistsError (덮어쓰지 않음).
+    POSIX의 rename은 대상을 덮어쓰므로, 존재 확인과 변경 사이의 틈(TOCTOU) 없이
+    link(O_EXCL과 같은 의미)로 새 이름을 선점한 뒤 이전 이름을 지웁니다.
+    """
+    if os.name == 'nt' or os.path.basename(current_path).casefold() == os.path.basename(final_path).casefold():
+        # Windows의 rename은 대상이 있으면 실패. 대소문자만 다른 이름은 같은 파일일 수 있으므로 그대로 rename
+        os.rename(current_path, final_path)
+        return
+    try:
+        os.link(current_path, final_path)
+    except FileExistsError:
+        raise
+    except OSError:
+        # 하드링크를 지원하지 않는 파일 시스템(FAT/exFAT 등): O_EXCL로 빈 파일을 만들어 이름을 선점한 뒤 교체
+        _reserve(final_path)
+        try:
+            os.replace(current_path, final_path)
+        except OSError:
+            os.remove(final_path)
+            raise
+        return
+    os.unlink(current_path)
+
+def _exclusive_link(source_path, final_path):
+    """source_path의 하드링크를 final_path에 만듭니다. 지원하지 않으면 선점한 이름에 복사합니다."""
+    try:
+        os.link(source_path, final_path)
+    except FileExistsError:
+        raise
+    except OSError:
+        _reserve(final_path)
+        try:
+            shutil.copy2(source_path, final_path)
+        except OSError:
+            os.remove(final_path)
+            raise
+
+def _reserve(path):
+    """O_EXCL로 빈 파일을 만들어 이름을 선점합니다. 이미 있으면 FileExistsError."""
+    os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+
+def apply_rename_plan(directory, plan: list) -> list:
+    """
+    계획대로 이름을 변경합니다. 디렉토리 하나 단위의 트랜잭션으로 동작합니다.
+    - 이름이 바뀌지 않는 항목은 시스템 호출을 하지 않습니다.
+    - 새 이름은 배타적으로 선점하므로 다른 프로세스가 만든 파일을 덮어쓰지 않습니다.
+    - link_to 항목은 대상 파일의 최종 이름으로 하드링크를 만들고, 지원하지 않으면 복사합니다.
+    - 도중에 실패하면 이미 적용한 변경을 역순으로 되돌린 뒤 예외를 다시 발생시킵니다.
+    디렉토리마다 독립적이므로 서로 다른 디렉토리의 계획은 병렬로 적용해도 안전합니다.
+
+    Returns:
+        list[str]: 항목별 최종 전체 경로.
+    Raises:
+        NameConflictError: 계획한 이름을 적용 직전에 다른 파일이 차지한 경우. (되돌린 뒤 발생)
+    """
+    final_paths = []
+    applied = [] # 되돌리기용: (현재 전체 경로 또는 None, 최종 전체 경로)
+    try:
+        for entry in plan:
+            final_path = os.path.join(directory, entry.final_name)
+            if entry.link_to is not None:
+                _exclusive_link(final_paths[entry.link_to], final_path)
+                applied.append((None, final_path))
+            elif entry.final_name != entry.current_name:
+                current_path = os.path.join(directory, entry.current_name)
+                _exclusive_rename(current_path, final_path)
+                applied.append((current_path, final_path))
+            final_paths.append(final_path)
+    except BaseException as e:
+        _rollback(applied)
+        if isinstance(e, FileExistsError):
+            raise NameConflictError(f"계획한 파일명을 다른 파일이 먼저 사용했습니다: {e.filename}") from e
+        raise
+    return final_paths
+
+def _rollback(applied: list):
+    """적용한 변경을 역순으로 되돌립니다. (가능한 만큼 최선을 다함)"""
+    for current_path, final_path in reversed(applied):
+        try:
+            if current_path is None:
+                os.remove(final_path)
+            else:
+                _exclusive_rename(final_path, current_path)
+        except OSError:
+            continue
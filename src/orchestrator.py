@@ -1,62 +1,62 @@
 # src/orchestrator.py
 import os
+import time
 from collections import defaultdict
 
-from pathlib import Path
-import shutil # For file operations like copy2
-from typing import Union, cast, TypedDict
-from datetime import datetime, timedelta # For date/time manipulation
+from typing import Union, cast
 
-from .scanner import scan_files, FileInfo, calculate_md5 # Import FileInfo and calculate_md5
-from .date_resolver import resolve_date # Assuming resolve_date returns Union[DateInfoFound, DateInfoNotFound]
-from .naming import standardize_filename
-from .metadata.base import MetadataProcessor, get_metadata_processor
+from .scanner import scan_files, FileInfo, calculate_content_hash, hash_log_message, get_result_root, HASH_SCHEMES
+from .copy_engine import check_free_space
+from .manifest import prepare_manifest
+from .preflight import apply_preflight
+from .scope_parallel import run_scopes
+from .naming import NameIndex, RenameRequest, STAGING_PREFIX, plan_batch_renames, apply_rename_plan
+from .metadata.base import reset_processor_cache
 from .logging_i18n import get_log_message, log_error_to_file
-from .convert.image_to_jpg import convert_to_jpg # Import the conversion function
-from .errors import ExternalToolError, MetadataError
+from .errors import ProcessingCancelled, FileOperationError, NameConflictError
+from .summary import create_summary_report, new_summary
+from .steps import DateInfoFound, DateInfoNotFound
+from .planner import plan_output, produce_planned
+from .control import RunControl, set_active_control
+from .external import get_scheduler, format_tool_stats
+from .dedup import DEDUP_MODES, find_duplicates, build_duplicate_map, link_duplicate, same_scope
+from .batching import DirectoryBatch, DirectoryPrefetcher, group_by_directory
+from .journal import RunJournal, reconcile_partial_outputs, JOURNAL_FILENAME, STAGE_OUTPUT, STAGE_METADATA, STAGE_DONE
+from .thumbnails import ThumbnailCache, make_thumbnail, THUMBNAIL_CACHE_FILENAME
+from .records import RecordWriter, actions_from_summary, ACTION_BITS, RECORDS_FILENAME
+from .result_index import build_index, INDEX_FILENAME
 
-# Minimal type definitions for DateInfoFound and DateInfoNotFound
-# These would typically come from date_resolver.py
-class DateInfoFound(TypedDict):
-    found: bool
-    ymd: str
-    scope_key: tuple # (date_folder_full_path_str, date_ymd_string)
-
-class DateInfoNotFound(TypedDict):
-    found: bool
-
-def create_summary_report(summary):
-    """
-    처리 요약 보고서를 생성합니다. (TASK-08-03)
-    현재는 간단한 문자열을 반환합니다.
-    """
-    report = "--- 처리 요약 ---\n"
-    for key, value in summary.items():
-        # Translate internal keys to more user-friendly Korean messages for the report
-        if key == 'processed_files': report += f"총 처리 파일 수: {value}\n"
-        elif key == 'failed_files': report += f"처리 실패 파일 수: {value}\n"
-        elif key == 'copied_files': report += f"원본 복사 파일 수: {value}\n"
-        elif key == 'converted_to_jpg': report += f"JPG 변환 파일 수: {value}\n"
-        elif key == 'conversion_failed': report += f"변환 실패 파일 수: {value}\n"
-        elif key == 'metadata_changed': report += f"메타데이터 변경 파일 수: {value}\n"
-        elif key == 'metadata_skipped_no_date': report += f"메타데이터 스킵 (날짜 없음) 파일 수: {value}\n"
-        elif key == 'metadata_passed': report += f"메타데이터 유지 파일 수: {value}\n"
-        elif key == 'metadata_failed': report += f"메타데이터 수정 실패 파일 수: {value}\n"
-        elif key == 'filename_passed': report += f"파일명 유지 파일 수: {value}\n"
-        elif key == 'filename_uppercase_normalized': report += f"파일명 대문자 정규화 파일 수: {value}\n"
-        elif key == 'filename_hashed': report += f"파일명 해시 변경 파일 수: {value}\n"
-        elif key == 'filename_duplicate_suffix': report += f"파일명 중복 접미사 추가 파일 수: {value}\n"
-        else: report += f"{key}: {value}\n" # Fallback for unhandled keys
-    report += "-----------------\n"
-    return report
-
-def process_files(source_root, queue):
+def process_files(source_root, queue, dedup_mode=None, resume=False, control: Union[RunControl, None] = None, output_root=None, thumbnails=False, shard=None, naming_hash="md5", scope_workers=None):
     """
     파일 처리의 전체 과정을 총괄하는 메인 함수.
-    스캔 -> 정렬 -> 처리 파이프라인 순으로 진행.
+    스캔 -> 정렬 -> (선택) 중복 탐지 -> 처리 파이프라인 순으로 진행.
+
+    Args:
+        source_root: 처리할 소스 루트 폴더.
+        queue: GUI로 이벤트를 전달할 큐.
+        dedup_mode (str | None): 내용 중복 처리 방식 ('skip', 'hardlink', 'report'). None이면 사용 안 함.
+        resume (bool): True이면 result 폴더의 저널을 읽어 중단된 실행을 이어서 처리합니다.
+        control (RunControl | None): 취소/일시정지 제어 객체. 파일과 단계 사이마다 확인합니다.
+        output_root: 결과물 루트. None이면 [Source]/result. 다른 장치를 지정하면 읽기/쓰기가 분리됩니다.
+        thumbnails (bool): True이면 결과 이미지의 썸네일을 결과 루트의 썸네일 캐시 파일에 기록합니다.
+        shard (ShardSpec | None): 샤드 모드. 날짜 스코프 단위로 나눈 파일 중 이 샤드의 몫만 처리하고,
+            저널/레코드/썸네일/요약은 샤드별 파일에 기록합니다. 합치기는 sharding.merge_shards.
+        naming_hash (str): 파일명 해시 방식 (scanner.HASH_SCHEMES). 'sampled-v1'은 대용량 파일을 표본만 읽어 해시합니다.
+            방식은 결과 루트의 실행 매니페스트(.mdns_manifest.json)에 기록되며, 다른 방식으로는 재개할 수 없습니다.
+        scope_workers (int | None): 주어지면 날짜 스코프끼리 스레드 scope_workers개에서 동시에 처리합니다.
+            스코프 안은 순차로 처리하므로 결과는 순차 실행과 같습니다. (scope_parallel.run_scopes, 내용 중복 탐지와 함께 쓸 수 없음)
     """
+    control = control or RunControl()
+    if dedup_mode is not None and dedup_mode not in DEDUP_MODES:
+        raise ValueError(f"Unknown dedup mode: {dedup_mode}")
+    if naming_hash not in HASH_SCHEMES:
+        raise ValueError(f"Unknown naming hash scheme: {naming_hash}")
+    if scope_workers is not None and (scope_workers < 1 or dedup_mode):
+        raise ValueError("scope_workers must be >= 1 and cannot be combined with dedup_mode")
+
     # TODO: (TASK-01-03) 1차 스캔: 대상 파일 목록 및 개수 확보
-    file_list = scan_files(source_root)
+    file_list = scan_files(source_root, output_root)
+    result_root = get_result_root(source_root, output_root)
     total_files = len(file_list)
     queue.put(('log', f"총 {total_files}개의 처리 대상 파일을 찾았습니다."))
 
@@ -65,198 +65,362 @@ def process_files(source_root, queue):
     # 정렬 키는 (str(relative_path), filename.lower())로 설정합니다.
     file_list.sort(key=lambda x: (str(x.relative_path), x.filename.lower()))
     queue.put(('log', "파일 목록을 결정적 순서로 정렬했습니다."))
+    if shard is not None:
+        file_list = shard.select(file_list)
+        total_files = len(file_list)
+        queue.put(('log', f"샤드 {shard.label}: 이 샤드가 처리할 파일 {total_files}개"))
 
     # TODO: (TASK-03-02) 스코프 카운터 초기화
     time_offset_counters = defaultdict(int)
     queue.put(('log', "스코프 카운터를 초기화했습니다."))
 
     # TODO: (TASK-08-03) 처리 요약 정보 초기화
-    summary = defaultdict(int)
-    summary['processed_files'] = 0
-    summary['failed_files'] = 0
-    summary['copied_files'] = 0
-    summary['converted_to_jpg'] = 0
-    summary['conversion_failed'] = 0
-    summary['metadata_changed'] = 0
-    summary['metadata_skipped_no_date'] = 0
-    summary['metadata_passed'] = 0
-    summary['metadata_failed'] = 0
-    summary['filename_passed'] = 0
-    summary['filename_uppercase_normalized'] = 0
-    summary['filename_hashed'] = 0
-    summary['filename_duplicate_suffix'] = 0
+    summary = new_summary()
     queue.put(('log', "처리 요약 정보를 초기화했습니다."))
 
-    # --- 2차 처리: 파일 단위 파이프라인 ---
-    for i, file_info in enumerate(file_list):
-        try:
-            # 각 파일 처리 시작 로그
-            queue.put(('log', f"[{i+1}/{total_files}] 파일 처리 시작: {file_info.filename}"))
-            process_single_file(file_info, time_offset_counters, summary, queue)
-            summary['processed_files'] += 1
-        except Exception as e:
-            # TASK-08-02: error.log 기록 (현재는 임시 로그)
-            error_message = f"[{i+1}/{total_files}] 파일 처리 중 오류 발생 ({file_info.absolute_path}): {e}"
-            queue.put(('log', f"  {get_log_message('CONVERT_FAIL')}")) # Using a generic fail message for now
-            log_error_to_file(str(file_info.absolute_path), "MAIN_PIPELINE", e)
-            summary['failed_files'] += 1
+    # 외부 도구가 없는 형식의 파일은 파일마다 실패시키지 않고 한꺼번에 건너뜀
+    file_list = apply_preflight(file_list, source_root, summary, queue)
+    total_files = len(file_list)
 
-        progress_val = ((i + 1) / total_files) * 100
-        progress_text = f"{i + 1}/{total_files} ({progress_val:.2f}%)"
-        queue.put(('progress', progress_val, progress_text))
-        # queue.put({'type': 'log', 'message': ...}) # 각 단계에서 로그 전송
+    # (선택) 내용 중복 탐지: 크기 -> 부분 해시 -> 전체 해시
+    duplicate_of = {}
+    if dedup_mode:
+        duplicate_groups = find_duplicates(file_list)
+        duplicate_of = build_duplicate_map(duplicate_groups)
+        queue.put(('log', f"내용 중복 탐지 완료: {len(duplicate_groups)}개 그룹, {len(duplicate_of)}개 중복 파일"))
+    keeper_outputs = {} # keeper 절대 경로 -> 최종 결과 파일 경로
+
+    try:
+        prepare_manifest(result_root, naming_hash, resume)
+    except FileOperationError as e:
+        queue.put(('log', str(e)))
+        queue.put(('error', str(e)))
+        return
+    # 실행 저널: 파일별 완료 단계를 기록하여 중단 후 재개할 수 있게 한다
+    journal = RunJournal(result_root, resume=resume, filename=_state_filename(shard, JOURNAL_FILENAME))
+    if resume:
+        # 샤드 모드: 다른 샤드가 쓰는 디렉토리의 임시 파일은 건드리지 않는다
+        directories = {result_root / f.relative_path for f in file_list} if shard is not None else None
+        _restore_from_journal(journal, file_list, time_offset_counters, keeper_outputs, queue, directories)
 
+    # 시작 전에 결과 장치의 여유 공간 확인 (재개 시 완료된 파일은 제외)
+    try:
+        pending = [f for f in file_list if not journal.is_done(RunJournal.key_for(f))]
+        planned_bytes = check_free_space(pending, result_root)
+        queue.put(('log', f"결과 폴더: {result_root} (예상 사용량 {planned_bytes / 1024 ** 3:.2f} GB)"))
+    except FileOperationError as e:
+        journal.close()
+        queue.put(('log', str(e)))
+        queue.put(('error', str(e)))
+        return
+    thumbnail_cache = ThumbnailCache(result_root, resume=resume, filename=_state_filename(shard, THUMBNAIL_CACHE_FILENAME)) if thumbnails else None
+    # 파일별 결과 레코드 (소스 -> 결과, 결과 코드, 소요 시간). 조회: python -m src.records <결과 폴더>
+    records = RecordWriter(result_root, resume=resume, filename=_state_filename(shard, RECORDS_FILENAME))
+    set_active_control(control)
+    get_scheduler().reset_stats()
+    reset_processor_cache()
+    try:
+        if scope_workers:
+            run_scopes(file_list, scope_workers, journal, keeper_outputs, time_offset_counters, summary, queue, control, thumbnail_cache, records, naming_hash)
+        else:
+            _run_pipeline(file_list, journal, duplicate_of, keeper_outputs, dedup_mode, time_offset_counters, summary, queue, control, thumbnail_cache, records, naming_hash)
+    except ProcessingCancelled:
+        # 취소: 지금까지의 부분 요약을 보고하고 종료
+        summary['cancelled_files'] = total_files - summary['processed_files'] - summary['failed_files']
+        queue.put(('log', create_summary_report(summary) + format_tool_stats(get_scheduler().stats_snapshot())))
+        _write_result_index(result_root, shard, queue)
+        if shard is not None:
+            shard.write_summary(result_root, summary, 'cancelled')
+        queue.put(('cancelled', "작업이 취소되었습니다. 완료된 파일까지의 결과가 유지됩니다."))
+        return
+    finally:
+        set_active_control(None)
+        journal.close()
+        records.close()
+        if thumbnail_cache:
+            thumbnail_cache.close()
+
+    _write_result_index(result_root, shard, queue)
     # TASK-08-03: 최종 요약 보고
-    final_summary_report = create_summary_report(summary)
+    final_summary_report = create_summary_report(summary) + format_tool_stats(get_scheduler().stats_snapshot())
     queue.put(('log', final_summary_report))
+    if shard is not None:
+        shard.write_summary(result_root, summary, 'done')
     queue.put(('done', "모든 파일 처리가 완료되었습니다."))
 
+def _state_filename(shard, filename: str) -> str:
+    """결과 루트에 두는 상태 파일(저널 등)의 이름. 샤드 모드에서는 샤드별 이름을 씁니다."""
+    return shard.filename(filename) if shard is not None else filename
+
+def _write_result_index(result_root, shard, queue):
+    """결과 레코드에서 소스 <-> 결과 경로 인덱스를 만듭니다. 조회: python -m src.result_index <결과 폴더> --source <경로>"""
+    count = build_index(result_root, _state_filename(shard, RECORDS_FILENAME), _state_filename(shard, INDEX_FILENAME))
+    queue.put(('log', f"결과 인덱스 생성: {count}개 항목"))
 
-def process_single_file(file_info: FileInfo, time_offset_counters: defaultdict, summary: defaultdict, queue):
+def _restore_from_journal(journal: RunJournal, file_list: list, time_offset_counters: defaultdict, keeper_outputs: dict, queue, directories=None):
+    """저널에서 완료된 파일의 스코프 카운터와 결과 경로를 복원하고, 미완료 잔여물을 정리합니다."""
+    completed = journal.completed_items()
+    for _, done in completed:
+        if done.get("offset_scope"):
+            time_offset_counters[tuple(done["offset_scope"])] += 1
+    outputs_by_key = {key: done.get("path") for key, done in completed}
+    for file_info in file_list:
+        output = outputs_by_key.get(RunJournal.key_for(file_info))
+        if output:
+            keeper_outputs[file_info.absolute_path] = output
+    removed = reconcile_partial_outputs(journal, queue, directories)
+    queue.put(('log', f"이전 실행 저널을 불러왔습니다: 완료 {len(completed)}개, 정리한 잔여 파일 {removed}개"))
+
+def _run_pipeline(file_list: list, journal: RunJournal, duplicate_of: dict, keeper_outputs: dict, dedup_mode, time_offset_counters: defaultdict, summary: defaultdict, queue, control: RunControl, thumbnail_cache: Union[ThumbnailCache, None] = None, records: Union[RecordWriter, None] = None, naming_hash: str = "md5"):
     """
-    단일 파일에 대한 처리 파이프라인.
+    정렬된 파일 목록을 디렉토리 배치 단위로 순서대로 처리합니다. 취소 시 ProcessingCancelled가 전파됩니다.
+    현재 배치를 처리하는 동안 다음 배치는 백그라운드에서 미리 읽습니다.
+    배치의 파일은 임시 이름으로 결과 파일을 만든 뒤, 배치 끝에서 이름을 한 번에 결정/적용합니다.
     """
-    # 1. (TASK-03-01) 기준 날짜 탐색
-    date_info: Union[DateInfoFound, DateInfoNotFound] = resolve_date(file_info.absolute_path) # Assuming resolve_date returns a dict with 'found' key
-    if date_info["found"]:
-        date_info = cast(DateInfoFound, date_info) # Explicitly cast for static analysis
-        queue.put(('log', f"  기준 날짜 폴더 발견: {date_info['ymd']} (스코프: {date_info['scope_key'][0]})")) # cite: 1
-    else:
-        queue.put(('log', "  기준 날짜 폴더를 찾지 못했습니다. 메타데이터 수정 스킵."))
-
-    # 2. (TASK-01-03) 결과 디렉토리 생성
-    # source_root는 FileInfo 객체에 Path 객체로 저장되어 있음
-    result_base_dir = file_info.source_root / "result"
-    result_dir = result_base_dir / file_info.relative_path # relative_path는 Path 객체
-    os.makedirs(result_dir, exist_ok=True)
-    queue.put(('log', f"  결과 디렉토리 생성/확인: {result_dir}"))
+    total_files = len(file_list)
+    batches = group_by_directory(file_list, journal.result_root)
+    prefetcher = DirectoryPrefetcher()
+    i = 0
+    try:
+        # --- 2차 처리: 파일 단위 파이프라인 ---
+        for batch_index, batch in enumerate(batches):
+            control.checkpoint()
+            batch.prepare()
+            queue.put(('log', f"결과 디렉토리 생성/확인: {batch.result_dir} ({len(batch.files)}개 파일)"))
+            prefetcher.prefetch(batches[batch_index + 1] if batch_index + 1 < len(batches) else None)
+            pending = {} # 소스 절대 경로 -> _PendingName (처리 순서 유지)
+            try:
+                for file_info in batch.files:
+                    control.checkpoint()
+                    _run_one(i, total_files, file_info, batch, journal, duplicate_of, keeper_outputs, dedup_mode, time_offset_counters, summary, queue, control, pending, records, naming_hash)
+                    i += 1
+                    progress_val = (i / total_files) * 100
+                    progress_text = f"{i}/{total_files} ({progress_val:.2f}%)"
+                    queue.put(('progress', progress_val, progress_text))
+            finally:
+                # 취소되더라도 결과 파일 생성까지 끝난 파일은 이름을 확정하여 결과를 유지한다
+                _finalize_batch(batch, list(pending.values()), journal, keeper_outputs, summary, queue, thumbnail_cache, records)
+    finally:
+        prefetcher.close()
 
-    # 3. (v0.5) 결과 파일 생성 (복사 또는 변환)
-    result_file_path = handle_conversion_or_copy(file_info, result_dir, summary, queue)
-    if not result_file_path:
-        return # 변환/복사 실패 시 스킵
+class _PendingName:
+    """결과 파일 생성/메타데이터/해시까지 마치고 배치의 파일명 결정 단계를 기다리는 파일 하나."""
+    def __init__(self, file_info: FileInfo, staged_path=None, original_name=None, content_hash=None, offset_scope=None, thumbnail=None, link_to=None):
+        self.file_info = file_info
+        self.staged_path = staged_path
+        self.original_name = original_name # 임시 접두사를 뺀 결과 파일명
+        self.content_hash = content_hash # None이면 앞 단계 실패: 원래 파일명으로만 되돌림
+        self.offset_scope = offset_scope
+        self.thumbnail = thumbnail # 메타데이터 읽기에서 얻은 EXIF 내장 썸네일
+        self.link_to = link_to # 같은 배치 keeper의 _PendingName (하드링크 중복)
+        self.failed = False # 이미 실패로 집계됨
+        self.actions = 0
+        self.elapsed_ms = 0
 
-    # 4. (v0.4, v0.6, v0.7) 메타데이터 보정
-    _handle_metadata(result_file_path, date_info, time_offset_counters, summary, queue)
+def _run_one(i: int, total_files: int, file_info: FileInfo, batch: DirectoryBatch, journal: RunJournal, duplicate_of: dict, keeper_outputs: dict, dedup_mode, time_offset_counters: defaultdict, summary: defaultdict, queue, control: RunControl, pending: dict, records: Union[RecordWriter, None] = None, naming_hash: str = "md5"):
+    """
+    파일 하나를 처리하고 결과를 요약에 반영합니다. 파일 단위 실패는 error.log에 기록하고 계속 진행합니다.
+    이름 결정이 필요한 파일은 pending에 추가되며, 나머지는 바로 완료 처리됩니다.
+    records가 주어지면 처리 전후 요약의 차이로 결과 코드를 만들어 파일별 레코드를 남깁니다.
+    """
+    started = time.perf_counter()
+    summary_before = dict(summary)
+    output_path = None
+    deferred = None
+    journal_key = RunJournal.key_for(file_info)
+    try:
+        # 각 파일 처리 시작 로그
+        queue.put(('log', f"[{i+1}/{total_files}] 파일 처리 시작: {file_info.filename}"))
+        if journal.is_done(journal_key):
+            queue.put(('log', "  이전 실행에서 완료된 파일이라 건너뜀"))
+            summary['resumed_skipped'] += 1
+            output_path = journal.records[journal_key][STAGE_DONE].get("path")
+        else:
+            keeper = duplicate_of.get(file_info.absolute_path)
+            handled = False
+            if keeper is not None and dedup_mode == 'hardlink' and keeper.absolute_path in pending and not pending[keeper.absolute_path].failed:
+                # keeper가 같은 배치에서 아직 이름을 기다리는 중: 이름 결정 단계에서 keeper의 최종 이름으로 연결
+                deferred = _PendingName(file_info, link_to=pending[keeper.absolute_path])
+            elif keeper is not None:
+                handled, output_path = _handle_duplicate(file_info, keeper, keeper_outputs, dedup_mode, summary, queue, batch)
+            if handled:
+                journal.record(journal_key, STAGE_DONE, path=output_path, offset_scope=None)
+            elif deferred is None:
+                deferred = produce_single_file(file_info, time_offset_counters, summary, queue, batch, _staging_prefix(i), journal=journal, control=control, naming_hash=naming_hash)
+        if deferred is None:
+            summary['processed_files'] += 1
+    except ProcessingCancelled:
+        _discard_incomplete_output(journal, journal_key, queue)
+        raise
+    except Exception as e:
+        # TASK-08-02: error.log 기록
+        queue.put(('log', f"  {get_log_message('CONVERT_FAIL')}")) # Using a generic fail message for now
+        log_error_to_file(str(file_info.absolute_path), "MAIN_PIPELINE", e)
+        summary['failed_files'] += 1
+        # 결과 파일이 임시 이름으로 남아 있으면 원래 파일명으로 되돌린다
+        staged_path = journal.records.get(journal_key, {}).get(STAGE_OUTPUT, {}).get("path")
+        if staged_path and os.path.exists(staged_path):
+            deferred = _PendingName(file_info, staged_path, os.path.basename(staged_path)[len(_staging_prefix(i)):])
+            deferred.failed = True
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if deferred is not None:
+        deferred.actions = actions_from_summary(summary_before, summary)
+        deferred.elapsed_ms = elapsed_ms
+        pending[file_info.absolute_path] = deferred
+    elif records:
+        records.append(journal_key, output_path, actions_from_summary(summary_before, summary), elapsed_ms)
 
-    # 5. (v0.2) 파일명 표준화
-    # 파일의 실제 MD5 해시를 계산합니다.
-    content_hash = calculate_md5(result_file_path)
-    queue.put(('log', f"  파일 콘텐츠 MD5 해시 계산 완료: {content_hash[:5]}..."))
+def _staging_prefix(index: int) -> str:
+    return f"{STAGING_PREFIX}{index}_"
 
-    # standardize_filename 함수는 파일의 현재 경로, content_hash, summary를 받음 (naming.py에서 summary 업데이트 가정)
-    # result_file_path는 이미 result 폴더 내의 파일 경로임
-    final_renamed_path = standardize_filename(str(result_file_path), content_hash, summary)
-    if final_renamed_path != str(result_file_path):
-        queue.put(('log', f"  파일명 표준화: {os.path.basename(result_file_path)} -> {os.path.basename(final_renamed_path)}"))
-    else:
-        queue.put(('log', f"  파일명 표준화: 변경 없음 ({os.path.basename(result_file_path)})"))
+def _discard_incomplete_output(journal: RunJournal, journal_key: str, queue):
+    """처리 도중 취소된 파일의 중간 결과물을 삭제합니다. (다음 재개 시 처음부터 처리)"""
+    stages = journal.records.get(journal_key, {})
+    output_path = stages.get(STAGE_OUTPUT, {}).get("path")
+    if STAGE_DONE not in stages and output_path and os.path.exists(output_path):
+        os.remove(output_path)
+        queue.put(('log', f"  취소된 파일의 중간 결과물 삭제: {os.path.basename(output_path)}"))
 
-def handle_conversion_or_copy(file_info: FileInfo, result_dir: Path, summary: defaultdict, queue) -> Union[Path, None]:
+def _plan_and_apply(batch: DirectoryBatch, pending: list, requests: list, journal: RunJournal):
     """
-    파일을 결과 디렉토리로 복사하거나 변환합니다.
-    현재는 원본 파일을 복사하는 로직만 구현되어 있습니다.
-    (TASK-05-01, TASK-05-02 관련)
+    이름 변경 계획을 세워 저널에 먼저 기록한 뒤 적용합니다.
+    적용은 전부 성공하거나 전부 되돌려지며, 중간에 프로그램이 종료된 경우에는
+    재개 시 저널의 계획으로 완료되지 않은 파일의 결과물을 찾아 정리합니다.
     """
-    destination_path = result_dir / file_info.filename
-
-    # Handle PNG/HEIC to JPG conversion
-    if file_info.extension in ['.png', '.heic']:
-        # For conversion, the destination filename should have a .jpg extension
-        destination_filename_jpg = file_info.absolute_path.stem + ".jpg"
-        destination_path_jpg = result_dir / destination_filename_jpg
-        converted_path = convert_to_jpg(file_info.absolute_path, destination_path_jpg, summary, queue)
-        if converted_path:
-            return converted_path
-        else:
-            # Conversion failed, return None to skip further processing for this file
-            return None
-
-    # If not a PNG/HEIC, or if conversion is not applicable, copy the original file
+    name_counts = defaultdict(int) # 적용에 성공한 경우에만 요약에 반영
+    plan = plan_batch_renames(requests, batch.name_index, name_counts)
+    journal.record_rename_plan(batch.result_dir, [
+        (RunJournal.key_for(item.file_info), item.staged_path if entry.link_to is None else None, str(batch.result_dir / entry.final_name))
+        for item, entry in zip(pending, plan)
+    ])
     try:
-        shutil.copy2(file_info.absolute_path, destination_path)
-        queue.put(('log', f"  원본 파일 복사: {file_info.absolute_path.name} -> {destination_path.name}")) # DEV_GUIDE 6.2 COPY_TO_RESULT
-        summary['copied_files'] += 1
-        return destination_path
-    except Exception as e:
-        queue.put(('log', f"  파일 복사 실패 ({file_info.absolute_path.name}): {e}"))
-        # TODO: (TASK-08-02) error.log 기록
-        log_error_to_file(str(file_info.absolute_path), "FILE_COPY", e)
-        return None
+        final_paths = apply_rename_plan(batch.result_dir, plan)
+    except Exception:
+        batch.name_index = NameIndex.from_directory(batch.result_dir) # 계획이 반영된 색인을 실제 상태로 되돌림
+        raise
+    return plan, final_paths, name_counts
 
-def _handle_metadata(result_file_path: Path, date_info: Union[DateInfoFound, DateInfoNotFound], time_offset_counters: defaultdict, summary: defaultdict, queue):
+def _handle_duplicate(file_info: FileInfo, keeper: FileInfo, keeper_outputs: dict, dedup_mode, summary: defaultdict, queue, batch: DirectoryBatch) -> tuple:
     """
-    파일의 메타데이터를 보정합니다.
-    (TASK-04, TASK-06, TASK-07 관련)
+    내용 중복 파일을 모드에 따라 처리합니다.
+    Returns:
+        tuple: (중복 처리로 완료되었는지 여부, 하드링크 결과 경로 또는 None).
+            False이면 일반 파이프라인으로 처리해야 합니다.
     """
-    file_extension = result_file_path.suffix.lower()
-    processor = get_metadata_processor(file_extension)
+    if dedup_mode == 'report':
+        queue.put(('log', f"  {get_log_message('DEDUP_REPORT', original=keeper.absolute_path)}"))
+        summary['duplicate_reported'] += 1
+        return False, None
+    if dedup_mode == 'skip':
+        queue.put(('log', f"  {get_log_message('DEDUP_SKIP', original=keeper.absolute_path)}"))
+        summary['duplicate_skipped'] += 1
+        return True, None
+    # hardlink: keeper와 날짜 스코프가 다르거나 keeper 처리에 실패했다면 일반 처리로 대체
+    if not same_scope(file_info, keeper):
+        queue.put(('log', f"  {get_log_message('DEDUP_SCOPE_DIFFERS', original=keeper.absolute_path)}"))
+        return False, None
+    keeper_output = keeper_outputs.get(keeper.absolute_path)
+    if not keeper_output or not os.path.exists(keeper_output):
+        return False, None
+    linked_path = link_duplicate(file_info, keeper_output, batch.result_dir, summary, queue, name_index=batch.name_index)
+    return linked_path is not None, linked_path
 
-    # 1. 기준 날짜 정보가 없는 경우 처리
-    if not date_info["found"]:
-        if date_info.get("reason") == "unsupported_format":
-            queue.put(('log', f"  {get_log_message('META_FAIL_UNSUPPORTED')} ({result_file_path.name})"))
-        else:
-            queue.put(('log', f"  {get_log_message('META_SKIP_NO_DATE')} ({result_file_path.name})"))
-        summary['metadata_skipped_no_date'] += 1
-        return
+def produce_single_file(file_info: FileInfo, time_offset_counters: defaultdict, summary: defaultdict, queue, batch: DirectoryBatch, name_prefix: str, journal: Union[RunJournal, None] = None, control: Union[RunControl, None] = None, naming_hash: str = "md5") -> Union[_PendingName, None]:
+    """
+    단일 파일에 대한 처리 파이프라인 중 파일명 표준화 이전 단계. (메타데이터 판정 -> 결과 파일 생성 -> 해시)
+    결과 파일은 name_prefix를 붙인 임시 이름으로 만들어지며, 최종 이름은 배치 단위로 _finalize_batch에서 정해집니다.
+    journal이 주어지면 결과 파일 생성, 메타데이터 단계의 완료를 기록합니다.
+    control이 주어지면 단계 사이마다 취소/일시정지를 확인합니다.
+    날짜 정보, 결과 디렉토리, 파일명 인덱스는 준비된 DirectoryBatch와 공유합니다.
+    Returns:
+        _PendingName | None: 이름 결정을 기다리는 파일. 변환/복사 실패 시 None.
+    """
+    # 1. (TASK-03-01) 기준 날짜 탐색 (같은 디렉토리의 파일은 결과가 같으므로 배치에서 재사용)
+    date_info: Union[DateInfoFound, DateInfoNotFound] = batch.resolve()
+    if date_info["found"]:
+        date_info = cast(DateInfoFound, date_info) # Explicitly cast for static analysis
+        queue.put(('log', f"  기준 날짜 폴더 발견: {date_info['ymd']} (스코프: {date_info['scope_key'][0]})")) # cite: 1
+    else:
+        queue.put(('log', "  기준 날짜 폴더를 찾지 못했습니다. 메타데이터 수정 스킵."))
 
-    # date_info가 DateInfoFound 타입임을 명시적으로 캐스팅
-    date_info = cast(DateInfoFound, date_info)
-    folder_ymd = date_info['ymd']
-    scope_key = date_info['scope_key']
-    current_offset_seconds = time_offset_counters[scope_key]
+    # 2. (v0.4, v0.6, v0.7) 원본의 메타데이터를 먼저 읽어 보정 여부(PASS/SET)를 정하고,
+    # 3. (v0.5) 결과 파일을 한 번에 만든다: 일반 복사, 날짜를 넣은 복사, 변환. 결과 디렉토리는 배치당 한 번 생성됨
+    scope_key = date_info["scope_key"] if date_info["found"] else None
+    offset_before = time_offset_counters[scope_key] if scope_key else None
+    plan = plan_output(file_info, date_info, time_offset_counters)
+    result_file_path, read_result = produce_planned(file_info, plan, batch.result_dir, date_info, time_offset_counters, summary, queue, name_prefix)
+    if not result_file_path:
+        return None # 변환/복사 실패 시 스킵
+    batch.name_index.add(result_file_path.name)
+    # 이 파일이 스코프 카운터를 사용했는지 (재개 시 카운터 복원용)
+    offset_scope = list(scope_key) if scope_key and time_offset_counters[scope_key] != offset_before else None
+    journal_key = RunJournal.key_for(file_info)
+    if journal:
+        journal.record(journal_key, STAGE_OUTPUT, path=str(result_file_path))
+        journal.record(journal_key, STAGE_METADATA, offset_scope=offset_scope)
+    if control:
+        control.checkpoint()
 
-    # 기준 날짜 + 오프셋으로 최종 목표 날짜/시간 생성
-    base_datetime_str = f"{folder_ymd} 09:00:00" # 09:00:00부터 시작하여 1초씩 증가
-    target_datetime_obj = datetime.strptime(base_datetime_str, '%Y-%m-%d %H:%M:%S') + timedelta(seconds=current_offset_seconds)
-    target_datetime_str_for_write = target_datetime_obj.strftime('%Y:%m:%d %H:%M:%S') # Exif/FFmpeg write format
-    target_ymd_for_compare = target_datetime_obj.strftime('%Y-%m-%d') # For comparison with read YMD
+    # 4. (v0.2) 파일명 표준화에 사용할 파일의 해시를 계산합니다. (기본 MD5, naming_hash='sampled-v1'이면 표본 해시)
+    content_hash = calculate_content_hash(result_file_path, naming_hash)
+    queue.put(('log', hash_log_message(naming_hash, content_hash)))
+    original_name = result_file_path.name[len(name_prefix):]
+    return _PendingName(file_info, str(result_file_path), original_name, content_hash, offset_scope, (read_result or {}).get("thumbnail"))
 
-    # 2. 프로세서가 없는 경우 (지원하지 않는 파일 형식)
-    if processor is None:
-        queue.put(('log', f"  {get_log_message('META_FAIL_UNSUPPORTED')} ({result_file_path.name})"))
-        summary['metadata_skipped_no_date'] += 1 # Or a new category for unsupported format
+def _finalize_batch(batch: DirectoryBatch, pending: list, journal: RunJournal, keeper_outputs: dict, summary: defaultdict, queue, thumbnail_cache: Union[ThumbnailCache, None] = None, records: Union[RecordWriter, None] = None):
+    """
+    (v0.2) 배치의 파일명 표준화. 대기 중인 파일의 최종 이름을 한 번에 정하고 적용합니다.
+    결과는 파일마다 순서대로 standardize_filename을 호출한 것과 같습니다.
+    """
+    if not pending:
         return
-
-    read_ymd = None
+    position = {id(item): k for k, item in enumerate(pending)}
+    requests = []
+    for item in pending:
+        if item.link_to is not None:
+            requests.append(RenameRequest(None, link_to=position[id(item.link_to)]))
+        else:
+            requests.append(RenameRequest(os.path.basename(item.staged_path), item.content_hash, item.original_name))
     try:
-        read_result = processor.read_metadata(str(result_file_path))
-        if read_result and read_result.get("ymd"):
-            read_ymd = read_result["ymd"]
-    except (ExternalToolError, MetadataError) as e:
-        queue.put(('log', f"  {get_log_message('META_FAIL_READ')} ({result_file_path.name})"))
-        log_error_to_file(str(result_file_path), "METADATA_READ", e)
-        summary['metadata_failed'] += 1
-        return
+        try:
+            plan, final_paths, name_counts = _plan_and_apply(batch, pending, requests, journal)
+        except NameConflictError:
+            # 계획 후 다른 프로세스가 이름을 차지함: 적용분은 되돌려졌으므로 디렉토리를 다시 읽고 한 번 더 계획
+            batch.name_index = NameIndex.from_directory(batch.result_dir)
+            plan, final_paths, name_counts = _plan_and_apply(batch, pending, requests, journal)
     except Exception as e:
-        queue.put(('log', f"  {get_log_message('META_FAIL_READ')} ({result_file_path.name})"))
-        log_error_to_file(str(result_file_path), "METADATA_READ", e)
-        summary['metadata_failed'] += 1
-        return
+        log_error_to_file(str(batch.result_dir), "NAMING", e)
+        queue.put(('log', f"  파일명 표준화 실패: {batch.result_dir} (오류 로그 확인)"))
+        batch.name_index = NameIndex.from_directory(batch.result_dir)
+        for item in pending:
+            if not item.failed:
+                summary['failed_files'] += 1
+        return # 임시 이름으로 남은 결과물은 재개 시 정리된다
+    for key, value in name_counts.items():
+        summary[key] += value
 
-    # 3. 메타데이터가 이미 일치하는 경우
-    if read_ymd == target_ymd_for_compare:
-        queue.put(('log', f"  {get_log_message('META_PASS')} ({result_file_path.name})"))
-        summary['metadata_passed'] += 1
-    # 4. 메타데이터를 수정해야 하는 경우
-    else:
-        try:
-            success = processor.write_metadata(str(result_file_path), target_datetime_str_for_write)
-            if success:
-                queue.put(('log', f"  {get_log_message('META_SET', time=target_datetime_str_for_write)} ({result_file_path.name})"))
-                summary['metadata_changed'] += 1
-                time_offset_counters[scope_key] += 1 # Increment offset for the next file in the same scope
-            else:
-                # This path might be less common if write_metadata raises exceptions on failure
-                queue.put(('log', f"  {get_log_message('META_FAIL_WRITE')} ({result_file_path.name})"))
-                log_error_to_file(str(result_file_path), "METADATA_WRITE", Exception("Metadata write failed without specific exception."))
-                summary['metadata_failed'] += 1
-        except (ExternalToolError, MetadataError) as e:
-            queue.put(('log', f"  {get_log_message('META_FAIL_WRITE')} ({result_file_path.name})"))
-            log_error_to_file(str(result_file_path), "METADATA_WRITE", e)
-            summary['metadata_failed'] += 1
-        except Exception as e:
-            queue.put(('log', f"  {get_log_message('META_FAIL_WRITE')} ({result_file_path.name})"))
-            log_error_to_file(str(result_file_path), "METADATA_WRITE", e)
-            summary['metadata_failed'] += 1
+    for item, request, entry, final_path in zip(pending, requests, plan, final_paths):
+        actions = item.actions
+        if entry.link_to is not None:
+            queue.put(('log', f"  {get_log_message('DEDUP_HARDLINK', original=plan[entry.link_to].final_name)} -> {entry.final_name}"))
+            summary['duplicate_hardlinked'] += 1
+            actions |= ACTION_BITS["DEDUP_HARDLINK"]
+        elif entry.final_name != request.original_name:
+            queue.put(('log', f"  파일명 표준화: {request.original_name} -> {entry.final_name}"))
+        else:
+            queue.put(('log', f"  파일명 표준화: 변경 없음 ({entry.final_name})"))
+        if entry.action:
+            actions |= ACTION_BITS[entry.action]
+        if entry.suffixed:
+            actions |= ACTION_BITS["NAME_DUPLICATE_SUFFIX"]
+        if records:
+            records.append(RunJournal.key_for(item.file_info), final_path, actions, item.elapsed_ms)
+        if item.failed:
+            continue
+        if thumbnail_cache:
+            thumbnail = make_thumbnail(final_path, item.thumbnail)
+            if thumbnail:
+                thumbnail_cache.add(final_path, thumbnail)
+        journal.record(RunJournal.key_for(item.file_info), STAGE_DONE, path=final_path, offset_scope=item.offset_scope)
+        keeper_outputs[item.file_info.absolute_path] = final_path
+        summary['processed_files'] += 1
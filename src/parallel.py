@@ -0,0 +1,308 @@
+# src/parallel.py
+import os
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Union
+
+from .scanner import scan_files, calculate_content_hash, hash_log_message, get_result_root
+from .logging_i18n import get_log_message, log_error_to_file
+from .control import RunControl
+from .summary import new_summary, create_summary_report
+from .steps import handle_conversion_or_copy, _handle_metadata
+from .context import PipelineContext, EventChannel, OffsetAllocator, init_worker, merge_counters
+from .batching import group_by_directory
+from .journal import RunJournal, STAGE_OUTPUT, STAGE_METADATA
+from .records import RecordWriter, actions_from_summary
+from .result_index import build_index
+from .naming import STAGING_PREFIX
+from .manifest import prepare_manifest
+from .errors import FileOperationError
+from .preflight import apply_preflight
+from .orchestrator import _PendingName, _finalize_batch, _staging_prefix
+from .scheduling import ByteProgress, file_sizes, order_by_cost
+
+# 작업자 프로세스 하나당 동시에 대기시키는 결과 파일 생성 작업 수 (취소 반응성과 메모리 사용량 제한)
+TASKS_PER_WORKER = 2
+
+# --- 워커 프로세스에서 실행되는 단계 (인자와 반환값은 모두 피클 가능) ---
+
+def _produce(ctx: PipelineContext, file_info, result_dir: str, name_prefix: str):
+    result_file_path = handle_conversion_or_copy(file_info, Path(result_dir), ctx.summary, ctx, name_prefix)
+    return str(result_file_path) if result_file_path else None
+
+def _metadata(ctx: PipelineContext, staged_path: str, date_info: dict, offset: Union[int, None], missing_tools: tuple = ()):
+    """오프셋은 부모의 OffsetAllocator가 정해 넘깁니다. 반환값: (오프셋 사용 여부, EXIF 내장 썸네일)"""
+    counters = {date_info["scope_key"]: offset} if date_info["found"] else {}
+    read_result = _handle_metadata(Path(staged_path), date_info, counters, ctx.summary, ctx, missing_tools)
+    used_offset = bool(counters) and counters[date_info["scope_key"]] != offset
+    return used_offset, (read_result or {}).get("thumbnail")
+
+def _hash(ctx: PipelineContext, staged_path: str, naming_hash: str):
+    content_hash = calculate_content_hash(staged_path, naming_hash)
+    ctx.put(('log', hash_log_message(naming_hash, content_hash)))
+    return content_hash
+
+_STAGES = {"produce": _produce, "metadata": _metadata, "hash": _hash}
+
+def _run_task(stage: str, index: int, source: str, *args) -> tuple:
+    """
+    단계 하나를 실행합니다. 로그는 이벤트 채널로 보내고, 로컬 카운터는 결과와 함께 반환합니다.
+    Returns:
+        tuple: (단계 결과, 로컬 카운터, 실패 여부, 소요 시간 ms)
+    """
+    started = time.perf_counter()
+    ctx = PipelineContext(index)
+    try:
+        value, failed = _STAGES[stage](ctx, *args), False
+    except Exception as e:
+        ctx.put(('log', f"  {get_log_message('CONVERT_FAIL')}"))
+        log_error_to_file(source, "MAIN_PIPELINE", e)
+        value, failed = None, True
+    ctx.send()
+    return value, ctx.counters(), failed, (time.perf_counter() - started) * 1000
+
+# --- 부모 프로세스 ---
+
+class _ParallelRun:
+    """
+    프로세스 풀 실행 한 번의 부모 측 상태.
+    작업 배분, 오프셋 할당, 요약 병합, 배치 파일명 결정은 모두 부모의 한 스레드에서만 수행합니다.
+    """
+    def __init__(self, file_list: list, result_root: Path, queue, control: RunControl, journal: RunJournal, records: RecordWriter, max_inflight: int, largest_first: bool = True, naming_hash: str = "md5"):
+        self.file_list = file_list
+        self.naming_hash = naming_hash
+        self.queue = queue
+        self.control = control
+        self.journal = journal
+        self.records = records
+        self.max_inflight = max_inflight
+        self.summary = new_summary()
+        self.allocator = OffsetAllocator()
+        self.executor = None
+        self.futures = {} # future -> (단계, 작업 번호)
+        self.batches = group_by_directory(file_list, result_root)
+        self.batch_of = []
+        self.first_index = {} # 배치 -> 첫 파일의 작업 번호
+        for batch in self.batches:
+            self.first_index[id(batch)] = len(self.batch_of)
+            self.batch_of.extend([batch] * len(batch.files))
+        self.remaining = {id(batch): len(batch.files) for batch in self.batches}
+        self.pending = [None] * len(file_list) # 작업 번호 -> _PendingName
+        self.file_counters = [{} for _ in file_list] # 작업 번호 -> 파일 하나의 로컬 카운터 합계
+        self.elapsed_ms = [0.0] * len(file_list)
+        # 오프셋 차례는 정렬 순서로 등록하고, 작업 배분 순서만 비용 순으로 바꾼다
+        scope_keys = []
+        for index in range(len(file_list)):
+            self.batch_of[index].resolve()
+            scope_keys.append(self.scope_key(index))
+            if scope_keys[-1] is not None:
+                self.allocator.register(scope_keys[-1], index)
+        self.sizes = file_sizes(file_list)
+        self.order = order_by_cost(file_list, self.sizes, scope_keys) if largest_first else list(range(len(file_list)))
+        self.next_position = 0
+        self.progress = ByteProgress(len(file_list), sum(self.sizes))
+        self._started = set() # 시작 로그를 출력한 작업 번호 (이벤트 채널 수신 스레드에서만 사용)
+
+    def on_events(self, index: int, events: list):
+        """이벤트 채널 수신 스레드에서 호출됩니다. 파일의 첫 이벤트 앞에 시작 로그를 붙입니다."""
+        if index not in self._started:
+            self._started.add(index)
+            self.queue.put(('log', f"[{index + 1}/{len(self.file_list)}] 파일 처리 시작: {self.file_list[index].filename}"))
+        for event in events:
+            self.queue.put(event)
+
+    def date_info(self, index: int) -> dict:
+        return self.batch_of[index].date_info
+
+    def scope_key(self, index: int):
+        """오프셋 차례를 받는 스코프. 날짜가 없거나 메타데이터 보정을 건너뛰는 파일(필요한 외부 도구 없음)은 None."""
+        date_info = self.date_info(index)
+        if not date_info["found"] or self.file_list[index].missing_tools:
+            return None
+        return date_info["scope_key"]
+
+    def submit(self, stage: str, index: int, *args):
+        source = str(self.file_list[index].absolute_path)
+        self.futures[self.executor.submit(_run_task, stage, index, source, *args)] = (stage, index)
+
+    @property
+    def has_unsubmitted(self) -> bool:
+        return self.next_position < len(self.order)
+
+    def fill(self):
+        """대기 중인 작업이 max_inflight보다 적으면 다음 파일의 결과 파일 생성 작업을 배분합니다."""
+        while self.has_unsubmitted and len(self.futures) < self.max_inflight:
+            index = self.order[self.next_position]
+            self.next_position += 1
+            batch = self.batch_of[index]
+            if batch.name_index is None:
+                batch.prepare()
+                self.queue.put(('log', f"결과 디렉토리 생성/확인: {batch.result_dir} ({len(batch.files)}개 파일)"))
+            self.submit("produce", index, self.file_list[index], str(batch.result_dir), _staging_prefix(index))
+
+    def on_done(self, future):
+        stage, index = self.futures.pop(future)
+        try:
+            value, counters, failed, elapsed_ms = future.result()
+        except Exception as e: # 워커 프로세스 종료, 피클 실패 등
+            log_error_to_file(str(self.file_list[index].absolute_path), "MAIN_PIPELINE", e)
+            value, counters, failed, elapsed_ms = None, {}, True, 0
+        self.elapsed_ms[index] += elapsed_ms
+        merge_counters(self.summary, counters)
+        for key, count in counters.items():
+            self.file_counters[index][key] = self.file_counters[index].get(key, 0) + count
+        date_info = self.date_info(index)
+        scope_key = self.scope_key(index)
+
+        if stage == "produce":
+            if not failed and value:
+                file_info = self.file_list[index]
+                self.batch_of[index].name_index.add(os.path.basename(value))
+                self.journal.record(RunJournal.key_for(file_info), STAGE_OUTPUT, path=value)
+                self.pending[index] = _PendingName(file_info, value, os.path.basename(value)[len(_staging_prefix(index)):])
+            if scope_key is None:
+                if self.pending[index]:
+                    self.submit("metadata", index, value, date_info, None, self.file_list[index].missing_tools)
+                else:
+                    self._finish(index, failed)
+                return
+            # 결과 파일이 없으면 오프셋 차례만 넘긴다
+            self._dispatch_metadata(self.allocator.ready(scope_key, index, needs_offset=self.pending[index] is not None))
+            if not self.pending[index]:
+                self._finish(index, failed)
+        elif stage == "metadata":
+            used_offset, thumbnail = value if not failed else (False, None)
+            item = self.pending[index]
+            item.offset_scope = list(scope_key) if used_offset else None
+            item.thumbnail = thumbnail
+            if scope_key is not None:
+                self._dispatch_metadata(self.allocator.complete(scope_key, index, used_offset))
+            if failed:
+                self._finish(index, failed)
+                return
+            self.journal.record(RunJournal.key_for(item.file_info), STAGE_METADATA, offset_scope=item.offset_scope)
+            self.submit("hash", index, item.staged_path, self.naming_hash)
+        else:
+            self.pending[index].content_hash = value
+            self._finish(index, failed)
+
+    def _dispatch_metadata(self, ready: list):
+        for index, offset in ready:
+            self.submit("metadata", index, self.pending[index].staged_path, self.date_info(index), offset)
+
+    def _finish(self, index: int, failed: bool):
+        """파일 하나의 단계가 모두 끝남. 배치의 마지막 파일이면 배치의 파일명을 결정합니다."""
+        item = self.pending[index]
+        if failed:
+            self.summary['failed_files'] += 1
+            if item is not None:
+                item.failed = True # 이름 결정 단계에서 원래 파일명으로만 되돌림
+        elif item is None:
+            self.summary['processed_files'] += 1 # 변환/복사 실패는 순차 실행과 같이 처리 완료로 집계
+        actions = actions_from_summary({}, self.file_counters[index])
+        if item is not None:
+            item.actions, item.elapsed_ms = actions, self.elapsed_ms[index]
+        else:
+            self.records.append(RunJournal.key_for(self.file_list[index]), None, actions, self.elapsed_ms[index])
+        self.queue.put(('progress', *self.progress.add(self.sizes[index])))
+
+        batch = self.batch_of[index]
+        self.remaining[id(batch)] -= 1
+        if self.remaining[id(batch)] == 0:
+            self.finalize(batch)
+
+    def finalize(self, batch):
+        first = self.first_index[id(batch)]
+        items = [item for item in self.pending[first:first + len(batch.files)] if item is not None]
+        _finalize_batch(batch, items, self.journal, {}, self.summary, self.queue, records=self.records)
+
+    def discard_unfinished(self):
+        """
+        취소 시 파일명이 결정되지 않은 배치의 임시 이름 결과 파일을 삭제합니다.
+        취소 직전에 끝나 결과를 받지 못한 작업의 파일도 있으므로 디렉토리에서 임시 이름을 찾습니다.
+        """
+        for batch in self.batches:
+            if self.remaining[id(batch)] == 0 or batch.name_index is None:
+                continue
+            for name in os.listdir(batch.result_dir):
+                if name.startswith(STAGING_PREFIX):
+                    os.remove(batch.result_dir / name)
+
+def process_files_parallel(source_root, queue, control: Union[RunControl, None] = None, workers: Union[int, None] = None, output_root=None, largest_first: bool = True, naming_hash: str = "md5"):
+    """
+    프로세스 풀 기반 파이프라인 엔진.
+    결과 파일 생성(복사/변환), 메타데이터, 해시 단계를 ProcessPoolExecutor의 워커 프로세스에서 실행하므로
+    Pillow 변환과 MD5 계산이 GIL에 묶이지 않고 여러 코어를 사용합니다.
+
+    워커는 공유 상태를 건드리지 않습니다. 단계마다 PipelineContext의 로컬 카운터를 반환하면
+    부모가 요약에 합치고, 로그는 이벤트 채널(multiprocessing 큐)로 전달됩니다.
+    시간 오프셋은 부모의 OffsetAllocator가 스코프별 정렬 순서대로 할당하고,
+    파일명은 배치의 모든 파일이 끝난 뒤 부모에서 한 번에 결정하므로 결과는 순차 실행(process_files)과 같습니다.
+    외부 도구 통계는 워커 프로세스마다 따로 집계되므로 요약에 포함하지 않습니다.
+
+    largest_first=True이면 크기와 형식별 비용 추정으로 오래 걸리는 파일(동영상, HEIC 등)부터 시작하며,
+    진행률은 처리한 바이트 기준으로 남은 시간과 함께 보고합니다. 결과 파일명과 오프셋은 작업 순서와 무관합니다.
+    naming_hash는 process_files와 같이 파일명 해시 방식을 정하며 실행 매니페스트에 기록됩니다.
+
+    제한: 워커가 결과 파일을 먼저 만든 뒤 오프셋을 받아 메타데이터 단계에서 다시 기록하므로, 날짜를 기록하는(SET)
+    파일은 결과 파일을 두 번 씁니다. 오프셋 할당을 결과 파일 생성 앞으로 옮기면 같은 스코프의 파일을
+    정렬 순서대로만 만들 수 있어 한 번에 기록하는 방식(process_files의 plan_output)은 쓰지 않습니다.
+    """
+    control = control or RunControl()
+    file_list = scan_files(source_root, output_root)
+    file_list.sort(key=lambda x: (str(x.relative_path), x.filename.lower()))
+    queue.put(('log', f"총 {len(file_list)}개의 처리 대상 파일을 찾았습니다."))
+    queue.put(('log', "파일 목록을 결정적 순서로 정렬했습니다."))
+
+    workers = workers or os.cpu_count() or 1
+    result_root = get_result_root(source_root, output_root)
+    try:
+        prepare_manifest(result_root, naming_hash)
+    except FileOperationError as e:
+        queue.put(('log', str(e)))
+        queue.put(('error', str(e)))
+        return
+    journal = RunJournal(result_root)
+    records = RecordWriter(result_root)
+    skipped_summary = new_summary()
+    file_list = apply_preflight(file_list, source_root, skipped_summary, queue)
+    run = _ParallelRun(file_list, result_root, queue, control, journal, records, workers * TASKS_PER_WORKER, largest_first, naming_hash)
+    merge_counters(run.summary, skipped_summary)
+    # spawn: GUI 스레드와 이벤트 채널 수신 스레드가 있는 프로세스를 fork하지 않는다
+    mp_context = multiprocessing.get_context("spawn")
+    channel = EventChannel(run.on_events, mp_context)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context, initializer=init_worker, initargs=(channel.queue,)) as executor:
+            run.executor = executor
+            while not control.is_cancelled and (run.futures or run.has_unsubmitted):
+                if not control.is_paused:
+                    run.fill()
+                if not run.futures:
+                    time.sleep(0.2) # 일시정지 중
+                    continue
+                done, _ = wait(list(run.futures), timeout=0.2, return_when=FIRST_COMPLETED)
+                for future in done:
+                    run.on_done(future)
+            if control.is_cancelled:
+                executor.shutdown(wait=True, cancel_futures=True)
+    except BrokenProcessPool as e:
+        log_error_to_file(str(source_root), "MAIN_PIPELINE", e)
+        queue.put(('error', f"작업자 프로세스가 비정상 종료되어 처리를 중단했습니다: {e}"))
+        return
+    finally:
+        channel.close()
+        journal.close()
+        records.close()
+
+    queue.put(('log', f"결과 인덱스 생성: {build_index(result_root)}개 항목"))
+    if control.is_cancelled:
+        run.discard_unfinished()
+        run.summary['cancelled_files'] = len(file_list) - run.summary['processed_files'] - run.summary['failed_files']
+        queue.put(('log', create_summary_report(run.summary)))
+        queue.put(('cancelled', "작업이 취소되었습니다. 완료된 파일까지의 결과가 유지됩니다."))
+        return
+    queue.put(('log', create_summary_report(run.summary)))
+    queue.put(('done', "모든 파일 처리가 완료되었습니다."))
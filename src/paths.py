@@ -1,6 +1,9 @@
 # src/paths.py
 import sys
 import os
+import time
+import subprocess
+from functools import lru_cache
 from pathlib import Path
 
 def get_resource_path(relative_path):
@@ -32,6 +35,7 @@ def get_platform_bin_dir():
         # 현재는 "linux"를 기본값으로 반환합니다.
         return "linux"
 
+@lru_cache(maxsize=None) # 경로는 실행 중 바뀌지 않으므로 한 번만 계산
 def get_ffmpeg_path():
     """ffmpeg 바이너리 경로를 반환합니다."""
     platform_dir = get_platform_bin_dir()
@@ -40,6 +44,7 @@ def get_ffmpeg_path():
     else:
         return get_resource_path(os.path.join(platform_dir, "ffmpeg"))
 
+@lru_cache(maxsize=None)
 def get_ffprobe_path():
     """ffprobe 바이너리 경로를 반환합니다."""
     platform_dir = get_platform_bin_dir()
@@ -48,6 +53,7 @@ def get_ffprobe_path():
     else:
         return get_resource_path(os.path.join(platform_dir, "ffprobe"))
 
+@lru_cache(maxsize=None)
 def get_exiftool_path():
     """ExifTool 바이너리 경로를 반환합니다."""
     platform_dir = get_platform_bin_dir()
@@ -56,6 +62,7 @@ def get_exiftool_path():
     else:
         return get_resource_path(os.path.join(platform_dir, "exiftool"))
 
+@lru_cache(maxsize=None)
 def get_magick_path():
     """ImageMagick 'magick' 바이너리 경로를 반환합니다."""
     platform_dir = get_platform_bin_dir()
@@ -82,3 +89,52 @@ def check_binaries():
         if not Path(path).is_file():
             missing_binaries.append(name)
     return missing_binaries
+
+# 버전 확인 인자. 첫 줄(exiftool은 버전 번호만)을 버전 문자열로 사용합니다.
+VERSION_ARGS = {
+    "ffmpeg": ["-version"],
+    "ffprobe": ["-version"],
+    "exiftool": ["-ver"],
+    "magick": ["-version"],
+}
+_BINARY_GETTERS = {
+    "ffmpeg": get_ffmpeg_path,
+    "ffprobe": get_ffprobe_path,
+    "exiftool": get_exiftool_path,
+    "magick": get_magick_path,
+}
+
+def probe_binary(name: str) -> tuple:
+    """
+    외부 도구의 버전 확인 명령을 실행합니다. 결과는 (경로, 수정 시각)별로 캐시되므로
+    같은 프로세스(GUI 세션) 안에서 도구를 설치하거나 교체하면 다음 호출에서 다시 확인합니다.
+    Returns:
+        tuple: (버전 문자열 또는 None(없거나 실행할 수 없음), 실행에 걸린 시간(초) - 도구 시작 지연의 추정치)
+    """
+    path = _BINARY_GETTERS[name]()
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime = None
+    return _probe_binary_at(name, path, mtime)
+
+@lru_cache(maxsize=None)
+def _probe_binary_at(name: str, path: str, mtime) -> tuple:
+    if mtime is None or not Path(path).is_file():
+        return None, 0.0
+    started = time.perf_counter()
+    try:
+        result = subprocess.run([path, *VERSION_ARGS[name]], capture_output=True, text=True, errors='ignore', timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        return None, time.perf_counter() - started # 실행 권한 없음, 다른 플랫폼용 바이너리 등
+    elapsed = time.perf_counter() - started
+    if result.returncode == 0 and result.stdout.strip():
+        return result.stdout.strip().splitlines()[0][:80], elapsed
+    return None, elapsed
+
+def get_binary_versions() -> dict:
+    """
+    외부 도구별 버전 문자열을 반환합니다. 없거나 실행할 수 없는 도구는 None.
+    바뀌지 않은 도구는 캐시된 결과를 쓰지만, 처음 확인할 때는 도구마다 프로세스를 실행하므로 GUI 스레드가 아닌 곳에서 호출합니다.
+    """
+    return {name: probe_binary(name)[0] for name in _BINARY_GETTERS}
@@ -0,0 +1,160 @@
+# src/planner.py
+from collections import defaultdict
+from pathlib import Path
+
+from .scanner import FileInfo
+from .metadata.base import get_metadata_processor
+from .logging_i18n import get_log_message, log_error_to_file
+from .errors import ProcessingCancelled
+from .steps import handle_conversion_or_copy, _handle_metadata, _target_datetime
+
+CONVERT_EXTENSIONS = ('.png', '.heic')
+
+class OutputPlan:
+    """
+    결과 파일을 만드는 방법. 결과 파일을 만들기 전에 원본을 읽어 정합니다. (plan_output)
+    - metadata: 결과 파일의 메타데이터 판정
+        'skip_no_date' | 'unsupported' | 'read_failed' | 'pass' | 'set'
+        'decide': 변환 결과(JPEG bytes)를 기록하기 전에 읽어 PASS/SET을 판정 (HEIC: 원본 EXIF는 ImageMagick이 옮김)
+        'after': 결과 파일을 만든 뒤 결과 파일에서 판정 (bytes를 받지 않는 프로세서 등 기존 순서)
+    - 'set'/'decide'이면 processor.write_metadata_to로 날짜를 넣으며 결과 파일을 한 번에 기록합니다.
+      (복사/변환 후 메타데이터를 다시 쓰지 않음. 변환 형식은 변환한 JPEG에 날짜를 넣어 기록)
+    """
+    def __init__(self, metadata: str, processor=None, datetime_str=None, read_result=None, error=None, target_ymd=None):
+        self.metadata = metadata
+        self.processor = processor
+        self.datetime_str = datetime_str
+        self.read_result = read_result
+        self.error = error
+        self.target_ymd = target_ymd
+
+def plan_output(file_info: FileInfo, date_info: dict, time_offset_counters: defaultdict) -> OutputPlan:
+    """
+    원본 파일의 날짜를 읽어 메타데이터 기록 여부(PASS/SET)를 먼저 정합니다. 요약과 로그는 바꾸지 않습니다.
+    복사 결과는 원본과 내용이 같으므로 판정은 결과 파일에서 읽은 것과 같습니다.
+    """
+    if file_info.missing_tools:
+        return OutputPlan('unsupported') # 사전 확인에서 필요한 외부 도구가 없다고 표시됨: 복사(HEIC는 변환하지 않음)만 함
+    try:
+        processor = get_metadata_processor('.jpg' if file_info.extension in CONVERT_EXTENSIONS else file_info.extension)
+    except FileNotFoundError:
+        return OutputPlan('after') # 바이너리 없음: 기존 순서에서 같은 오류로 처리
+    if not date_info["found"]:
+        # 기존 _handle_metadata와 같이 지원하지 않는 형식으로 판정된 경우는 META_FAIL_UNSUPPORTED로 기록
+        return OutputPlan('unsupported' if date_info.get("reason") == "unsupported_format" else 'skip_no_date')
+    datetime_str, target_ymd = _target_datetime(date_info["ymd"], time_offset_counters[date_info["scope_key"]])
+    if processor is None:
+        return OutputPlan('unsupported')
+    if file_info.extension in CONVERT_EXTENSIONS:
+        if not processor.supports_bytes_source:
+            return OutputPlan('after')
+        if file_info.extension == '.heic':
+            return OutputPlan('decide', processor, datetime_str, target_ymd=target_ymd)
+        # 변환한 JPEG에는 EXIF가 없으므로 읽을 필요 없이 항상 기록 대상
+        return OutputPlan('set', processor, datetime_str)
+    try:
+        read_result = processor.read_metadata(str(file_info.absolute_path))
+    except ProcessingCancelled:
+        raise
+    except Exception as e:
+        return OutputPlan('read_failed', error=e)
+    if read_result and read_result.get("ymd") == target_ymd:
+        return OutputPlan('pass', read_result=read_result)
+    return OutputPlan('set', processor, datetime_str, read_result)
+
+def produce_planned(file_info: FileInfo, plan: OutputPlan, result_dir: Path, date_info: dict, time_offset_counters: defaultdict, summary: defaultdict, queue, name_prefix: str = "") -> tuple:
+    """
+    계획대로 결과 파일을 만듭니다. 요약 항목은 handle_conversion_or_copy 후 _handle_metadata를 실행한 것과 같습니다.
+    Returns:
+        tuple: (결과 파일 경로 또는 None(변환/복사 실패), 메타데이터 읽기 결과 또는 None)
+    """
+    if plan.metadata == 'after':
+        result_file_path = handle_conversion_or_copy(file_info, result_dir, summary, queue, name_prefix)
+        if not result_file_path:
+            return None, None
+        return result_file_path, _handle_metadata(result_file_path, date_info, time_offset_counters, summary, queue)
+    if plan.metadata in ('set', 'decide'):
+        return _produce_with_date(file_info, plan, result_dir, date_info, time_offset_counters, summary, queue, name_prefix)
+
+    result_file_path = handle_conversion_or_copy(file_info, result_dir, summary, queue, name_prefix)
+    if not result_file_path:
+        return None, None
+    name = result_file_path.name
+    if plan.metadata == 'skip_no_date':
+        queue.put(('log', f"  {get_log_message('META_SKIP_NO_DATE')} ({name})"))
+        summary['metadata_skipped_no_date'] += 1
+    elif plan.metadata == 'unsupported':
+        queue.put(('log', f"  {get_log_message('META_FAIL_UNSUPPORTED')} ({name})"))
+        summary['metadata_skipped_no_date'] += 1
+    elif plan.metadata == 'read_failed':
+        queue.put(('log', f"  {get_log_message('META_FAIL_READ')} ({name})"))
+        log_error_to_file(str(file_info.absolute_path), "METADATA_READ", plan.error)
+        summary['metadata_failed'] += 1
+    else:
+        queue.put(('log', f"  {get_log_message('META_PASS')} ({name})"))
+        summary['metadata_passed'] += 1
+    return result_file_path, plan.read_result
+
+def _produce_with_date(file_info: FileInfo, plan: OutputPlan, result_dir: Path, date_info: dict, time_offset_counters: defaultdict, summary: defaultdict, queue, name_prefix: str) -> tuple:
+    """
+    날짜를 넣으며 결과 파일을 한 번에 기록합니다. 기록에 실패하면 날짜 없이 결과 파일을 만들고 메타데이터 실패로 집계합니다.
+    'decide'이면 변환 결과를 먼저 읽어, 날짜가 이미 맞거나 읽지 못하면 날짜를 넣지 않고 그대로 기록합니다.
+    """
+    outcome = {"written": False, "error": None, "read_result": plan.read_result, "read_error": None, "passed": False}
+    if file_info.extension in CONVERT_EXTENSIONS:
+        def write(jpeg_bytes: bytes, destination_path):
+            if plan.metadata == 'decide':
+                try:
+                    outcome["read_result"] = plan.processor.read_metadata(jpeg_bytes)
+                except ProcessingCancelled:
+                    raise
+                except Exception as e:
+                    outcome["read_error"] = e
+                else:
+                    outcome["passed"] = bool(outcome["read_result"]) and outcome["read_result"].get("ymd") == plan.target_ymd
+            if not (outcome["read_error"] or outcome["passed"]):
+                try:
+                    outcome["written"] = plan.processor.write_metadata_to(jpeg_bytes, destination_path, plan.datetime_str)
+                except ProcessingCancelled:
+                    raise
+                except Exception as e:
+                    outcome["error"] = e
+            if not outcome["written"]:
+                with open(destination_path, 'wb') as f: # 날짜 없이 변환 결과만 기록
+                    f.write(jpeg_bytes)
+        result_file_path = handle_conversion_or_copy(file_info, result_dir, summary, queue, name_prefix, write=write)
+    else:
+        result_file_path = result_dir / (name_prefix + file_info.filename)
+        try:
+            outcome["written"] = plan.processor.write_metadata_to(file_info.absolute_path, result_file_path, plan.datetime_str)
+        except ProcessingCancelled:
+            raise
+        except Exception as e:
+            outcome["error"] = e
+        if outcome["written"]:
+            queue.put(('log', f"  원본 파일 복사: {file_info.filename} -> {result_file_path.name} (메타데이터 함께 기록)")) # DEV_GUIDE 6.2 COPY_TO_RESULT
+            summary['copied_files'] += 1
+        else:
+            if result_file_path.exists():
+                result_file_path.unlink()
+            result_file_path = handle_conversion_or_copy(file_info, result_dir, summary, queue, name_prefix)
+    if not result_file_path:
+        return None, None
+
+    if outcome["read_error"]:
+        queue.put(('log', f"  {get_log_message('META_FAIL_READ')} ({result_file_path.name})"))
+        log_error_to_file(str(result_file_path), "METADATA_READ", outcome["read_error"])
+        summary['metadata_failed'] += 1
+        return result_file_path, None
+    if outcome["passed"]:
+        queue.put(('log', f"  {get_log_message('META_PASS')} ({result_file_path.name})"))
+        summary['metadata_passed'] += 1
+    elif outcome["written"]:
+        queue.put(('log', f"  {get_log_message('META_SET', time=plan.datetime_str)} ({result_file_path.name})"))
+        summary['metadata_changed'] += 1
+        time_offset_counters[date_info["scope_key"]] += 1 # Increment offset for the next file in the same scope
+    else:
+        queue.put(('log', f"  {get_log_message('META_FAIL_WRITE')} ({result_file_path.name})"))
+        log_error_to_file(str(result_file_path), "METADATA_WRITE", outcome["error"] or Exception("Metadata write failed without specific exception."))
+        summary['metadata_failed'] += 1
+    return result_file_path, outcome["read_result"]
@@ -0,0 +1,87 @@
+# src/preflight.py
+from collections import defaultdict
+
+from .paths import check_binaries, probe_binary
+from .metadata.base import resolve_processor_entry
+from .logging_i18n import log_error_to_file
+
+# 메타데이터 프로세서 모듈 -> 필요한 외부 도구
+PROCESSOR_TOOLS = {
+    'video_ffmpeg': ('ffmpeg', 'ffprobe'),
+    'raw_exiftool': ('exiftool',),
+    'exiftool_unified': ('exiftool',),
+}
+# 변환이 필요한 확장자 -> (변환 도구, 변환 결과 확장자)
+CONVERSION_TOOLS = {
+    '.heic': (('magick',), '.jpg'),
+    '.png': ((), '.jpg'), # Pillow
+}
+
+def required_tools(extension: str) -> tuple:
+    """확장자의 파일을 처리(변환 + 결과 파일의 메타데이터)하는 데 필요한 외부 도구."""
+    conversion, target_extension = CONVERSION_TOOLS.get(extension, ((), extension))
+    entry = resolve_processor_entry(target_extension) # 통합 백엔드 선택(set_metadata_backend)을 반영
+    processor_tools = PROCESSOR_TOOLS.get(entry[0], ()) if entry else ()
+    return tuple(dict.fromkeys(conversion + processor_tools))
+
+class Preflight:
+    """
+    처리 시작 전 외부 도구 확인 결과. 도구마다 한 번만 버전 확인 명령을 실행하여 버전과 시작 지연을 잽니다.
+    도구가 없거나 실행되지 않으면 그 도구가 필요한 형식의 파일은 파일마다 실패(오류 로그 기록)하는 대신
+    처리 전에 한꺼번에 표시해 두고 메타데이터 보정만 건너뜁니다. (partition)
+    """
+    def __init__(self):
+        missing = set(check_binaries())
+        self.tools = {} # 도구 -> (버전 또는 None, 시작 지연(초))
+        for name in ('ffmpeg', 'ffprobe', 'exiftool', 'magick'):
+            self.tools[name] = (None, 0.0) if name in missing else probe_binary(name)
+
+    def unavailable(self, extension: str) -> tuple:
+        return tuple(tool for tool in required_tools(extension) if self.tools[tool][0] is None)
+
+    def partition(self, file_list: list) -> tuple:
+        """
+        파일 목록을 필요한 도구가 모두 있는 파일과 없는 파일로 나눕니다. 순서는 유지합니다.
+        Returns:
+            tuple: (도구가 모두 있는 파일 목록, {없는 도구 튜플: [파일]})
+        """
+        runnable, skipped = [], defaultdict(list)
+        by_extension = {}
+        for file_info in file_list:
+            if file_info.extension not in by_extension:
+                by_extension[file_info.extension] = self.unavailable(file_info.extension)
+            missing = by_extension[file_info.extension]
+            if missing:
+                skipped[missing].append(file_info)
+            else:
+                runnable.append(file_info)
+        return runnable, dict(skipped)
+
+    def describe(self) -> str:
+        return ", ".join(f"{name} {version} ({seconds * 1000:.0f} ms)" if version else f"{name} 없음"
+                         for name, (version, seconds) in self.tools.items())
+
+def apply_preflight(file_list: list, source_root, summary, queue) -> list:
+    """
+    외부 도구를 확인하고, 도구가 없는 형식의 파일에 없는 도구를 표시(file_info.missing_tools)한 파일 목록을 반환합니다.
+    표시된 파일도 결과 폴더로 복사하고 이름을 정하며, 메타데이터 보정만 지원하지 않는 형식(META_FAIL_UNSUPPORTED)으로 건너뜁니다.
+    변환 도구가 없으면 변환하지 않고 원본을 복사합니다. (HEIC)
+    건너뛴 파일은 요약의 metadata_skipped_missing_tool로 집계하고, 오류 로그에는 도구별 내역을 묶은 항목 하나만 남깁니다.
+    """
+    preflight = Preflight()
+    queue.put(('log', f"외부 도구 확인: {preflight.describe()}"))
+    _, skipped = preflight.partition(file_list)
+    if not skipped:
+        return file_list
+    details = []
+    for missing, files in skipped.items():
+        counts = defaultdict(int)
+        for file_info in files:
+            file_info.missing_tools = missing
+            counts[file_info.extension] += 1
+        formats = ", ".join(f"{extension} {count}개" for extension, count in sorted(counts.items()))
+        details.append(f"{', '.join(missing)} 없음: {formats}")
+        queue.put(('log', f"외부 도구({', '.join(missing)})가 없어 {len(files)}개 파일의 메타데이터 보정을 건너뜁니다 ({formats}). 예: {files[0].filename}"))
+        summary['metadata_skipped_missing_tool'] += len(files)
+    log_error_to_file(str(source_root), "PREFLIGHT", FileNotFoundError("필요한 외부 도구가 없어 메타데이터 보정을 건너뛰었습니다: " + "; ".join(details)))
+    return file_list
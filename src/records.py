@@ -0,0 +1,255 @@
+# src/records.py
+import os
+import sys
+import zlib
+import heapq
+import struct
+import argparse
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Union
+
+RECORDS_FILENAME = ".mdns_records.bin"
+RECORDS_MAGIC = b"MDNSREC1"
+# 행 그룹 하나에 모으는 레코드 수. 기록 시 메모리 사용량은 이 값에만 비례한다.
+ROW_GROUP_SIZE = 4096
+
+# 열 순서. 각 열은 행 그룹마다 따로 압축되어, 조회 시 필요한 열만 풀 수 있다.
+COLUMNS = ("source", "output", "actions", "elapsed_ms")
+_STRING_COLUMNS = {"source", "output"}
+# 행 그룹 헤더: 행 수 + 열별 압축 바이트 길이
+_GROUP_HEADER = struct.Struct("<I" + "I" * len(COLUMNS))
+
+# 파일별 처리 결과 코드 (비트 플래그). 이름은 DEV_GUIDE 6.2 이벤트 코드를 따른다.
+ACTION_CODES = (
+    "COPY_TO_RESULT", "CONVERT_TO_JPG", "CONVERT_FAIL",
+    "META_SET", "META_PASS", "META_SKIP_NO_DATE", "META_FAIL",
+    "NAME_PASS", "NAME_SET_UPPERCASE", "NAME_SET_HASH", "NAME_DUPLICATE_SUFFIX",
+    "DEDUP_REPORT", "DEDUP_SKIP", "DEDUP_HARDLINK", "RESUMED", "FAILED",
+)
+ACTION_BITS = {code: 1 << bit for bit, code in enumerate(ACTION_CODES)}
+
+# summary 키 -> 결과 코드. 파일 하나를 처리하는 동안 증가한 키로 그 파일의 결과를 판정한다.
+SUMMARY_ACTIONS = {
+    'copied_files': "COPY_TO_RESULT",
+    'converted_to_jpg': "CONVERT_TO_JPG",
+    'conversion_failed': "CONVERT_FAIL",
+    'metadata_changed': "META_SET",
+    'metadata_passed': "META_PASS",
+    'metadata_skipped_no_date': "META_SKIP_NO_DATE",
+    'metadata_failed': "META_FAIL",
+    'NAME_PASS': "NAME_PASS",
+    'NAME_SET_UPPERCASE': "NAME_SET_UPPERCASE",
+    'NAME_SET_HASH': "NAME_SET_HASH",
+    'NAME_DUPLICATE_SUFFIX': "NAME_DUPLICATE_SUFFIX",
+    'duplicate_reported': "DEDUP_REPORT",
+    'duplicate_skipped': "DEDUP_SKIP",
+    'duplicate_hardlinked': "DEDUP_HARDLINK",
+    'resumed_skipped': "RESUMED",
+    'failed_files': "FAILED",
+}
+
+def actions_from_summary(before: dict, after: dict) -> int:
+    """파일 처리 전후의 summary를 비교하여 결과 코드 비트마스크를 만듭니다."""
+    mask = 0
+    for key, code in SUMMARY_ACTIONS.items():
+        if after.get(key, 0) > before.get(key, 0):
+            mask |= ACTION_BITS[code]
+    return mask
+
+def describe_actions(mask: int) -> list:
+    return [code for code in ACTION_CODES if mask & ACTION_BITS[code]]
+
+def _encode_strings(values: list) -> bytes:
+    encoded = [v.encode('utf-8') for v in values]
+    lengths = array('I', (len(v) for v in encoded))
+    return lengths.tobytes() + b"".join(encoded)
+
+def _decode_strings(payload: bytes, count: int) -> list:
+    lengths = array('I')
+    lengths.frombytes(payload[:count * lengths.itemsize])
+    values, position = [], count * lengths.itemsize
+    for length in lengths:
+        values.append(payload[position:position + length].decode('utf-8'))
+        position += length
+    return values
+
+def _decode_ints(payload: bytes) -> array:
+    values = array('I')
+    values.frombytes(payload)
+    return values
+
+def _scan_groups(f, file_size: int):
+    """(행 수, 열별 (위치, 길이), 그룹 끝 위치)를 차례로 반환합니다. 끊긴 마지막 그룹에서 멈춥니다."""
+    if f.read(len(RECORDS_MAGIC)) != RECORDS_MAGIC:
+        return
+    while True:
+        header = f.read(_GROUP_HEADER.size)
+        if len(header) < _GROUP_HEADER.size:
+            return
+        count, *lengths = _GROUP_HEADER.unpack(header)
+        position = f.tell()
+        if position + sum(lengths) > file_size:
+            return
+        extents = {}
+        for name, length in zip(COLUMNS, lengths):
+            extents[name] = (position, length)
+            position += length
+        f.seek(position)
+        yield count, extents, position
+
+def _valid_end(path) -> int:
+    """마지막 온전한 행 그룹의 끝 위치. 파일 헤더가 올바르지 않으면 0."""
+    with open(path, 'rb') as f:
+        valid_end = len(RECORDS_MAGIC)
+        for _, _, valid_end in _scan_groups(f, os.fstat(f.fileno()).st_size):
+            pass
+        f.seek(0)
+        return valid_end if f.read(len(RECORDS_MAGIC)) == RECORDS_MAGIC else 0
+
+class RecordWriter:
+    """
+    파일별 처리 결과 레코드를 결과 루트의 .mdns_records.bin에 추가 기록합니다.
+    레코드는 ROW_GROUP_SIZE개씩 열 단위로 모아 압축한 뒤 기록하므로,
+    처리 파일 수와 관계없이 메모리 사용량이 일정합니다.
+    """
+    def __init__(self, result_root, resume: bool = False, row_group_size: int = ROW_GROUP_SIZE, filename: str = RECORDS_FILENAME):
+        self.result_root = Path(result_root)
+        self.path = self.result_root / filename
+        self.row_group_size = row_group_size
+        self._prefix = str(self.result_root) + os.sep
+        self._rows = {name: [] for name in COLUMNS}
+        os.makedirs(self.result_root, exist_ok=True)
+        valid_end = _valid_end(self.path) if resume and self.path.exists() else 0
+        if valid_end:
+            self._file = open(self.path, 'r+b')
+            self._file.truncate(valid_end) # 기록 도중 끊긴 행 그룹 제거 후 이어서 기록
+            self._file.seek(valid_end)
+        else:
+            self._file = open(self.path, 'wb')
+            self._file.write(RECORDS_MAGIC)
+
+    def append(self, source: str, output: Union[str, None], actions: int, elapsed_ms: int):
+        """레코드 하나를 추가합니다. output은 결과 루트 기준 상대 경로로 저장됩니다."""
+        if output:
+            output = str(output)
+            if output.startswith(self._prefix):
+                output = output[len(self._prefix):].replace(os.sep, '/')
+            else:
+                output = Path(os.path.relpath(output, self.result_root)).as_posix()
+        self._rows["source"].append(source)
+        self._rows["output"].append(output or "")
+        self._rows["actions"].append(actions)
+        self._rows["elapsed_ms"].append(min(int(elapsed_ms), 0xFFFFFFFF))
+        if len(self._rows["source"]) >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        count = len(self._rows["source"])
+        if not count:
+            return
+        blocks = []
+        for name in COLUMNS:
+            values = self._rows[name]
+            raw = _encode_strings(values) if name in _STRING_COLUMNS else array('I', values).tobytes()
+            blocks.append(zlib.compress(raw, 1))
+        self._file.write(_GROUP_HEADER.pack(count, *(len(b) for b in blocks)) + b"".join(blocks))
+        self._file.flush()
+        self._rows = {name: [] for name in COLUMNS}
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+def _read_column(f, extents: dict, name: str, count: int):
+    position, length = extents[name]
+    f.seek(position)
+    payload = zlib.decompress(f.read(length))
+    return _decode_strings(payload, count) if name in _STRING_COLUMNS else _decode_ints(payload)
+
+def iter_row_groups(path, columns=COLUMNS):
+    """
+    행 그룹마다 요청한 열만 풀어서 {열 이름: 값 목록}을 반환합니다.
+    문자열 열을 풀지 않으면 집계가 매우 빠릅니다.
+    """
+    with open(path, 'rb') as f:
+        file_size = os.fstat(f.fileno()).st_size
+        for count, extents, end in _scan_groups(f, file_size):
+            group = {name: _read_column(f, extents, name, count) for name in columns}
+            f.seek(end)
+            yield group
+
+def aggregate(path, top: int = 10) -> dict:
+    """결과 코드별 파일 수, 소요 시간 합계/최대값, 가장 오래 걸린 파일 top개를 집계합니다."""
+    mask_counts = Counter()
+    files = total_ms = max_ms = 0
+    slowest = [] # (elapsed_ms, source) 최소 힙
+    with open(path, 'rb') as f:
+        file_size = os.fstat(f.fileno()).st_size
+        for count, extents, end in _scan_groups(f, file_size):
+            actions = _read_column(f, extents, "actions", count)
+            elapsed = _read_column(f, extents, "elapsed_ms", count)
+            files += count
+            total_ms += sum(elapsed)
+            max_ms = max(max_ms, max(elapsed))
+            mask_counts.update(actions) # 서로 다른 비트마스크 조합은 몇 개뿐이므로 먼저 센다
+            # 상위 목록에 들어갈 행이 있는 그룹만 source 열을 푼다
+            threshold = slowest[0][0] if len(slowest) >= top else -1
+            if top and max(elapsed) > threshold:
+                sources = _read_column(f, extents, "source", count)
+                for ms, source in zip(elapsed, sources):
+                    if len(slowest) < top:
+                        heapq.heappush(slowest, (ms, source))
+                    elif ms > slowest[0][0]:
+                        heapq.heapreplace(slowest, (ms, source))
+            f.seek(end)
+    counts = Counter()
+    for mask, n in mask_counts.items():
+        for code in describe_actions(mask):
+            counts[code] += n
+    return {
+        "files": files, "actions": counts, "total_ms": total_ms, "max_ms": max_ms,
+        "slowest": sorted(slowest, reverse=True),
+    }
+
+def find_records(path, text: str = "", action: Union[str, None] = None):
+    """source 또는 output에 text가 포함되고 (선택) 결과 코드가 action인 레코드를 반환합니다."""
+    bit = ACTION_BITS[action] if action else 0
+    for group in iter_row_groups(path):
+        for source, output, mask, ms in zip(group["source"], group["output"], group["actions"], group["elapsed_ms"]):
+            if bit and not mask & bit:
+                continue
+            if text and text not in source and text not in output:
+                continue
+            yield source, output, describe_actions(mask), ms
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MDNS 파일별 처리 결과 레코드 조회/집계")
+    parser.add_argument("result_root", help="결과 폴더 또는 .mdns_records.bin 경로")
+    parser.add_argument("--find", default=None, help="소스/결과 경로에 포함된 문자열로 검색")
+    parser.add_argument("--action", default=None, choices=ACTION_CODES, help="결과 코드로 필터")
+    parser.add_argument("--top", type=int, default=10, help="가장 오래 걸린 파일 수")
+    args = parser.parse_args(argv)
+
+    path = Path(args.result_root)
+    if path.is_dir():
+        path = path / RECORDS_FILENAME
+    if args.find is not None or args.action:
+        for source, output, actions, ms in find_records(path, args.find or "", args.action):
+            print(f"{source} -> {output or '(결과 없음)'} [{', '.join(actions)}] {ms}ms")
+        return
+
+    report = aggregate(path, top=args.top)
+    print(f"총 레코드: {report['files']}개, 총 소요 시간 {report['total_ms'] / 1000:.1f}초 (최대 {report['max_ms']}ms)")
+    for code in ACTION_CODES:
+        if report["actions"][code]:
+            print(f"  {code}: {report['actions'][code]}")
+    if report["slowest"]:
+        print(f"가장 오래 걸린 파일 {len(report['slowest'])}개:")
+        for ms, source in report["slowest"]:
+            print(f"  {ms}ms  {source}")
+
+if __name__ == "__main__":
+    sys.exit(main())
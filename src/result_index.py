@@ -0,0 +1,166 @@
+# src/result_index.py
+import os
+import sys
+import mmap
+import struct
+import hashlib
+import argparse
+from array import array
+from pathlib import Path
+from typing import Union
+
+from .records import RECORDS_FILENAME, iter_row_groups
+
+INDEX_FILENAME = ".mdns_index.bin"
+INDEX_MAGIC = b"MDNSIDX1"
+# 파일 헤더: 매직 + 항목 수 + 정방향(소스 -> 결과) 표 위치 + 역방향(결과 -> 소스) 표 위치
+_HEADER = struct.Struct("<8sQQQ")
+# 표 항목: 경로 해시 + 문자열 영역의 항목 위치. 해시 순으로 정렬되어 이진 탐색한다.
+_SLOT = struct.Struct("<QQ")
+_LENGTH = struct.Struct("<I")
+
+def path_hash(path: str) -> int:
+    """경로 문자열의 64비트 해시. 해시가 겹치는 항목은 조회 시 경로를 직접 비교하여 가립니다."""
+    return int.from_bytes(hashlib.blake2b(path.encode('utf-8'), digest_size=8).digest(), 'little')
+
+def _normalize_output(output: str) -> str:
+    return output.replace(os.sep, '/').lstrip('/')
+
+def build_index(result_root, records_filename: str = RECORDS_FILENAME, filename: str = INDEX_FILENAME) -> int:
+    """
+    결과 레코드(.mdns_records.bin)에서 소스 경로 <-> 결과 경로 인덱스를 만듭니다. 기록한 항목 수를 반환합니다.
+    - 문자열 영역: 항목마다 (길이, 소스 경로, 길이, 결과 경로). 결과 경로는 결과 루트 기준 상대 경로.
+    - 정방향/역방향 표: (경로 해시, 항목 위치)를 해시 순으로 정렬한 고정 길이 배열.
+    문자열은 읽는 대로 파일에 쓰고, 메모리에는 항목당 해시와 위치만 둡니다.
+    결과 파일이 없는 레코드(실패, 중복 건너뜀)는 넣지 않습니다.
+    """
+    result_root = Path(result_root)
+    path = result_root / filename
+    temp_path = path.with_name(path.name + ".tmp")
+    offsets, source_hashes, output_hashes = array('Q'), array('Q'), array('Q')
+    with open(temp_path, 'wb') as f:
+        f.write(_HEADER.pack(INDEX_MAGIC, 0, 0, 0))
+        records_path = result_root / records_filename
+        groups = iter_row_groups(records_path, ("source", "output")) if records_path.exists() else ()
+        for group in groups:
+            for source, output in zip(group["source"], group["output"]):
+                if not output:
+                    continue
+                offsets.append(f.tell())
+                source_hashes.append(path_hash(source))
+                output_hashes.append(path_hash(output))
+                source_bytes, output_bytes = source.encode('utf-8'), output.encode('utf-8')
+                f.write(_LENGTH.pack(len(source_bytes)) + source_bytes + _LENGTH.pack(len(output_bytes)) + output_bytes)
+        tables = []
+        for hashes in (source_hashes, output_hashes):
+            tables.append(f.tell())
+            # 같은 해시(같은 경로가 재개로 다시 기록된 경우 등)는 기록 순서를 유지
+            for i in sorted(range(len(offsets)), key=lambda i: (hashes[i], offsets[i])):
+                f.write(_SLOT.pack(hashes[i], offsets[i]))
+        f.seek(0)
+        f.write(_HEADER.pack(INDEX_MAGIC, len(offsets), *tables))
+    os.replace(temp_path, path)
+    return len(offsets)
+
+class ResultIndex:
+    """
+    메모리 매핑한 결과 인덱스. 열 때 헤더만 읽으므로 항목 수와 관계없이 바로 열리고,
+    조회는 표를 이진 탐색하므로 O(log n)입니다.
+    with 문으로 사용하거나 close()를 호출합니다.
+    """
+    def __init__(self, path):
+        path = Path(path)
+        if path.is_dir():
+            path = path / INDEX_FILENAME
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError: # 빈 파일
+            self._file.close()
+            raise ValueError(f"Invalid result index: {path}")
+        magic, self.count, self._forward, self._reverse = _HEADER.unpack_from(self._map, 0)
+        if magic != INDEX_MAGIC:
+            self.close()
+            raise ValueError(f"Invalid result index: {path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        if not self._file.closed:
+            self._map.close()
+            self._file.close()
+
+    def _entry(self, offset: int) -> tuple:
+        length, = _LENGTH.unpack_from(self._map, offset)
+        offset += _LENGTH.size
+        source = self._map[offset:offset + length].decode('utf-8')
+        offset += length
+        length, = _LENGTH.unpack_from(self._map, offset)
+        offset += _LENGTH.size
+        return source, self._map[offset:offset + length].decode('utf-8')
+
+    def _matches(self, table: int, key: str, field: int) -> list:
+        """표에서 key의 해시와 같은 슬롯을 이진 탐색으로 찾고, 경로가 일치하는 항목을 기록 순서대로 반환합니다."""
+        target = path_hash(key)
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if _SLOT.unpack_from(self._map, table + middle * _SLOT.size)[0] < target:
+                low = middle + 1
+            else:
+                high = middle
+        entries = []
+        while low < self.count:
+            slot_hash, offset = _SLOT.unpack_from(self._map, table + low * _SLOT.size)
+            if slot_hash != target:
+                break
+            entry = self._entry(offset)
+            if entry[field] == key:
+                entries.append(entry)
+            low += 1
+        return entries
+
+    def output_for(self, source: str) -> Union[str, None]:
+        """소스 경로(소스 루트 기준 상대 경로, 저널 키)의 결과 경로. 여러 번 기록되었으면 마지막 기록."""
+        entries = self._matches(self._forward, source, 0)
+        return entries[-1][1] if entries else None
+
+    def sources_for(self, output: str) -> list:
+        """결과 경로(결과 루트 기준 상대 경로)를 만든 소스 경로 목록. 하드링크 중복은 여러 개일 수 있습니다."""
+        entries = self._matches(self._reverse, _normalize_output(output), 1)
+        return list(dict.fromkeys(source for source, _ in entries))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MDNS 결과 인덱스: 소스 경로 <-> 결과 파일 조회")
+    parser.add_argument("result_root", help="결과 폴더")
+    parser.add_argument("--source", action="append", default=[], help="결과 파일을 찾을 소스 경로 (소스 루트 기준 상대 경로)")
+    parser.add_argument("--output", action="append", default=[], help="소스를 찾을 결과 경로 (결과 루트 기준 상대 경로 또는 절대 경로)")
+    parser.add_argument("--build", action="store_true", help="결과 레코드에서 인덱스를 다시 만듦")
+    args = parser.parse_args(argv)
+
+    result_root = Path(args.result_root)
+    if args.build or not (result_root / INDEX_FILENAME).exists():
+        print(f"인덱스 생성: {build_index(result_root)}개 항목")
+    exit_code = 0
+    with ResultIndex(result_root) as index:
+        for source in args.source:
+            output = index.output_for(Path(source).as_posix())
+            print(f"{source} -> {output or '(없음)'}")
+            exit_code |= output is None
+        for output in args.output:
+            if os.path.isabs(output):
+                output = os.path.relpath(output, result_root)
+            sources = index.sources_for(output)
+            print(f"{output} <- {', '.join(sources) or '(없음)'}")
+            exit_code |= not sources
+    return int(exit_code)
+
+if __name__ == "__main__":
+    sys.exit(main())
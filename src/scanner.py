@@ -1,7 +1,10 @@
 # src/scanner.py
 import os
 import hashlib
+import mmap
 from pathlib import Path
+from typing import Union
+
 SUPPORTED_EXTENSIONS = {
     # 이미지
     '.jpg', '.jpeg', '.png', '.heic', '.cr3',
@@ -9,46 +12,156 @@ SUPPORTED_EXTENSIONS = {
     '.mp4', '.mov', '.avi'
 }
 
+# 출력 루트를 따로 지정하지 않았을 때 소스 루트 아래에 만드는 결과 폴더 이름
+RESULT_DIRNAME = "result"
+
+def get_result_root(source_root, output_root=None) -> Path:
+    """결과물 루트 경로를 반환합니다. output_root가 없으면 [Source]/result."""
+    if output_root:
+        return Path(output_root)
+    return Path(source_root) / RESULT_DIRNAME
+
 class FileInfo:
     """파일 정보를 담는 데이터 클래스"""
-    def __init__(self, absolute_path, source_root):
+    def __init__(self, absolute_path, source_root, result_root=None):
         self.absolute_path = Path(absolute_path)
         self.source_root = Path(source_root)
+        self.result_root = get_result_root(source_root, result_root)
         self.filename = self.absolute_path.name
         # TODO: (TASK-03-03) 결정적 정렬을 위해 relative_path를 pathlib.Path 객체로 저장
         self.relative_path = self.absolute_path.relative_to(self.source_root).parent
         self.extension = self.absolute_path.suffix.lower()
+        # 사전 확인(apply_preflight)에서 찾지 못한 필요 외부 도구. 있으면 메타데이터 보정을 건너뜀
+        self.missing_tools = ()
 
     # TODO: (v0.2) 해시 계산을 위한 속성 추가
     # self.content_hash_or_original = None
 
-def scan_files(source_root):
+def scan_files(source_root, output_root=None):
     """
     주어진 소스 루트에서 지원하는 확장자를 가진 모든 파일을 재귀적으로 찾습니다.
+    결과물 루트가 소스 루트 안에 있으면(기본값 [Source]/result) 그 아래는 탐색하지 않습니다.
     """
     # DTL TASK-01-03: 파일 스캔 로직 구현 완료
     # FileInfo 객체 리스트를 반환하며, 각 파일에 대한 절대 경로와 상대 경로를 포함합니다.
+    result_root = os.path.realpath(get_result_root(source_root, output_root))
     file_list = []
-    for root, _, files in os.walk(source_root):
+    for root, dirs, files in os.walk(source_root):
+        # 이전 실행의 결과물을 다시 입력으로 처리하지 않도록 결과 폴더는 건너뜀
+        dirs[:] = [d for d in dirs if os.path.realpath(os.path.join(root, d)) != result_root]
         for file in files:
             if Path(file).suffix.lower() in SUPPORTED_EXTENSIONS:
                 abs_path = os.path.join(root, file)
-                file_list.append(FileInfo(abs_path, source_root))
+                file_list.append(FileInfo(abs_path, source_root, output_root))
     return file_list
 
-def calculate_md5(file_path: Path, chunk_size: int = 8192) -> str:
+# 해시 계산용 기본 버퍼 크기 (1 MiB). 대용량 동영상에서 read 호출 횟수를 줄인다.
+DEFAULT_HASH_CHUNK_SIZE = 1024 * 1024
+# 이 크기 이상인 파일은 mmap으로 해시한다 (페이지 캐시에서 직접 읽어 복사를 줄임).
+MMAP_HASH_THRESHOLD = 64 * 1024 * 1024
+
+def _advise_sequential(fd: int, length: int = 0) -> None:
+    """가능한 플랫폼에서 커널에 순차 읽기 힌트(posix_fadvise)를 준다."""
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(fd, 0, length, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass # 힌트는 선택 사항이므로 실패해도 무시
+
+def calculate_md5(file_path: Path, chunk_size: int = DEFAULT_HASH_CHUNK_SIZE, use_mmap: Union[bool, None] = None) -> str:
     """
     파일의 MD5 해시를 계산합니다. 대용량 파일 처리를 위해 스트리밍 방식을 사용합니다.
-    
+
+    재사용되는 bytearray/memoryview 버퍼에 readinto로 읽어 청크마다 새 bytes 객체를
+    만들지 않으며, 큰 파일은 mmap으로 처리합니다. hashlib은 큰 버퍼를 갱신하는 동안
+    GIL을 해제하므로 여러 스레드에서 동시에 해시를 계산할 수 있습니다.
+
     Args:
         file_path (Path): 해시를 계산할 파일의 경로.
         chunk_size (int): 파일을 읽을 청크 크기 (바이트).
-        
+        use_mmap (bool | None): mmap 사용 여부. None이면 파일 크기로 자동 결정.
+
     Returns:
         str: 파일의 MD5 해시 문자열.
     """
     hasher = hashlib.md5()
-    with open(file_path, 'rb') as f:
-        for chunk in iter(lambda: f.read(chunk_size), b''):
-            hasher.update(chunk)
+    with open(file_path, 'rb', buffering=0) as f:
+        file_size = os.fstat(f.fileno()).st_size
+        _advise_sequential(f.fileno(), file_size)
+
+        if use_mmap is None:
+            use_mmap = file_size >= MMAP_HASH_THRESHOLD
+        if use_mmap and file_size > 0:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    view = memoryview(mapped)
+                    try:
+                        for offset in range(0, file_size, chunk_size):
+                            hasher.update(view[offset:offset + chunk_size])
+                    finally:
+                        view.release()
+                return hasher.hexdigest()
+            except (OSError, ValueError):
+                # mmap을 지원하지 않는 파일 시스템(일부 네트워크 드라이브 등)은 readinto로 대체
+                hasher = hashlib.md5()
+                f.seek(0)
+
+        buffer = bytearray(chunk_size)
+        view = memoryview(buffer)
+        try:
+            while True:
+                read_size = f.readinto(buffer)
+                if not read_size:
+                    break
+                hasher.update(view[:read_size])
+        finally:
+            view.release()
+    return hasher.hexdigest()
+
+# 파일명 해시(IMG_<HASH5>) 방식. 결과 루트의 실행 매니페스트에 기록된다.
+# - md5: 파일 전체의 MD5
+# - sampled-v1: SAMPLED_HASH_MIN_SIZE 미만은 md5와 같고, 그 이상은 크기 + 앞/뒤 블록 + 균등 간격 블록의 MD5.
+#   아래 상수는 방식의 일부이므로 바꾸려면 새 버전(sampled-v2)을 추가해야 한다.
+HASH_SCHEMES = ("md5", "sampled-v1")
+SAMPLED_HASH_MIN_SIZE = 64 * 1024 * 1024
+SAMPLED_HASH_BLOCK_SIZE = 1024 * 1024
+SAMPLED_HASH_MIDDLE_BLOCKS = 16
+
+def calculate_sampled_hash(file_path: Path) -> str:
+    """
+    대용량 파일용 표본 해시 (sampled-v1).
+    파일 크기와 앞/뒤 블록, 그 사이에 균등 간격으로 고른 블록만 읽으므로
+    20 GB 동영상도 18 MiB만 읽습니다. 표본 밖의 내용만 다른 파일은 같은 값이 되므로
+    내용 동일성 판정(중복 탐지)에는 쓰지 않고 파일명에만 사용합니다.
+    """
+    block = SAMPLED_HASH_BLOCK_SIZE
+    with open(file_path, 'rb', buffering=0) as f:
+        file_size = os.fstat(f.fileno()).st_size
+        if file_size < SAMPLED_HASH_MIN_SIZE:
+            return calculate_md5(file_path)
+        hasher = hashlib.md5(b"mdns-sampled-v1")
+        hasher.update(file_size.to_bytes(8, 'little'))
+        span = file_size - block
+        offsets = [span * k // (SAMPLED_HASH_MIDDLE_BLOCKS + 1) for k in range(SAMPLED_HASH_MIDDLE_BLOCKS + 2)]
+        buffer = bytearray(block)
+        view = memoryview(buffer)
+        try:
+            for offset in offsets: # 0은 앞 블록, span은 뒤 블록
+                f.seek(offset)
+                read_size = f.readinto(buffer)
+                hasher.update(view[:read_size])
+        finally:
+            view.release()
     return hasher.hexdigest()
+
+def calculate_content_hash(file_path: Path, scheme: str = "md5") -> str:
+    """파일명 해시 방식(HASH_SCHEMES)에 따라 결과 파일의 해시를 계산합니다."""
+    if scheme == "md5":
+        return calculate_md5(file_path)
+    if scheme == "sampled-v1":
+        return calculate_sampled_hash(file_path)
+    raise ValueError(f"Unknown naming hash scheme: {scheme}")
+
+def hash_log_message(scheme: str, content_hash: str) -> str:
+    label = "MD5" if scheme == "md5" else scheme
+    return f"  파일 콘텐츠 {label} 해시 계산 완료: {content_hash[:5]}..."
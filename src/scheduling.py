@@ -0,0 +1,102 @@
+# src/scheduling.py
+import os
+import time
+from typing import Union
+
+# 형식별 처리 비용 추정치: (파일당 고정 비용(초), 바이트당 비용 배수)
+# 배수는 단순 복사(1.0)를 기준으로 한 상대값이다.
+# - 동영상: 복사 + ffmpeg 재기록(remux)으로 전체를 두 번 쓴다
+# - HEIC/PNG: 디코딩 + JPG 인코딩이 CPU를 많이 쓴다
+# - CR3: 복사 + ExifTool 재기록, 프로세스 실행 비용이 크다
+TYPE_COSTS = {
+    '.mp4': (0.2, 2.0),
+    '.mov': (0.2, 2.0),
+    '.heic': (0.1, 8.0),
+    '.png': (0.05, 4.0),
+    '.cr3': (0.2, 2.0),
+    '.jpg': (0.01, 1.0),
+    '.jpeg': (0.01, 1.0),
+}
+DEFAULT_TYPE_COST = (0.01, 1.0)
+# 바이트당 비용을 초로 환산하는 기준 처리 속도 (단순 복사 100MB/s)
+BASELINE_BYTES_PER_SECOND = 100 * 1024 * 1024
+
+def file_sizes(file_list: list) -> list:
+    """파일 목록의 크기(바이트). 읽을 수 없는 파일은 0."""
+    sizes = []
+    for file_info in file_list:
+        try:
+            sizes.append(os.stat(file_info.absolute_path).st_size)
+        except OSError:
+            sizes.append(0)
+    return sizes
+
+def estimate_cost(extension: str, size: int) -> float:
+    """파일 하나의 예상 처리 시간(초)."""
+    fixed, per_byte = TYPE_COSTS.get(extension, DEFAULT_TYPE_COST)
+    return fixed + per_byte * size / BASELINE_BYTES_PER_SECOND
+
+def order_by_cost(file_list: list, sizes: list, scope_keys: Union[list, None] = None) -> list:
+    """
+    예상 비용이 큰 파일부터 처리하는 작업 순서(파일 목록의 인덱스)를 반환합니다.
+    오래 걸리는 파일을 먼저 시작해야 마지막에 큰 파일 하나만 남아 전체가 늦게 끝나는 일이 줄어듭니다.
+
+    같은 날짜 스코프의 메타데이터 단계는 정렬 순서대로 실행되므로(시간 오프셋 결정성),
+    큰 파일 앞에 있는 같은 스코프의 파일은 그 큰 파일의 우선순위를 물려받아 함께 먼저 시작됩니다.
+    우선순위가 같으면 정렬 순서를 유지하므로 순서 자체도 결정적입니다.
+    """
+    priority = [estimate_cost(f.extension, size) for f, size in zip(file_list, sizes)]
+    if scope_keys is not None:
+        highest_after = {} # 스코프 -> 뒤쪽 파일들의 최대 비용
+        for i in reversed(range(len(file_list))):
+            scope_key = scope_keys[i]
+            if scope_key is not None:
+                priority[i] = max(priority[i], highest_after.get(scope_key, 0.0))
+                highest_after[scope_key] = priority[i]
+    return sorted(range(len(file_list)), key=lambda i: (-priority[i], i))
+
+def format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}시간 {seconds % 3600 // 60}분"
+    if seconds >= 60:
+        return f"{seconds // 60}분 {seconds % 60}초"
+    return f"{seconds}초"
+
+class ByteProgress:
+    """
+    처리한 바이트 기준 진행률과 남은 시간(ETA)을 계산합니다.
+    파일 수 기준 진행률은 큰 동영상 하나가 남아 있어도 거의 끝난 것처럼 보이므로 바이트를 기준으로 합니다.
+    """
+    def __init__(self, total_files: int, total_bytes: int, clock=time.monotonic):
+        self.total_files = total_files
+        self.total_bytes = total_bytes
+        self.done_files = 0
+        self.done_bytes = 0
+        self._clock = clock
+        self._started = clock()
+
+    def add(self, size: int) -> tuple:
+        """파일 하나의 완료를 반영하고 GUI 진행률 이벤트 인자 (진행률, 표시 문자열)를 반환합니다."""
+        self.done_files += 1
+        self.done_bytes += size
+        return self.percent, self.text()
+
+    @property
+    def percent(self) -> float:
+        if self.total_bytes:
+            return self.done_bytes / self.total_bytes * 100
+        return self.done_files / self.total_files * 100 if self.total_files else 100.0
+
+    def eta_seconds(self) -> Union[float, None]:
+        elapsed = self._clock() - self._started
+        if not self.done_bytes or elapsed <= 0:
+            return None
+        return (self.total_bytes - self.done_bytes) / (self.done_bytes / elapsed)
+
+    def text(self) -> str:
+        gb = 1024 ** 3
+        eta = self.eta_seconds()
+        remaining = f"남은 시간 약 {format_duration(eta)}" if eta is not None else "남은 시간 계산 중"
+        return (f"{self.done_files}/{self.total_files}개, {self.done_bytes / gb:.2f}/{self.total_bytes / gb:.2f} GB "
+                f"({self.percent:.2f}%), {remaining}")
@@ -0,0 +1,83 @@
+# src/scope_parallel.py
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from .sharding import partition_key
+from .scheduling import file_sizes, estimate_cost
+from .summary import new_summary
+from .context import merge_counters
+from .errors import ProcessingCancelled
+from .control import in_current_context
+
+def group_by_scope(file_list: list) -> list:
+    """
+    정렬된 파일 목록을 날짜 스코프(스코프가 없으면 디렉토리) 단위로 나눕니다. 각 묶음 안의 순서는 유지됩니다.
+    한 디렉토리는 한 스코프에만 속하므로 묶음끼리는 시간 오프셋 카운터도, 결과 디렉토리도 겹치지 않습니다.
+    Returns:
+        list: 예상 비용이 큰 순서의 [파일 목록]. (오래 걸리는 스코프를 먼저 시작)
+    """
+    groups, costs = {}, defaultdict(float)
+    for file_info, size in zip(file_list, file_sizes(file_list)):
+        key = partition_key(file_info)
+        groups.setdefault(key, []).append(file_info)
+        costs[key] += estimate_cost(file_info.extension, size)
+    order = {key: position for position, key in enumerate(groups)}
+    return [groups[key] for key in sorted(groups, key=lambda k: (-costs[k], order[k]))]
+
+class _ScopeQueue:
+    """스코프 작업의 이벤트를 GUI 큐로 전달합니다. 스코프별 진행률은 전체 진행률로 바꿉니다."""
+    def __init__(self, queue, progress: dict, lock: threading.Lock):
+        self.queue = queue
+        self._progress = progress
+        self._lock = lock
+
+    def put(self, event):
+        if event[0] != 'progress':
+            self.queue.put(event)
+            return
+        with self._lock:
+            self._progress["done"] += 1
+            done, total = self._progress["done"], self._progress["total"]
+        self.queue.put(('progress', done / total * 100, f"{done}/{total} ({done / total * 100:.2f}%)"))
+
+class _LockedRecords:
+    """여러 스코프 작업이 공유하는 RecordWriter. 레코드의 순서는 완료 순서입니다."""
+    def __init__(self, records):
+        self._records = records
+        self._lock = threading.Lock()
+
+    def append(self, *args):
+        with self._lock:
+            self._records.append(*args)
+
+def run_scopes(file_list: list, workers: int, journal, keeper_outputs: dict, time_offset_counters: defaultdict, summary: defaultdict, queue, control,
+               thumbnail_cache=None, records=None, naming_hash: str = "md5"):
+    """
+    날짜 스코프 단위로 나눈 파일을 스레드 workers개에서 동시에 처리합니다. (process_files(scope_workers=...))
+    스코프 하나는 한 작업이 순차 파이프라인(_run_pipeline)으로 처리하므로, 스코프 안의 처리 순서와
+    09:00:00+N 시간 오프셋, 디렉토리별 파일명 결정은 순차 실행과 같습니다.
+    오프셋 카운터는 스코프별 키로만 접근하므로 작업 간에 공유해도 겹치지 않으며, 재개 시 저널에서 복원한 값에서 이어집니다.
+    요약은 작업별로 모은 뒤 합칩니다. 한 작업이 취소되면 나머지 작업도 다음 확인 지점에서 멈추고 ProcessingCancelled가 전파됩니다.
+    """
+    from .orchestrator import _run_pipeline # orchestrator가 이 모듈을 임포트함
+    scopes = group_by_scope(file_list)
+    queue.put(('log', f"스코프 병렬 처리: 스코프 {len(scopes)}개, 작업 스레드 {workers}개"))
+    progress = {"done": 0, "total": max(len(file_list), 1)}
+    scope_queue = _ScopeQueue(queue, progress, threading.Lock())
+    shared_records = _LockedRecords(records) if records else None
+    scope_summaries = [new_summary() for _ in scopes]
+
+    def run_scope(files, scope_summary):
+        if control.is_cancelled:
+            raise ProcessingCancelled("작업이 사용자에 의해 취소되었습니다.")
+        _run_pipeline(files, journal, {}, keeper_outputs, None, time_offset_counters, scope_summary, scope_queue, control, thumbnail_cache, shared_records, naming_hash)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(in_current_context(run_scope), files, scope_summary) for files, scope_summary in zip(scopes, scope_summaries)]
+        errors = [future.exception() for future in futures] # 모든 작업이 끝날 때까지 대기
+    for scope_summary in scope_summaries:
+        merge_counters(summary, scope_summary)
+    for error in errors:
+        if error is not None:
+            raise error
@@ -0,0 +1,223 @@
+# src/sharding.py
+import os
+import sys
+import json
+import queue as queue_module
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from .scanner import get_result_root, HASH_SCHEMES
+from .date_resolver import resolve_date
+from .scheduling import file_sizes, estimate_cost
+from .summary import new_summary, create_summary_report
+from .context import merge_counters
+from .errors import FileOperationError
+from .journal import JOURNAL_FILENAME
+from .records import RECORDS_FILENAME, RecordWriter, iter_row_groups
+from .thumbnails import THUMBNAIL_CACHE_FILENAME, THUMBNAIL_MAGIC, read_thumbnail_index
+from .result_index import build_index
+
+# 샤드별/합친 처리 요약 파일 (결과 루트)
+SUMMARY_FILENAME = ".mdns_summary.json"
+
+def partition_key(file_info) -> tuple:
+    """
+    파일이 속한 분할 단위. 날짜 스코프가 있으면 스코프 폴더(소스 루트 기준 상대 경로),
+    없으면 파일의 디렉토리입니다. 절대 경로를 쓰지 않으므로 호스트마다 마운트 위치가 달라도 같습니다.
+    """
+    date_info = resolve_date(file_info.absolute_path)
+    if date_info["found"]:
+        scope_dir = Path(date_info["scope_key"][0])
+        try:
+            return ("scope", scope_dir.relative_to(file_info.source_root).as_posix())
+        except ValueError:
+            return ("scope", "") # 소스 루트 자체가 날짜 폴더 안: 전체가 한 스코프
+    return ("dir", file_info.relative_path.as_posix())
+
+def assign_shards(file_list: list, count: int, sizes=None) -> list:
+    """
+    정렬된 파일 목록의 파일별 샤드 번호를 반환합니다.
+    같은 날짜 스코프의 파일은 모두 한 샤드에 배정되므로 스코프의 시간 오프셋 순서가 샤드 안에서 그대로 유지되고,
+    결과 디렉토리도 한 샤드만 씁니다. 분할 단위는 예상 비용이 큰 것부터 가장 덜 찬 샤드에 배정합니다.
+    입력이 같으면 어느 호스트에서 계산해도 같은 결과입니다.
+    """
+    sizes = sizes if sizes is not None else file_sizes(file_list)
+    keys = [partition_key(f) for f in file_list]
+    costs, first_seen = {}, {}
+    for position, (key, file_info, size) in enumerate(zip(keys, file_list, sizes)):
+        costs[key] = costs.get(key, 0.0) + estimate_cost(file_info.extension, size)
+        first_seen.setdefault(key, position)
+    loads = [0.0] * count
+    shard_of = {}
+    for key in sorted(costs, key=lambda k: (-costs[k], first_seen[k])):
+        target = min(range(count), key=lambda k: (loads[k], k))
+        shard_of[key] = target
+        loads[target] += costs[key]
+    return [shard_of[key] for key in keys]
+
+class ShardSpec:
+    """
+    샤드 모드 설정: count개 중 index번째 샤드. (process_files(shard=...)에 전달)
+    샤드는 같은 결과 루트(공유 스토리지)에 결과를 쓰되, 저널/레코드/썸네일/요약은 샤드별 파일에 기록합니다.
+    """
+    def __init__(self, index: int, count: int):
+        if count < 1 or not 0 <= index < count:
+            raise ValueError(f"Invalid shard {index} of {count}")
+        self.index = index
+        self.count = count
+
+    @property
+    def label(self) -> str:
+        return f"{self.index + 1}/{self.count}"
+
+    def filename(self, filename: str) -> str:
+        """상태 파일 이름에 샤드 번호를 붙입니다. (.mdns_journal.jsonl -> .mdns_journal.shard0.jsonl)"""
+        path = Path(filename)
+        return f"{path.stem}.shard{self.index}{path.suffix}"
+
+    def select(self, file_list: list) -> list:
+        """정렬된 전체 파일 목록에서 이 샤드가 처리할 파일만 순서를 유지하여 고릅니다."""
+        return [f for f, shard in zip(file_list, assign_shards(file_list, self.count)) if shard == self.index]
+
+    def write_summary(self, result_root, summary: dict, status: str):
+        path = Path(result_root) / self.filename(SUMMARY_FILENAME)
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({"index": self.index, "count": self.count, "status": status, "summary": dict(summary)}, f, ensure_ascii=False, indent=1)
+        os.replace(temp_path, path)
+
+def merge_shards(result_root, count: int, queue):
+    """
+    모든 샤드가 끝난 뒤 샤드별 요약, 저널, 결과 레코드, 썸네일 캐시를 결과 루트의 기본 파일로 합치고 결과 인덱스를 만듭니다.
+    샤드 번호 순서로 합치므로 결과는 결정적이며, 다시 실행해도 같은 파일이 만들어집니다.
+    합친 저널이 있으므로 이후 일반 모드의 재개(resume) 실행은 완료된 파일을 건너뜁니다.
+    Raises:
+        FileOperationError: 요약이 없거나 완료되지 않은 샤드가 있는 경우.
+    """
+    result_root = Path(result_root)
+    shards = [ShardSpec(index, count) for index in range(count)]
+    summary = new_summary()
+    for shard in shards:
+        path = result_root / shard.filename(SUMMARY_FILENAME)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                shard_summary = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise FileOperationError(f"샤드 {shard.label}의 처리 요약을 읽을 수 없습니다: {path} ({e})")
+        if shard_summary.get("count") != count or shard_summary.get("status") != 'done':
+            raise FileOperationError(f"샤드 {shard.label}가 완료되지 않았습니다: {shard_summary.get('status')} (샤드 수 {shard_summary.get('count')})")
+        merge_counters(summary, shard_summary["summary"])
+
+    with open(result_root / JOURNAL_FILENAME, 'wb') as merged:
+        for shard in shards:
+            path = result_root / shard.filename(JOURNAL_FILENAME)
+            if path.exists():
+                with open(path, 'rb') as f:
+                    data = f.read()
+                merged.write(data if not data or data.endswith(b"\n") else data + b"\n")
+
+    records = RecordWriter(result_root, filename=RECORDS_FILENAME)
+    try:
+        for shard in shards:
+            path = result_root / shard.filename(RECORDS_FILENAME)
+            if not path.exists():
+                continue
+            for group in iter_row_groups(path):
+                for source, output, actions, ms in zip(group["source"], group["output"], group["actions"], group["elapsed_ms"]):
+                    records.append(source, str(result_root / output) if output else None, actions, ms)
+    finally:
+        records.close()
+
+    build_index(result_root) # 합친 레코드에서 결과 인덱스
+
+    thumbnail_paths = [result_root / shard.filename(THUMBNAIL_CACHE_FILENAME) for shard in shards]
+    if any(path.exists() for path in thumbnail_paths):
+        with open(result_root / THUMBNAIL_CACHE_FILENAME, 'wb') as merged:
+            merged.write(THUMBNAIL_MAGIC)
+            for path in thumbnail_paths:
+                if not path.exists():
+                    continue
+                _, valid_end = read_thumbnail_index(path)
+                with open(path, 'rb') as f:
+                    f.seek(len(THUMBNAIL_MAGIC))
+                    merged.write(f.read(max(0, valid_end - len(THUMBNAIL_MAGIC)))) # 레코드 부분만 이어 붙임
+
+    with open(result_root / SUMMARY_FILENAME, 'w', encoding='utf-8') as f:
+        json.dump({"count": count, "status": 'done', "summary": dict(summary)}, f, ensure_ascii=False, indent=1)
+    queue.put(('log', f"샤드 {count}개의 결과를 합쳤습니다: {result_root}"))
+    return summary
+
+def _run_shard(source_root, index: int, count: int, output_root=None, dedup_mode=None, resume=False, thumbnails=False, naming_hash="md5") -> tuple:
+    """샤드 작업자 프로세스: 샤드 하나를 처리하고 마지막 이벤트(종류, 메시지)를 반환합니다."""
+    from .orchestrator import process_files # 작업자 프로세스에서만 필요
+    events = queue_module.Queue()
+    process_files(source_root, events, dedup_mode=dedup_mode, resume=resume, output_root=output_root, thumbnails=thumbnails, shard=ShardSpec(index, count), naming_hash=naming_hash)
+    last = events.queue[-1]
+    return last[0], last[1]
+
+def run_local_shards(source_root, count: int, queue, output_root=None, dedup_mode=None, resume=False, thumbnails=False, naming_hash="md5"):
+    """
+    한 장비에서 샤드 작업자 count개를 프로세스로 띄워 처리한 뒤 합칩니다.
+    여러 호스트에서 `python -m src.sharding run`으로 나눠 실행하는 것과 같은 경로를 지나므로 로컬 검증용으로 씁니다.
+    내용 중복 탐지는 샤드 안에서만 이루어집니다.
+    """
+    result_root = get_result_root(source_root, output_root)
+    with ProcessPoolExecutor(max_workers=count, mp_context=multiprocessing.get_context("spawn")) as executor:
+        futures = [executor.submit(_run_shard, source_root, index, count, output_root, dedup_mode, resume, thumbnails, naming_hash) for index in range(count)]
+        outcomes = [future.result() for future in futures]
+    for index, (kind, message) in enumerate(outcomes):
+        queue.put(('log', f"샤드 {index + 1}/{count}: {kind} - {message}"))
+    try:
+        summary = merge_shards(result_root, count, queue)
+    except FileOperationError as e:
+        queue.put(('error', str(e)))
+        return
+    queue.put(('log', create_summary_report(summary)))
+    queue.put(('done', "모든 샤드의 처리가 완료되었습니다."))
+
+def _print_events(events: queue_module.Queue) -> int:
+    exit_code = 0
+    while not events.empty():
+        event = events.get()
+        if event[0] in ('log', 'done', 'error', 'cancelled'):
+            print(event[1], flush=True)
+        if event[0] in ('error', 'cancelled'):
+            exit_code = 1
+    return exit_code
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MDNS 샤드 모드: 날짜 스코프 단위로 나눠 여러 프로세스/호스트에서 처리")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="샤드 하나를 처리")
+    run_parser.add_argument("--shard", type=int, required=True, help="이 샤드의 번호 (0부터)")
+    merge_parser = commands.add_parser("merge", help="모든 샤드가 끝난 뒤 결과를 합침")
+    local_parser = commands.add_parser("local", help="한 장비에서 모든 샤드를 실행하고 합침")
+    for sub in (run_parser, merge_parser, local_parser):
+        sub.add_argument("source_root")
+        sub.add_argument("--count", type=int, required=True, help="전체 샤드 수")
+        sub.add_argument("--output", default=None, help="결과물 루트 (기본값 [Source]/result, 모든 샤드가 같은 경로를 사용)")
+    for sub in (run_parser, local_parser):
+        sub.add_argument("--dedup", default=None, choices=("skip", "hardlink", "report"))
+        sub.add_argument("--resume", action="store_true")
+        sub.add_argument("--thumbnails", action="store_true")
+        sub.add_argument("--naming-hash", default="md5", choices=HASH_SCHEMES, help="파일명 해시 방식 (모든 샤드가 같은 값을 사용)")
+    args = parser.parse_args(argv)
+
+    events = queue_module.Queue()
+    if args.command == "run":
+        from .orchestrator import process_files
+        process_files(args.source_root, events, dedup_mode=args.dedup, resume=args.resume, output_root=args.output,
+                      thumbnails=args.thumbnails, shard=ShardSpec(args.shard, args.count), naming_hash=args.naming_hash)
+    elif args.command == "merge":
+        try:
+            print(create_summary_report(merge_shards(get_result_root(args.source_root, args.output), args.count, events)))
+        except FileOperationError as e:
+            events.put(('error', str(e)))
+    else:
+        run_local_shards(args.source_root, args.count, events, args.output, args.dedup, args.resume, args.thumbnails, args.naming_hash)
+    return _print_events(events)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+# src/startup.py
+import time
+import threading
+import importlib
+
+from .paths import get_binary_versions
+
+# 창을 띄운 뒤 사용자가 폴더를 고르는 동안 미리 임포트할 모듈 (처리 시작 시 임포트 지연 제거)
+PREWARM_MODULES = (".orchestrator", "PIL.Image", "piexif", ".metadata.jpg_piexif")
+
+class StartupTasks(threading.Thread):
+    """
+    GUI 시작 후 백그라운드에서 한 번 실행하는 작업.
+    - 외부 도구 확인: 도구별 버전을 한 번 확인하여 캐시합니다. (paths.get_binary_versions)
+    - 모듈 예열: 무거운 모듈(orchestrator, Pillow, piexif)을 미리 임포트합니다.
+    결과는 gui_queue에 ('log', 메시지) 이벤트로 전달하므로 창 표시를 막지 않습니다.
+    """
+    def __init__(self, gui_queue, modules=PREWARM_MODULES):
+        super().__init__(daemon=True) # 예열 중 창을 닫아도 종료를 막지 않음
+        self.gui_queue = gui_queue
+        self.modules = modules
+        self.versions = {}
+        self.prewarm_seconds = 0.0
+
+    def run(self):
+        self.versions = get_binary_versions()
+        missing = [name for name, version in self.versions.items() if version is None]
+        if missing:
+            self.gui_queue.put(('log', f"경고: 외부 도구를 찾을 수 없습니다: {', '.join(missing)} (해당 형식의 파일은 처리에 실패합니다)"))
+        else:
+            self.gui_queue.put(('log', "외부 도구 확인: " + ", ".join(f"{name} {version}" for name, version in self.versions.items())))
+        self.prewarm_seconds = prewarm(self.modules)
+
+def prewarm(modules=PREWARM_MODULES) -> float:
+    """모듈을 임포트해 둡니다. 임포트에 실패한 모듈은 실제 처리 시점에 같은 오류가 나므로 여기서는 무시합니다."""
+    started = time.perf_counter()
+    for name in modules:
+        try:
+            importlib.import_module(name, __package__) # '.'으로 시작하면 이 패키지 기준
+        except Exception:
+            pass
+    return time.perf_counter() - started
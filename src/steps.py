@@ -0,0 +1,196 @@
+# src/steps.py
+import asyncio
+from collections import defaultdict
+from pathlib import Path
+from typing import Union, cast, TypedDict
+from datetime import datetime, timedelta # For date/time manipulation
+
+from .scanner import FileInfo
+from .control import in_current_context
+from .copy_engine import copy_file
+from .metadata.base import get_metadata_processor
+from .logging_i18n import get_log_message, log_error_to_file
+from .convert.image_to_jpg import convert_to_jpg, convert_to_jpg_async # Import the conversion function
+from .errors import ProcessingCancelled
+
+# Minimal type definitions for DateInfoFound and DateInfoNotFound
+# These would typically come from date_resolver.py
+class DateInfoFound(TypedDict):
+    found: bool
+    ymd: str
+    scope_key: tuple # (date_folder_full_path_str, date_ymd_string)
+
+class DateInfoNotFound(TypedDict):
+    found: bool
+
+def handle_conversion_or_copy(file_info: FileInfo, result_dir: Path, summary: defaultdict, queue, name_prefix: str = "", write=None) -> Union[Path, None]:
+    """
+    파일을 결과 디렉토리로 복사하거나 변환합니다.
+    name_prefix가 주어지면 결과 파일명 앞에 붙입니다. (병렬 엔진의 임시 이름용)
+    write는 변환 결과를 기록하는 함수로 convert_to_jpg에 전달됩니다. (메타데이터를 함께 기록할 때)
+    (TASK-05-01, TASK-05-02 관련)
+    """
+    destination_path = result_dir / (name_prefix + file_info.filename)
+
+    # Handle PNG/HEIC to JPG conversion
+    # 사전 확인에서 ImageMagick이 없다고 표시된 HEIC는 변환하지 않고 원본을 복사
+    if file_info.extension in ['.png', '.heic'] and 'magick' not in file_info.missing_tools:
+        # For conversion, the destination filename should have a .jpg extension
+        destination_filename_jpg = name_prefix + file_info.absolute_path.stem + ".jpg"
+        destination_path_jpg = result_dir / destination_filename_jpg
+        converted_path = convert_to_jpg(file_info.absolute_path, destination_path_jpg, summary, queue, write=write)
+        if converted_path:
+            return converted_path
+        else:
+            # Conversion failed, return None to skip further processing for this file
+            return None
+
+    # If not a PNG/HEIC, or if conversion is not applicable, copy the original file
+    try:
+        copy_file(file_info.absolute_path, destination_path)
+        queue.put(('log', f"  원본 파일 복사: {file_info.absolute_path.name} -> {destination_path.name}")) # DEV_GUIDE 6.2 COPY_TO_RESULT
+        summary['copied_files'] += 1
+        return destination_path
+    except Exception as e:
+        queue.put(('log', f"  파일 복사 실패 ({file_info.absolute_path.name}): {e}"))
+        # TODO: (TASK-08-02) error.log 기록
+        log_error_to_file(str(file_info.absolute_path), "FILE_COPY", e)
+        return None
+
+async def handle_conversion_or_copy_async(file_info: FileInfo, result_dir: Path, summary: defaultdict, queue, name_prefix: str = "", executor=None) -> Union[Path, None]:
+    """
+    handle_conversion_or_copy의 asyncio 버전. (비동기 엔진용)
+    HEIC 변환(ImageMagick)은 이벤트 루프에서 실행하고, 복사와 PNG 변환(Pillow)은 executor 스레드에서 실행합니다.
+    """
+    if file_info.extension == '.heic' and 'magick' not in file_info.missing_tools:
+        destination_path_jpg = result_dir / (name_prefix + file_info.absolute_path.stem + ".jpg")
+        return await convert_to_jpg_async(file_info.absolute_path, destination_path_jpg, summary, queue)
+    return await asyncio.get_running_loop().run_in_executor(executor, in_current_context(handle_conversion_or_copy), file_info, result_dir, summary, queue, name_prefix)
+
+def _target_datetime(folder_ymd: str, offset_seconds: int) -> tuple:
+    """기준 날짜 + 오프셋의 (기록용 "YYYY:MM:DD HH:MM:SS", 비교용 "YYYY-MM-DD")."""
+    base_datetime_str = f"{folder_ymd} 09:00:00" # 09:00:00부터 시작하여 1초씩 증가
+    target_datetime_obj = datetime.strptime(base_datetime_str, '%Y-%m-%d %H:%M:%S') + timedelta(seconds=offset_seconds)
+    return target_datetime_obj.strftime('%Y:%m:%d %H:%M:%S'), target_datetime_obj.strftime('%Y-%m-%d')
+
+def _metadata_unsupported(result_file_path: Path, summary: defaultdict, queue):
+    queue.put(('log', f"  {get_log_message('META_FAIL_UNSUPPORTED')} ({result_file_path.name})"))
+    summary['metadata_skipped_no_date'] += 1 # Or a new category for unsupported format
+
+def _metadata_target(result_file_path: Path, date_info: Union[DateInfoFound, DateInfoNotFound], time_offset_counters: defaultdict, summary: defaultdict, queue, missing_tools: tuple = ()) -> Union[tuple, None]:
+    """
+    메타데이터 보정에 쓸 프로세서와 목표 시각을 정합니다.
+    보정하지 않는 경우(필요한 외부 도구 없음, 기준 날짜 없음, 지원하지 않는 형식)는 로그와 요약을 남기고 None을 반환합니다.
+    Returns:
+        tuple | None: (프로세서, 스코프 키, 기록용 "YYYY:MM:DD HH:MM:SS", 비교용 "YYYY-MM-DD")
+    """
+    # 0. 사전 확인에서 필요한 외부 도구가 없다고 표시된 파일 (FileInfo.missing_tools)
+    if missing_tools:
+        _metadata_unsupported(result_file_path, summary, queue)
+        return None
+    file_extension = result_file_path.suffix.lower()
+    processor = get_metadata_processor(file_extension)
+
+    # 1. 기준 날짜 정보가 없는 경우 처리
+    if not date_info["found"]:
+        if date_info.get("reason") == "unsupported_format":
+            queue.put(('log', f"  {get_log_message('META_FAIL_UNSUPPORTED')} ({result_file_path.name})"))
+        else:
+            queue.put(('log', f"  {get_log_message('META_SKIP_NO_DATE')} ({result_file_path.name})"))
+        summary['metadata_skipped_no_date'] += 1
+        return None
+
+    # date_info가 DateInfoFound 타입임을 명시적으로 캐스팅
+    date_info = cast(DateInfoFound, date_info)
+    folder_ymd = date_info['ymd']
+    scope_key = date_info['scope_key']
+    current_offset_seconds = time_offset_counters[scope_key]
+
+    # 기준 날짜 + 오프셋으로 최종 목표 날짜/시간 생성
+    target_datetime_str_for_write, target_ymd_for_compare = _target_datetime(folder_ymd, current_offset_seconds)
+
+    # 2. 프로세서가 없는 경우 (지원하지 않는 파일 형식)
+    if processor is None:
+        _metadata_unsupported(result_file_path, summary, queue)
+        return None
+    return processor, scope_key, target_datetime_str_for_write, target_ymd_for_compare
+
+def _metadata_failed(result_file_path: Path, event_code: str, stage: str, error: Exception, summary: defaultdict, queue):
+    queue.put(('log', f"  {get_log_message(event_code)} ({result_file_path.name})"))
+    log_error_to_file(str(result_file_path), stage, error)
+    summary['metadata_failed'] += 1
+
+def _needs_write(result_file_path: Path, read_result, target_ymd_for_compare: str, summary: defaultdict, queue) -> bool:
+    """3. 메타데이터가 이미 목표 날짜와 일치하면 PASS로 기록하고 False를 반환합니다."""
+    read_ymd = read_result.get("ymd") if read_result else None
+    if read_ymd == target_ymd_for_compare:
+        queue.put(('log', f"  {get_log_message('META_PASS')} ({result_file_path.name})"))
+        summary['metadata_passed'] += 1
+        return False
+    return True
+
+def _record_write(result_file_path: Path, success: bool, target_datetime_str_for_write: str, scope_key, time_offset_counters: defaultdict, summary: defaultdict, queue):
+    """4. 메타데이터 기록 결과를 반영합니다. 성공한 경우에만 스코프의 시간 오프셋을 증가시킵니다."""
+    if success:
+        queue.put(('log', f"  {get_log_message('META_SET', time=target_datetime_str_for_write)} ({result_file_path.name})"))
+        summary['metadata_changed'] += 1
+        time_offset_counters[scope_key] += 1 # Increment offset for the next file in the same scope
+    else:
+        # This path might be less common if write_metadata raises exceptions on failure
+        _metadata_failed(result_file_path, 'META_FAIL_WRITE', "METADATA_WRITE", Exception("Metadata write failed without specific exception."), summary, queue)
+
+def _handle_metadata(result_file_path: Path, date_info: Union[DateInfoFound, DateInfoNotFound], time_offset_counters: defaultdict, summary: defaultdict, queue, missing_tools: tuple = ()) -> Union[dict, None]:
+    """
+    파일의 메타데이터를 보정합니다. missing_tools는 원본의 FileInfo.missing_tools입니다.
+    (TASK-04, TASK-06, TASK-07 관련)
+    Returns:
+        dict | None: 프로세서의 읽기 결과 (내장 썸네일 등 재사용용). 읽지 않았거나 실패하면 None.
+    """
+    target = _metadata_target(result_file_path, date_info, time_offset_counters, summary, queue, missing_tools)
+    if target is None:
+        return None
+    processor, scope_key, target_datetime_str_for_write, target_ymd_for_compare = target
+    try:
+        read_result = processor.read_metadata(str(result_file_path))
+    except ProcessingCancelled:
+        raise
+    except Exception as e: # ExternalToolError, MetadataError 포함
+        _metadata_failed(result_file_path, 'META_FAIL_READ', "METADATA_READ", e, summary, queue)
+        return None
+    if _needs_write(result_file_path, read_result, target_ymd_for_compare, summary, queue):
+        try:
+            success = processor.write_metadata(str(result_file_path), target_datetime_str_for_write)
+        except ProcessingCancelled:
+            raise
+        except Exception as e:
+            _metadata_failed(result_file_path, 'META_FAIL_WRITE', "METADATA_WRITE", e, summary, queue)
+        else:
+            _record_write(result_file_path, success, target_datetime_str_for_write, scope_key, time_offset_counters, summary, queue)
+    return read_result
+
+async def _handle_metadata_async(result_file_path: Path, date_info: Union[DateInfoFound, DateInfoNotFound], time_offset_counters: defaultdict, summary: defaultdict, queue, missing_tools: tuple = ()) -> Union[dict, None]:
+    """
+    _handle_metadata의 asyncio 버전. (비동기 엔진용)
+    프로세서의 read_metadata_async/write_metadata_async를 사용하므로 외부 도구는 이벤트 루프에서 실행됩니다.
+    """
+    target = _metadata_target(result_file_path, date_info, time_offset_counters, summary, queue, missing_tools)
+    if target is None:
+        return None
+    processor, scope_key, target_datetime_str_for_write, target_ymd_for_compare = target
+    try:
+        read_result = await processor.read_metadata_async(str(result_file_path))
+    except ProcessingCancelled:
+        raise
+    except Exception as e:
+        _metadata_failed(result_file_path, 'META_FAIL_READ', "METADATA_READ", e, summary, queue)
+        return None
+    if _needs_write(result_file_path, read_result, target_ymd_for_compare, summary, queue):
+        try:
+            success = await processor.write_metadata_async(str(result_file_path), target_datetime_str_for_write)
+        except ProcessingCancelled:
+            raise
+        except Exception as e:
+            _metadata_failed(result_file_path, 'META_FAIL_WRITE', "METADATA_WRITE", e, summary, queue)
+        else:
+            _record_write(result_file_path, success, target_datetime_str_for_write, scope_key, time_offset_counters, summary, queue)
+    return read_result
@@ -0,0 +1,42 @@
+# src/summary.py
+from collections import defaultdict
+
+def create_summary_report(summary):
+    """
+    처리 요약 보고서를 생성합니다. (TASK-08-03)
+    현재는 간단한 문자열을 반환합니다.
+    """
+    report = "--- 처리 요약 ---\n"
+    for key, value in summary.items():
+        # Translate internal keys to more user-friendly Korean messages for the report
+        if key == 'processed_files': report += f"총 처리 파일 수: {value}\n"
+        elif key == 'failed_files': report += f"처리 실패 파일 수: {value}\n"
+        elif key == 'copied_files': report += f"원본 복사 파일 수: {value}\n"
+        elif key == 'converted_to_jpg': report += f"JPG 변환 파일 수: {value}\n"
+        elif key == 'conversion_failed': report += f"변환 실패 파일 수: {value}\n"
+        elif key == 'metadata_changed': report += f"메타데이터 변경 파일 수: {value}\n"
+        elif key == 'metadata_skipped_no_date': report += f"메타데이터 스킵 (날짜 없음) 파일 수: {value}\n"
+        elif key == 'metadata_passed': report += f"메타데이터 유지 파일 수: {value}\n"
+        elif key == 'metadata_failed': report += f"메타데이터 수정 실패 파일 수: {value}\n"
+        elif key == 'filename_passed': report += f"파일명 유지 파일 수: {value}\n"
+        elif key == 'filename_uppercase_normalized': report += f"파일명 대문자 정규화 파일 수: {value}\n"
+        elif key == 'filename_hashed': report += f"파일명 해시 변경 파일 수: {value}\n"
+        elif key == 'filename_duplicate_suffix': report += f"파일명 중복 접미사 추가 파일 수: {value}\n"
+        elif key == 'cancelled_files': report += f"취소로 처리하지 않은 파일 수: {value}\n"
+        elif key == 'metadata_skipped_missing_tool': report += f"외부 도구가 없어 메타데이터 보정을 건너뛴 파일 수: {value}\n"
+        elif key == 'resumed_skipped': report += f"이전 실행에서 완료되어 건너뛴 파일 수: {value}\n"
+        elif key == 'duplicate_reported': report += f"내용 중복 발견 파일 수: {value}\n"
+        elif key == 'duplicate_skipped': report += f"내용 중복으로 건너뛴 파일 수: {value}\n"
+        elif key == 'duplicate_hardlinked': report += f"내용 중복 하드링크 파일 수: {value}\n"
+        else: report += f"{key}: {value}\n" # Fallback for unhandled keys
+    report += "-----------------\n"
+    return report
+
+def new_summary() -> defaultdict:
+    """보고서에 항상 표시되는 키를 0으로 초기화한 요약 딕셔너리를 만듭니다."""
+    summary = defaultdict(int)
+    for key in ('processed_files', 'failed_files', 'copied_files', 'converted_to_jpg', 'conversion_failed',
+                'metadata_changed', 'metadata_skipped_no_date', 'metadata_passed', 'metadata_failed',
+                'filename_passed', 'filename_uppercase_normalized', 'filename_hashed', 'filename_duplicate_suffix'):
+        summary[key] = 0
+    return summary
@@ -0,0 +1,99 @@
+# src/thumbnail_view.py
+import io
+import tkinter as tk
+from collections import OrderedDict
+
+from .thumbnails import read_thumbnail_index
+
+CELL_WIDTH = 180
+CELL_HEIGHT = 200
+# 메모리에 유지하는 디코딩된 썸네일 수 (화면 몇 개 분량)
+PHOTO_CACHE_SIZE = 400
+
+class ThumbnailGrid(tk.Toplevel):
+    """
+    썸네일 캐시 파일을 보여주는 가상화 그리드 창.
+    스크롤 영역은 전체 항목 수로 잡되, 실제 이미지는 화면에 보이는 행만 디코딩/배치하므로
+    항목이 10만 개여도 위젯 수와 메모리 사용량은 화면 크기에만 비례합니다.
+    """
+    def __init__(self, master, cache_path):
+        super().__init__(master)
+        self.title("결과 썸네일")
+        self.geometry("960x700")
+        index, _ = read_thumbnail_index(cache_path)
+        self.entries = sorted(index.items()) # [(상대 경로, (위치, 길이))]
+        self._file = open(cache_path, 'rb')
+        self._photos = OrderedDict() # 상대 경로 -> PhotoImage (LRU)
+        self._drawn_rows = None
+
+        self.canvas = tk.Canvas(self, background="white", highlightthickness=0)
+        scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scroll)
+        self.canvas.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.canvas.bind("<Configure>", lambda event: self._redraw(force=True))
+        self.canvas.bind("<MouseWheel>", self._on_mousewheel)
+        self.canvas.bind("<Button-4>", lambda event: self._on_scroll("scroll", -3, "units"))
+        self.canvas.bind("<Button-5>", lambda event: self._on_scroll("scroll", 3, "units"))
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+    @property
+    def columns(self) -> int:
+        return max(1, self.canvas.winfo_width() // CELL_WIDTH)
+
+    def _on_scroll(self, *args):
+        self.canvas.yview(*args)
+        self._redraw()
+
+    def _on_mousewheel(self, event):
+        self._on_scroll("scroll", -1 * (event.delta // 120) * 3, "units")
+
+    def _visible_rows(self) -> range:
+        top = self.canvas.canvasy(0)
+        first = int(top // CELL_HEIGHT)
+        last = int((top + self.canvas.winfo_height()) // CELL_HEIGHT) + 1
+        return range(first, last)
+
+    def _redraw(self, force: bool = False):
+        """보이는 행이 바뀌었을 때만 캔버스 항목을 다시 만듭니다."""
+        columns = self.columns
+        total_rows = (len(self.entries) + columns - 1) // columns
+        self.canvas.configure(scrollregion=(0, 0, columns * CELL_WIDTH, total_rows * CELL_HEIGHT), yscrollincrement=CELL_HEIGHT // 4)
+        rows = self._visible_rows()
+        if not force and (rows, columns) == self._drawn_rows:
+            return
+        self._drawn_rows = (rows, columns)
+        self.canvas.delete("all")
+        for row in rows:
+            for column in range(columns):
+                position = row * columns + column
+                if position >= len(self.entries):
+                    return
+                name, location = self.entries[position]
+                x = column * CELL_WIDTH + CELL_WIDTH // 2
+                y = row * CELL_HEIGHT
+                photo = self._photo(name, location)
+                if photo is not None:
+                    self.canvas.create_image(x, y + 85, image=photo)
+                self.canvas.create_text(x, y + CELL_HEIGHT - 15, text=name.rsplit("/", 1)[-1], width=CELL_WIDTH - 10)
+
+    def _photo(self, name: str, location: tuple):
+        """썸네일 JPEG를 캐시 파일에서 읽어 디코딩합니다. 최근 사용한 항목만 메모리에 유지합니다."""
+        if name in self._photos:
+            self._photos.move_to_end(name)
+            return self._photos[name]
+        try:
+            from PIL import Image, ImageTk # 지연 임포트: 썸네일 창을 열 때만 필요
+            offset, length = location
+            self._file.seek(offset)
+            photo = ImageTk.PhotoImage(Image.open(io.BytesIO(self._file.read(length))))
+        except Exception:
+            photo = None
+        self._photos[name] = photo
+        if len(self._photos) > PHOTO_CACHE_SIZE:
+            self._photos.popitem(last=False)
+        return photo
+
+    def close(self):
+        self._file.close()
+        self.destroy()
@@ -0,0 +1,102 @@
+# src/thumbnails.py
+import io
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Union
+
+THUMBNAIL_CACHE_FILENAME = ".mdns_thumbs.bin"
+THUMBNAIL_MAGIC = b"MDNSTHM1"
+# 레코드 헤더: 이름 길이(uint16), JPEG 길이(uint32). 뒤에 UTF-8 이름과 JPEG 바이트가 이어짐
+_RECORD_HEADER = struct.Struct("<HI")
+
+# 생성하는 썸네일의 최대 크기와 JPEG 품질 (EXIF 내장 썸네일과 비슷한 수준)
+THUMBNAIL_SIZE = (160, 160)
+THUMBNAIL_QUALITY = 70
+# 썸네일을 만들 수 있는 결과 파일 형식 (PNG/HEIC는 JPG로 변환된 뒤이므로 포함됨)
+THUMBNAIL_EXTENSIONS = {'.jpg', '.jpeg'}
+
+def read_thumbnail_index(cache_path) -> tuple:
+    """
+    캐시 파일의 레코드 헤더만 읽어 색인을 만듭니다. (JPEG 본문은 건너뜀)
+    같은 이름이 여러 번 기록되어 있으면(재개 등) 마지막 레코드를 사용합니다.
+    기록 도중 끊긴 마지막 레코드는 무시합니다.
+
+    Returns:
+        tuple: ({상대 경로: (JPEG 시작 위치, 길이)}, 마지막 온전한 레코드의 끝 위치)
+    """
+    index = {}
+    with open(cache_path, 'rb') as f:
+        if f.read(len(THUMBNAIL_MAGIC)) != THUMBNAIL_MAGIC:
+            return index, 0
+        valid_end = f.tell()
+        file_size = os.fstat(f.fileno()).st_size
+        while True:
+            header = f.read(_RECORD_HEADER.size)
+            if len(header) < _RECORD_HEADER.size:
+                break
+            name_len, data_len = _RECORD_HEADER.unpack(header)
+            name = f.read(name_len)
+            data_offset = f.tell()
+            if len(name) < name_len or data_offset + data_len > file_size:
+                break
+            f.seek(data_len, os.SEEK_CUR)
+            index[name.decode('utf-8')] = (data_offset, data_len)
+            valid_end = f.tell()
+    return index, valid_end
+
+class ThumbnailCache:
+    """
+    결과 루트의 단일 파일(.mdns_thumbs.bin)에 썸네일 JPEG를 추가 기록하는 캐시.
+    파일 수만큼 작은 파일을 만들지 않고, 색인은 레코드 헤더를 훑어 복원하므로 별도 색인 파일이 없습니다.
+    """
+    def __init__(self, result_root, resume: bool = False, filename: str = THUMBNAIL_CACHE_FILENAME):
+        self.path = Path(result_root) / filename
+        self._result_root = Path(result_root)
+        self._lock = threading.Lock()
+        os.makedirs(result_root, exist_ok=True)
+        if resume and self.path.exists():
+            _, valid_end = read_thumbnail_index(self.path)
+            if valid_end:
+                self._file = open(self.path, 'r+b')
+                self._file.truncate(valid_end) # 끊긴 마지막 레코드 제거 후 이어서 기록
+                self._file.seek(valid_end)
+                return
+        self._file = open(self.path, 'wb')
+        self._file.write(THUMBNAIL_MAGIC)
+
+    def add(self, result_file_path, jpeg_bytes: bytes):
+        """결과 파일(최종 이름)의 썸네일을 기록합니다. 키는 결과 루트 기준 상대 경로입니다."""
+        name = Path(os.path.relpath(result_file_path, self._result_root)).as_posix().encode('utf-8')
+        with self._lock:
+            self._file.write(_RECORD_HEADER.pack(len(name), len(jpeg_bytes)) + name)
+            self._file.write(jpeg_bytes)
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+def make_thumbnail(file_path, embedded: Union[bytes, None] = None) -> Union[bytes, None]:
+    """
+    썸네일 JPEG 바이트를 반환합니다.
+    메타데이터 읽기에서 얻은 EXIF 내장 썸네일이 있으면 그대로 사용하고(디코딩 없음),
+    없으면 Pillow의 draft 모드(1/2~1/8 축소 디코딩)로 작은 썸네일을 생성합니다.
+    생성할 수 없는 형식이거나 실패하면 None.
+    """
+    if embedded:
+        return embedded
+    if Path(file_path).suffix.lower() not in THUMBNAIL_EXTENSIONS:
+        return None
+    try:
+        from PIL import Image # 지연 임포트: 썸네일 옵션을 켠 실행에서만 필요
+        with Image.open(file_path) as img:
+            img.draft('RGB', THUMBNAIL_SIZE)
+            img = img.convert('RGB')
+            img.thumbnail(THUMBNAIL_SIZE)
+            buffer = io.BytesIO()
+            img.save(buffer, "jpeg", quality=THUMBNAIL_QUALITY)
+            return buffer.getvalue()
+    except Exception:
+        return None # 썸네일은 부가 기능이므로 실패해도 파일 처리 결과에 영향 없음
@@ -0,0 +1,197 @@
+# src/watcher.py
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+from pathlib import Path
+from typing import Union
+
+from .scanner import SUPPORTED_EXTENSIONS
+
+# inotify 이벤트 마스크 (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+_EVENT_HEADER = struct.Struct("iIII") # wd, mask, cookie, len (뒤에 len 바이트 이름)
+
+def _is_candidate(name: str) -> bool:
+    return not name.startswith(".") and Path(name).suffix.lower() in SUPPORTED_EXTENSIONS
+
+class PollingWatcher:
+    """
+    주기적으로 디렉토리를 훑어 새 파일이나 크기/수정 시각이 바뀐 파일을 보고하는 감시기.
+    inotify를 쓸 수 없는 플랫폼(Windows/macOS)이나 네트워크 파일 시스템용 대체 수단입니다.
+    """
+    def __init__(self, root, exclude=None, interval: float = 10.0):
+        self.root = str(root)
+        self.exclude = os.path.realpath(exclude) if exclude else None
+        self.interval = interval
+        self._snapshot = self._scan()
+        self._next_scan = time.monotonic() + interval
+
+    def _scan(self) -> dict:
+        snapshot = {}
+        for root, dirs, files in os.walk(self.root):
+            dirs[:] = [d for d in dirs if os.path.realpath(os.path.join(root, d)) != self.exclude]
+            for name in files:
+                if not _is_candidate(name):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue # 스캔 도중 삭제됨
+                snapshot[path] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def existing(self) -> list:
+        """감시 시작 시점에 이미 있던 파일 목록."""
+        return list(self._snapshot)
+
+    def poll(self, timeout: float) -> list:
+        """다음 스캔 시각까지(최대 timeout초) 기다린 뒤 바뀐 파일 경로 목록을 반환합니다."""
+        wait = self._next_scan - time.monotonic()
+        if wait > 0:
+            time.sleep(min(wait, timeout))
+            if wait > timeout:
+                return []
+        self._next_scan = time.monotonic() + self.interval
+        snapshot = self._scan()
+        changed = [path for path, state in snapshot.items() if self._snapshot.get(path) != state]
+        self._snapshot = snapshot
+        return changed
+
+    def close(self):
+        pass
+
+class InotifyWatcher:
+    """
+    Linux inotify(ctypes)로 소스 트리를 감시합니다. 하위 디렉토리마다 감시를 추가하며,
+    새로 생긴 디렉토리는 감시를 추가한 뒤 그 사이에 생긴 파일도 보고합니다.
+    이벤트 큐가 넘치면(IN_Q_OVERFLOW) 트리를 한 번 다시 훑어 빠진 파일을 보고합니다.
+    """
+    def __init__(self, root, exclude=None):
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify는 Linux에서만 사용할 수 있습니다.")
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.root = str(root)
+        self.exclude = os.path.realpath(exclude) if exclude else None
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 실패")
+        self._paths = {} # 감시 번호 -> 디렉토리 경로
+        self._existing = self._add_tree(self.root)
+
+    def _add_tree(self, top: str) -> list:
+        """top 아래 모든 디렉토리에 감시를 추가하고, 그 안의 파일 목록을 반환합니다."""
+        files = []
+        for root, dirs, names in os.walk(top):
+            dirs[:] = [d for d in dirs if os.path.realpath(os.path.join(root, d)) != self.exclude]
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(root), WATCH_MASK)
+            if wd < 0:
+                error = ctypes.get_errno()
+                if error == errno.ENOSPC:
+                    raise OSError(error, "inotify 감시 수 한도 초과 (fs.inotify.max_user_watches)")
+                continue # 추가 직전에 삭제된 디렉토리
+            self._paths[wd] = root
+            files.extend(os.path.join(root, name) for name in names if _is_candidate(name))
+        return files
+
+    def existing(self) -> list:
+        return list(self._existing)
+
+    def poll(self, timeout: float) -> list:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        changed = []
+        position = 0
+        while position + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, position)
+            position += _EVENT_HEADER.size
+            name = os.fsdecode(data[position:position + length].rstrip(b"\0"))
+            position += length
+            if mask & IN_Q_OVERFLOW:
+                changed.extend(self._add_tree(self.root)) # 놓친 이벤트가 있으므로 전체를 다시 훑음
+                continue
+            if mask & IN_IGNORED:
+                self._paths.pop(wd, None) # 디렉토리 삭제/이동
+                continue
+            directory = self._paths.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and os.path.realpath(path) != self.exclude:
+                    changed.extend(self._add_tree(path))
+            elif _is_candidate(name):
+                changed.append(path)
+        return changed
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+def create_watcher(root, exclude=None, poll_interval: float = 10.0, use_inotify: bool = True):
+    """가능하면 InotifyWatcher, 아니면 PollingWatcher를 만듭니다."""
+    if use_inotify:
+        try:
+            return InotifyWatcher(root, exclude)
+        except (OSError, AttributeError):
+            pass # 비 Linux, libc에 inotify 없음, 감시 수 한도 초과 등
+    return PollingWatcher(root, exclude, poll_interval)
+
+class Debouncer:
+    """
+    아직 기록 중인 파일을 거르는 대기열.
+    파일은 마지막 이벤트 이후 settle_seconds 동안 크기와 수정 시각이 바뀌지 않았을 때 준비된 것으로 봅니다.
+    (카메라 덤프/네트워크 복사는 파일을 여러 번 열고 닫을 수 있어 close 이벤트만으로는 부족함)
+    """
+    def __init__(self, settle_seconds: float = 5.0, clock=time.monotonic):
+        self.settle_seconds = settle_seconds
+        self._clock = clock
+        self._pending = {} # 경로 -> (마지막 변경 시각, (크기, 수정 시각))
+
+    def __len__(self):
+        return len(self._pending)
+
+    def touch(self, path: str):
+        self._pending[path] = (self._clock(), self._stat(path))
+
+    @staticmethod
+    def _stat(path: str) -> Union[tuple, None]:
+        try:
+            stat = os.stat(path)
+            return stat.st_size, stat.st_mtime_ns
+        except OSError:
+            return None
+
+    def ready(self) -> list:
+        """안정된 파일 경로 목록을 꺼냅니다. 그 사이 바뀐 파일은 대기 시간을 다시 셉니다."""
+        now = self._clock()
+        ready = []
+        for path, (changed_at, state) in list(self._pending.items()):
+            if now - changed_at < self.settle_seconds:
+                continue
+            current = self._stat(path)
+            if current is None:
+                del self._pending[path] # 삭제되거나 이동됨
+            elif current != state:
+                self._pending[path] = (now, current)
+            else:
+                del self._pending[path]
+                ready.append(path)
+        return ready
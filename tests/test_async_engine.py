@@ -0,0 +1,78 @@
+# tests/test_async_engine.py
+import os
+import sys
+import queue
+import piexif
+from PIL import Image
+from src.orchestrator import process_files
+from src.async_engine import run_async_pipeline
+
+def _build_tree(root):
+    """날짜 스코프 2개 + 날짜 없는 폴더, 해시 충돌(동일 내용) 파일을 포함한 샘플 트리."""
+    for folder in ("2026-01-05_여행", "2026-01-05_여행/inner", "2026-02-01", "no_date"):
+        (root / folder).mkdir(parents=True, exist_ok=True)
+        for i in range(4):
+            color = (i % 2 * 255, 0, 0) # 같은 폴더 안에 동일 내용 파일 → 중복 접미사
+            Image.new("RGB", (8, 8), color).save(root / folder / f"DSC{i:04d}.jpg")
+        Image.new("RGB", (8, 8), (0, 0, 255)).save(root / folder / "img_0001a.jpg")
+
+def _snapshot(root):
+    """result 트리의 (상대 경로, DateTimeOriginal) 목록."""
+    entries = []
+    for dirpath, _, files in os.walk(root / "result"):
+        for name in files:
+            if name.startswith("."):
+                continue
+            path = os.path.join(dirpath, name)
+            exif = piexif.load(path)
+            entries.append((os.path.relpath(path, root), exif["Exif"].get(piexif.ExifIFD.DateTimeOriginal)))
+    return sorted(entries)
+
+def test_async_engine_matches_sequential(tmp_path):
+    """비동기 엔진의 결과(파일명, 시간 오프셋)가 순차 실행과 같은지 테스트합니다."""
+    _build_tree(tmp_path / "seq")
+    _build_tree(tmp_path / "async")
+    process_files(str(tmp_path / "seq"), queue.Queue())
+    q = queue.Queue()
+    run_async_pipeline(str(tmp_path / "async"), q, stage_limits={"produce": 3, "metadata": 3, "hash": 3})
+
+    expected = _snapshot(tmp_path / "seq")
+    assert _snapshot(tmp_path / "async") == expected
+    assert any(name.endswith("1.jpg") for name, _ in expected) # 중복 접미사가 실제로 발생
+    assert q.queue[-1][0] == 'done'
+
+FAKE_EXIFTOOL = """
+import sys, json
+args = sys.argv[1:]
+if args == ["-ver"]:
+    print("12.76")
+elif "-j" in args:
+    print(json.dumps([{"SourceFile": args[-1]}]))
+else:
+    print("    1 image files updated")
+"""
+
+def test_async_engine_runs_tools_on_event_loop(tmp_path, monkeypatch):
+    """비동기 엔진의 메타데이터 단계가 동기 run 대신 ToolScheduler.run_async로 외부 도구를 실행하는지 테스트합니다."""
+    from src import paths
+    from src.external import ToolScheduler, get_scheduler
+    from src.metadata import raw_exiftool
+    fake = tmp_path / "exiftool"
+    fake.write_text(f"#!{sys.executable}\n" + FAKE_EXIFTOOL)
+    os.chmod(fake, 0o755)
+    for target in (paths, raw_exiftool):
+        monkeypatch.setattr(target, "get_exiftool_path", lambda: str(fake))
+    monkeypatch.setitem(paths._BINARY_GETTERS, "exiftool", lambda: str(fake))
+    def blocking_run(*args, **kwargs):
+        raise AssertionError("blocking tool call")
+    monkeypatch.setattr(ToolScheduler, "run", blocking_run)
+    source = tmp_path / "source" / "2026-03-01"
+    source.mkdir(parents=True)
+    for name in ("A.cr3", "B.cr3"):
+        (source / name).write_bytes(name.encode())
+
+    q = queue.Queue()
+    run_async_pipeline(str(tmp_path / "source"), q)
+    assert q.queue[-1][0] == 'done'
+    assert any("2026:03:01 09:00:01" in e[1] for e in q.queue if e[0] == 'log')
+    assert get_scheduler().stats_snapshot()["exiftool"]["calls"] == 4 # 파일마다 읽기 + 쓰기
@@ -0,0 +1,22 @@
+# tests/test_batching.py
+import os
+from pathlib import Path
+
+import pytest
+
+from src import batching
+from src.batching import DirectoryBatch, _warm_batch
+from src.scanner import FileInfo
+
+@pytest.mark.skipif(not hasattr(os, 'posix_fadvise'), reason="posix_fadvise 없음")
+def test_willneed_is_bounded_by_batch_budget(tmp_path, monkeypatch):
+    """미리 읽기 요청이 배치 예산을 넘지 않고, 예산을 넘는 파일은 앞부분만 요청하는지 테스트합니다."""
+    for name, size in (("a.jpg", 300), ("b.mp4", 5000), ("c.jpg", 300)):
+        (tmp_path / name).write_bytes(b"x" * size)
+    monkeypatch.setattr(batching, "PREFETCH_BATCH_BUDGET", 1000)
+    monkeypatch.setattr(batching, "PREFETCH_HEAD_BYTES", 100)
+    advised = []
+    monkeypatch.setattr(batching.os, "posix_fadvise", lambda fd, offset, length, advice: advised.append((offset, length)))
+    files = [FileInfo(tmp_path / name, tmp_path) for name in ("a.jpg", "b.mp4", "c.jpg")]
+    _warm_batch(DirectoryBatch(Path("."), files, tmp_path / "result"))
+    assert advised == [(0, 300), (0, 100), (0, 300)]
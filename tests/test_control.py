@@ -0,0 +1,59 @@
+# tests/test_control.py
+import sys
+import time
+import queue
+import threading
+import pytest
+from src.control import RunControl, set_active_control
+from src.errors import ProcessingCancelled
+from src.external import run_tool
+from src.orchestrator import process_files
+
+def test_cancel_terminates_running_tool():
+    """취소 시 실행 중인 외부 프로세스가 종료되고 ProcessingCancelled가 발생하는지 테스트합니다."""
+    control = RunControl()
+    set_active_control(control)
+    try:
+        threading.Timer(0.2, control.cancel).start()
+        start = time.monotonic()
+        with pytest.raises(ProcessingCancelled):
+            run_tool([sys.executable, "-c", "import time; time.sleep(10)"], timeout=30)
+        assert time.monotonic() - start < 5
+    finally:
+        set_active_control(None)
+
+def test_cancelled_run_reports_partial_summary(tmp_path):
+    """취소된 실행이 'cancelled' 이벤트와 부분 요약을 보내는지 테스트합니다."""
+    (tmp_path / "a.jpg").write_text("a")
+    control = RunControl()
+    control.cancel()
+    q = queue.Queue()
+    process_files(str(tmp_path), q, control=control)
+
+    events = [q.get() for _ in range(q.qsize())]
+    assert events[-1][0] == 'cancelled'
+    assert any("취소로 처리하지 않은 파일 수: 1" in e[1] for e in events if e[0] == 'log')
+
+def test_finished_run_does_not_clear_other_runs_control():
+    """같은 프로세스의 다른 실행이 끝나며 제어 객체를 지워도, 이 실행의 외부 도구는 취소로 종료되는지 테스트합니다."""
+    from concurrent.futures import ThreadPoolExecutor
+    from src.control import get_active_control, in_current_context
+    def other_run():
+        set_active_control(RunControl())
+        set_active_control(None) # 다른 실행의 종료 (finally)
+    control = RunControl()
+    set_active_control(control)
+    try:
+        other = threading.Thread(target=other_run)
+        other.start()
+        other.join()
+        assert get_active_control() is control
+        with ThreadPoolExecutor(max_workers=1) as executor: # 스레드 풀 작업에도 전달
+            assert executor.submit(in_current_context(get_active_control)).result() is control
+        threading.Timer(0.2, control.cancel).start()
+        start = time.monotonic()
+        with pytest.raises(ProcessingCancelled):
+            run_tool([sys.executable, "-c", "import time; time.sleep(10)"], timeout=30)
+        assert time.monotonic() - start < 5
+    finally:
+        set_active_control(None)
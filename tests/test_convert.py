@@ -0,0 +1,38 @@
+# tests/test_convert.py
+import queue
+from collections import defaultdict
+
+from PIL import Image
+
+from src.convert.image_to_jpg import convert_to_jpg, flatten_alpha
+
+def _rgba(size=(37, 101)):
+    """알파가 행/열마다 다른 RGBA 이미지."""
+    width, height = size
+    pixels = bytes((x * 7 + y * 3 + c * 50) % 256 for y in range(height) for x in range(width) for c in range(4))
+    return Image.frombytes('RGBA', size, pixels)
+
+def _legacy_flatten(img):
+    background = Image.new('RGB', img.size, (255, 255, 255))
+    background.paste(img, mask=img.split()[3])
+    return background
+
+def test_strip_flatten_matches_full_composite():
+    img = _rgba()
+    assert flatten_alpha(img, strip_rows=16).tobytes() == _legacy_flatten(img).tobytes() # 마지막 띠는 5행
+
+def test_opaque_alpha_skips_composite():
+    img = _rgba()
+    img.putalpha(255)
+    flattened = flatten_alpha(img)
+    assert flattened.mode == 'RGB'
+    assert flattened.tobytes() == _legacy_flatten(img).tobytes()
+
+def test_convert_transparent_png(tmp_path):
+    source = tmp_path / "scan.png"
+    _rgba().save(source)
+    summary = defaultdict(int)
+    result = convert_to_jpg(source, tmp_path / "scan.jpg", summary, queue.Queue())
+    assert result == tmp_path / "scan.jpg" and summary['converted_to_jpg'] == 1
+    with Image.open(result) as converted:
+        assert converted.format == 'JPEG' and converted.size == (37, 101)
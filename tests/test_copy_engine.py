@@ -0,0 +1,33 @@
+# tests/test_copy_engine.py
+import queue
+import shutil
+from collections import namedtuple
+import pytest
+from src.copy_engine import _double_buffered_copy, check_free_space
+from src.errors import FileOperationError
+from src.orchestrator import process_files
+from src.scanner import scan_files
+
+@pytest.mark.parametrize("size", [0, 10, 4096, 4096 * 3 + 5])
+def test_double_buffered_copy_preserves_content(tmp_path, size):
+    """이중 버퍼 복사가 버퍼 경계와 무관하게 내용을 그대로 복사하는지 테스트합니다."""
+    data = bytes(i % 256 for i in range(size))
+    (tmp_path / "src.bin").write_bytes(data)
+    _double_buffered_copy(tmp_path / "src.bin", tmp_path / "dst.bin", buffer_size=4096)
+    assert (tmp_path / "dst.bin").read_bytes() == data
+
+def test_check_free_space_rejects_insufficient_space(tmp_path, monkeypatch):
+    """여유 공간이 계획 용량보다 작으면 시작 전에 오류를 내는지 테스트합니다."""
+    (tmp_path / "a.jpg").write_bytes(b"x" * 1000)
+    usage = namedtuple("usage", "total used free")
+    monkeypatch.setattr(shutil, "disk_usage", lambda path: usage(0, 0, 10))
+    with pytest.raises(FileOperationError):
+        check_free_space(scan_files(tmp_path), tmp_path / "out")
+
+def test_output_root_separate_from_source(tmp_path):
+    """출력 루트를 지정하면 소스 트리에 result 폴더를 만들지 않는지 테스트합니다."""
+    (tmp_path / "src" / "no_date").mkdir(parents=True)
+    (tmp_path / "src" / "no_date" / "IMG_0001.jpg").write_text("content")
+    process_files(str(tmp_path / "src"), queue.Queue(), output_root=str(tmp_path / "out"))
+    assert not (tmp_path / "src" / "result").exists()
+    assert (tmp_path / "out" / "no_date" / "IMG_0001.jpg").exists()
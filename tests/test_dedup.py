@@ -0,0 +1,64 @@
+# tests/test_dedup.py
+import os
+import queue
+from collections import defaultdict
+from src.scanner import scan_files
+from src.dedup import find_duplicates, link_duplicate
+
+def test_find_duplicates_groups_by_content(tmp_path):
+    """크기가 같아도 내용이 다르면 중복으로 보지 않고, 동일 내용만 묶는지 테스트합니다."""
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    (tmp_path / "a" / "one.jpg").write_bytes(b"x" * 100)
+    (tmp_path / "b" / "two.jpg").write_bytes(b"x" * 100)
+    (tmp_path / "b" / "three.jpg").write_bytes(b"y" * 100) # 같은 크기, 다른 내용
+    (tmp_path / "b" / "four.jpg").write_bytes(b"x" * 50)   # 다른 크기
+    file_list = scan_files(tmp_path)
+    file_list.sort(key=lambda x: (str(x.relative_path), x.filename.lower()))
+
+    groups = find_duplicates(file_list)
+    assert len(groups) == 1
+    assert groups[0].keeper.filename == "one.jpg"
+    assert [d.filename for d in groups[0].duplicates] == ["two.jpg"]
+
+def test_link_duplicate_uses_keeper_name(tmp_path):
+    """하드링크 결과물이 keeper의 최종 이름(충돌 시 접미사)을 사용하는지 테스트합니다."""
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "dup.jpg").write_bytes(b"data")
+    keeper_output = tmp_path / "result" / "IMG_ABCDE.jpg"
+    keeper_output.parent.mkdir()
+    keeper_output.write_bytes(b"data")
+    file_info = scan_files(tmp_path / "src")[0]
+
+    final_path = link_duplicate(file_info, str(keeper_output), tmp_path / "result", defaultdict(int), queue.Queue())
+    assert final_path.endswith("IMG_ABCDE1.jpg")
+    assert (tmp_path / "result" / "IMG_ABCDE1.jpg").read_bytes() == b"data"
+
+def test_hardlink_duplicate_in_same_directory(tmp_path):
+    """같은 디렉토리의 중복 파일이 keeper의 최종 이름(접미사)으로 하드링크되는지 테스트합니다."""
+    from src.orchestrator import process_files
+    (tmp_path / "no_date").mkdir()
+    (tmp_path / "no_date" / "a.jpg").write_bytes(b"same")
+    (tmp_path / "no_date" / "b.jpg").write_bytes(b"same")
+    q = queue.Queue()
+    process_files(str(tmp_path), q, dedup_mode='hardlink')
+
+    names = sorted(n for n in os.listdir(tmp_path / "result" / "no_date") if not n.startswith("."))
+    assert len(names) == 2 and names[1] == names[0].replace(".jpg", "1.jpg")
+    first, second = (tmp_path / "result" / "no_date" / n for n in names)
+    assert os.path.samefile(first, second)
+
+def test_hardlink_duplicate_in_other_scope_gets_its_own_date(tmp_path):
+    """날짜 스코프가 다른 중복 파일은 하드링크하지 않고 자기 스코프의 날짜로 따로 기록되는지 테스트합니다."""
+    import piexif
+    from PIL import Image
+    from src.orchestrator import process_files
+    for folder in ("2024-01-01", "2024-02-02"):
+        (tmp_path / folder).mkdir()
+        Image.new('RGB', (8, 8), (10, 20, 30)).save(tmp_path / folder / "a.jpg", "jpeg")
+    process_files(str(tmp_path), queue.Queue(), dedup_mode='hardlink')
+
+    outputs = [next(p for p in (tmp_path / "result" / folder).iterdir() if not p.name.startswith(".")) for folder in ("2024-01-01", "2024-02-02")]
+    assert not os.path.samefile(*outputs)
+    dates = [piexif.load(str(p))["Exif"][piexif.ExifIFD.DateTimeOriginal] for p in outputs]
+    assert dates == [b"2024:01:01 09:00:00", b"2024:02:02 09:00:00"]
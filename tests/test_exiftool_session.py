@@ -0,0 +1,86 @@
+# tests/test_exiftool_session.py
+import os
+import sys
+import time
+
+import pytest
+
+from src.errors import ExternalToolError
+from src.external import ToolPolicy, get_scheduler
+from src.metadata.exiftool_session import ExiftoolSession, ExiftoolSessionPool
+
+# -stay_open 프로토콜을 흉내 내는 가짜 ExifTool: 인자를 한 줄씩 모았다가 -executeN에서 실행하고
+# stdout 끝에 {readyN}, stderr에는 -echo4 값을 씁니다. CRASH는 프로세스 종료, HANG은 응답 없음.
+FAKE_STAY_OPEN = """
+import sys, time
+args = []
+for line in sys.stdin:
+    line = line.rstrip("\\n")
+    if line.startswith("-execute"):
+        number = line[len("-execute"):]
+        echo = args[args.index("-echo4") + 1] if "-echo4" in args else ""
+        files = [a for a in args if a not in ("-echo4", echo)]
+        if "CRASH" in files:
+            sys.exit(1)
+        if "HANG" in files:
+            time.sleep(30)
+        sys.stdout.write("ran " + " ".join(files) + "\\n{ready" + number + "}\\n")
+        sys.stdout.flush()
+        sys.stderr.write(echo + "\\n")
+        sys.stderr.flush()
+        args = []
+    elif args[-1:] == ["-stay_open"] and line == "False":
+        break
+    else:
+        args.append(line)
+"""
+
+@pytest.fixture
+def fake_exiftool(tmp_path):
+    if sys.platform == "win32":
+        pytest.skip("셔뱅 스크립트로 가짜 도구를 만듦")
+    path = tmp_path / "exiftool"
+    path.write_text(f"#!{sys.executable}\n" + FAKE_STAY_OPEN)
+    os.chmod(path, 0o755)
+    return str(path)
+
+def test_execute_many_returns_outputs_in_order(fake_exiftool):
+    """여러 명령을 한 번에 보내면 {readyN} 표식으로 나눈 출력이 명령 순서대로 반환되고, 세션이 유지되는지 테스트합니다."""
+    session = ExiftoolSession(fake_exiftool)
+    try:
+        results = session.execute_many([["a.jpg"], ["-X", "b.jpg"], ["c.jpg"]], timeout=10)
+        assert [stdout for stdout, _ in results] == ["ran a.jpg\n", "ran -X b.jpg\n", "ran c.jpg\n"]
+        assert [stderr for _, stderr in results] == ["", "", ""]
+        process = session._proc
+        assert session.execute(["d.jpg"], timeout=10)[0] == "ran d.jpg\n"
+        assert session._proc is process # 같은 프로세스 재사용
+    finally:
+        session.close()
+    assert not session.alive
+
+def test_session_restarts_after_process_dies(fake_exiftool):
+    """세션 프로세스가 죽으면 ExternalToolError가 발생하고, 다음 명령에서 새 프로세스로 다시 시작하는지 테스트합니다."""
+    session = ExiftoolSession(fake_exiftool)
+    try:
+        with pytest.raises(ExternalToolError):
+            session.execute(["CRASH"], timeout=10)
+        assert not session.alive
+        assert session.execute(["e.jpg"], timeout=10)[0] == "ran e.jpg\n"
+    finally:
+        session.close()
+
+def test_pool_timeout_is_external_tool_error(fake_exiftool, monkeypatch):
+    """상주 세션의 타임아웃이 ToolScheduler와 같이 ExternalToolError로 보고되고 통계에 남는지 테스트합니다."""
+    monkeypatch.setitem(get_scheduler().policies, "exiftool", ToolPolicy(max_concurrency=1, base_timeout=0.3, seconds_per_gb=0, max_timeout=0.3))
+    get_scheduler().reset_stats()
+    pool = ExiftoolSessionPool(fake_exiftool)
+    try:
+        started = time.perf_counter()
+        with pytest.raises(ExternalToolError):
+            pool.run([["HANG"]])
+        assert time.perf_counter() - started < 5 # 멈춘 세션은 종료 요청을 기다리지 않고 강제 종료
+        assert pool.run([["f.jpg"]])[0][0] == "ran f.jpg\n"
+        stats = get_scheduler().stats_snapshot()["exiftool"]
+        assert (stats["calls"], stats["timeouts"], stats["failures"]) == (2, 1, 1)
+    finally:
+        pool.close()
@@ -0,0 +1,87 @@
+# tests/test_external.py
+import sys
+import time
+import asyncio
+import threading
+import subprocess
+import pytest
+from src import external
+from src.external import ToolPolicy, ToolScheduler, run_tool_async
+from src.control import RunControl, set_active_control
+from src.errors import ExternalToolError, ProcessingCancelled
+
+SLEEP_COMMAND = [sys.executable, "-c", "import time; time.sleep(0.3)"]
+
+def test_timeout_scales_with_input_size():
+    """입력 크기에 비례해 타임아웃이 늘어나고 최대값을 넘지 않는지 테스트합니다."""
+    scheduler = ToolScheduler({"ffmpeg": ToolPolicy(max_concurrency=1, base_timeout=60, seconds_per_gb=30, max_timeout=900)})
+    assert scheduler.timeout_for("ffmpeg", 0) == 60
+    assert scheduler.timeout_for("ffmpeg", 20 * 1024 ** 3) == 660
+    assert scheduler.timeout_for("ffmpeg", 100 * 1024 ** 3) == 900
+
+def test_concurrency_is_limited_per_tool():
+    """도구별 동시 실행 수 제한이 지켜지는지 테스트합니다."""
+    scheduler = ToolScheduler({"slow": ToolPolicy(max_concurrency=2, base_timeout=30, seconds_per_gb=0, max_timeout=30)})
+    threads = [threading.Thread(target=scheduler.run, args=("slow", SLEEP_COMMAND)) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stats = scheduler.stats_snapshot()["slow"]
+    assert stats["calls"] == 5
+    assert stats["peak_concurrency"] == 2
+
+def test_timeout_fails_after_one_attempt():
+    """멈춘 도구는 재시도 없이 타임아웃 한 번 뒤 ExternalToolError로 실패하는지 테스트합니다."""
+    scheduler = ToolScheduler({"hang": ToolPolicy(max_concurrency=1, base_timeout=0.2, seconds_per_gb=0, max_timeout=0.2, retries=2)})
+    hanging = [sys.executable, "-c", "import time; time.sleep(30)"]
+    started = time.perf_counter()
+    with pytest.raises(ExternalToolError):
+        scheduler.run("hang", hanging)
+    assert time.perf_counter() - started < 5
+    stats = scheduler.stats_snapshot()["hang"]
+    assert (stats["calls"], stats["timeouts"], stats["retries"]) == (1, 1, 0)
+
+def test_async_run_shares_limits_stats_and_timeouts():
+    """run_async가 run과 같은 도구별 동시 실행 제한, 통계, 타임아웃 처리를 따르는지 테스트합니다."""
+    scheduler = ToolScheduler({
+        "slow": ToolPolicy(max_concurrency=2, base_timeout=30, seconds_per_gb=0, max_timeout=30),
+        "hang": ToolPolicy(max_concurrency=1, base_timeout=0.2, seconds_per_gb=0, max_timeout=0.2),
+    })
+
+    async def main():
+        results = await asyncio.gather(*(scheduler.run_async("slow", SLEEP_COMMAND) for _ in range(5)))
+        assert all(r.returncode == 0 for r in results)
+        with pytest.raises(ExternalToolError):
+            await scheduler.run_async("hang", [sys.executable, "-c", "import time; time.sleep(30)"])
+
+    started = time.perf_counter()
+    asyncio.run(main())
+    assert time.perf_counter() - started < 5
+    stats = scheduler.stats_snapshot()
+    assert (stats["slow"]["calls"], stats["slow"]["peak_concurrency"]) == (5, 2)
+    assert (stats["hang"]["calls"], stats["hang"]["timeouts"], stats["hang"]["failures"]) == (1, 1, 1)
+
+def test_async_run_is_terminated_on_cancel(monkeypatch):
+    """run_tool_async로 실행한 프로세스가 이벤트 루프 핸들로 등록되어 다른 스레드의 취소로 종료되는지 테스트합니다."""
+    registered = []
+    original = RunControl.register_process
+    monkeypatch.setattr(RunControl, "register_process", lambda self, proc: registered.append(type(proc)) or original(self, proc))
+    control = RunControl()
+    set_active_control(control)
+    try:
+        threading.Timer(0.2, control.cancel).start()
+        started = time.perf_counter()
+        with pytest.raises(ProcessingCancelled):
+            asyncio.run(run_tool_async([sys.executable, "-c", "import time; time.sleep(10)"], timeout=30))
+        assert time.perf_counter() - started < 5
+        assert registered == [external._AsyncProcessHandle]
+    finally:
+        set_active_control(None)
+
+def test_async_run_reports_exit_code():
+    """run_async가 실패한 명령에 대해 run과 같이 CalledProcessError와 출력을 돌려주는지 테스트합니다."""
+    command = [sys.executable, "-c", "import sys; print('out'); sys.exit(3)"]
+    with pytest.raises(subprocess.CalledProcessError) as error:
+        asyncio.run(ToolScheduler().run_async("python", command))
+    assert error.value.returncode == 3 and error.value.stdout.strip() == "out"
@@ -0,0 +1,76 @@
+# tests/test_hashing.py
+import json
+import queue
+import pytest
+from src import scanner
+from src.scanner import calculate_md5, calculate_sampled_hash
+from src.hash_collisions import analyze
+from src.orchestrator import process_files
+from tests.test_async_engine import _build_tree
+
+@pytest.fixture
+def small_samples(monkeypatch):
+    """표본 해시 설정을 작게 바꿔 작은 파일로 동작을 확인합니다."""
+    monkeypatch.setattr(scanner, "SAMPLED_HASH_MIN_SIZE", 4096)
+    monkeypatch.setattr(scanner, "SAMPLED_HASH_BLOCK_SIZE", 256)
+    monkeypatch.setattr(scanner, "SAMPLED_HASH_MIDDLE_BLOCKS", 4)
+
+def test_sampled_hash_reads_only_samples(tmp_path, small_samples):
+    """표본 밖의 변경은 같은 값, 표본 안의 변경과 크기 변경은 다른 값이 되는지 테스트합니다."""
+    base = bytes(range(256)) * 64 # 16 KiB
+    paths = {}
+    variants = {
+        "base": base,
+        "outside": base[:600] + b"\0" + base[601:], # 256~3200 사이 표본 밖
+        "head": b"X" + base[1:],
+        "tail": base[:-1] + b"X",
+        "longer": base + b"\0",
+    }
+    for name, data in variants.items():
+        paths[name] = tmp_path / f"{name}.mp4"
+        paths[name].write_bytes(data)
+    hashes = {name: calculate_sampled_hash(path) for name, path in paths.items()}
+    assert hashes["outside"] == hashes["base"]
+    assert len({hashes[name] for name in ("base", "head", "tail", "longer")}) == 4
+    small = tmp_path / "small.jpg"
+    small.write_bytes(base[:1000])
+    assert calculate_sampled_hash(small) == calculate_md5(small) # 작은 파일은 md5와 같음
+
+    report = analyze([tmp_path])
+    assert report["large_files"] == 5 and report["sampled_false_matches"] == 1
+
+def test_naming_hash_is_recorded_and_checked_on_resume(tmp_path):
+    """파일명 해시 방식이 매니페스트에 기록되고, 다른 방식으로 재개하면 중단하는지 테스트합니다."""
+    _build_tree(tmp_path)
+    process_files(str(tmp_path), queue.Queue(), naming_hash="sampled-v1")
+    manifest = json.loads((tmp_path / "result" / ".mdns_manifest.json").read_text(encoding="utf-8"))
+    assert manifest["naming_hash"] == "sampled-v1" and manifest["naming_hash_params"]["block_size"] == scanner.SAMPLED_HASH_BLOCK_SIZE
+
+    q = queue.Queue()
+    process_files(str(tmp_path), q, resume=True)
+    assert q.queue[-1][0] == 'error'
+
+def test_other_engines_refuse_tree_with_other_naming_hash(tmp_path):
+    """재개가 아니어도 결과물이 있는 다른 해시 방식의 결과 트리에는 이어서 쓰지 않는지 테스트합니다. (병렬/비동기/감시 모드)"""
+    import asyncio
+    from src.daemon import WatchDaemon
+    from src.errors import FileOperationError
+    from src.manifest import prepare_manifest, read_manifest
+    from src.async_engine import process_files_async
+    _build_tree(tmp_path)
+    result_root = tmp_path / "result"
+    process_files(str(tmp_path), queue.Queue(), naming_hash="sampled-v1")
+
+    with pytest.raises(FileOperationError):
+        prepare_manifest(result_root, "md5") # process_files_parallel이 재개 없이 호출하는 경로
+    q = queue.Queue()
+    asyncio.run(process_files_async(str(tmp_path), q))
+    assert q.queue[-1][0] == 'error'
+    with pytest.raises(FileOperationError):
+        WatchDaemon(str(tmp_path), queue.Queue(), settle_seconds=0, poll_interval=0, use_inotify=False)
+    WatchDaemon(str(tmp_path), queue.Queue(), settle_seconds=0, poll_interval=0, use_inotify=False, naming_hash="sampled-v1").close()
+    assert read_manifest(result_root)["naming_hash"] == "sampled-v1"
+
+    empty_root = tmp_path / "empty_result"
+    prepare_manifest(empty_root, "sampled-v1")
+    assert prepare_manifest(empty_root, "md5")["naming_hash"] == "md5" # 결과물이 없으면 덮어씀
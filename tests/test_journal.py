@@ -0,0 +1,61 @@
+# tests/test_journal.py
+import queue
+from src.journal import RunJournal, reconcile_partial_outputs, STAGE_OUTPUT, STAGE_DONE
+from src.orchestrator import process_files
+
+def test_journal_ignores_truncated_line(tmp_path):
+    """기록 도중 끊긴 마지막 줄은 무시하고 완료된 단계만 불러오는지 테스트합니다."""
+    journal = RunJournal(tmp_path)
+    journal.record("a/x.jpg", STAGE_OUTPUT, path="p")
+    journal.record("a/x.jpg", STAGE_DONE, path="q", offset_scope=None)
+    journal.close()
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"key": "a/y.jpg", "sta')
+
+    resumed = RunJournal(tmp_path, resume=True)
+    assert resumed.is_done("a/x.jpg")
+    assert not resumed.is_done("a/y.jpg")
+    resumed.close()
+
+def test_reconcile_removes_partial_outputs(tmp_path):
+    """미완료 결과물과 ffmpeg 임시 파일, ExifTool 백업 파일을 정리하는지 테스트합니다."""
+    (tmp_path / "clip.mp4").write_bytes(b"partial")
+    (tmp_path / "temp_clip.mp4").write_bytes(b"temp")
+    (tmp_path / "IMG_1.cr3_original").write_bytes(b"backup")
+    journal = RunJournal(tmp_path)
+    journal.record("clip.mp4", STAGE_OUTPUT, path=str(tmp_path / "clip.mp4"))
+
+    assert reconcile_partial_outputs(journal, queue.Queue()) == 3
+    journal.close()
+    assert sorted(p.name for p in tmp_path.iterdir()) == [".mdns_journal.jsonl"]
+
+def test_resume_does_not_reprocess_completed_files(tmp_path):
+    """재개 모드에서 완료된 파일을 다시 처리하지 않아 중복 접미사가 생기지 않는지 테스트합니다."""
+    (tmp_path / "no_date").mkdir()
+    (tmp_path / "no_date" / "DSC0001.jpg").write_text("content")
+    process_files(str(tmp_path), queue.Queue())
+    first = sorted(p.name for p in (tmp_path / "result" / "no_date").iterdir())
+
+    events = queue.Queue()
+    process_files(str(tmp_path), events, resume=True)
+    assert sorted(p.name for p in (tmp_path / "result" / "no_date").iterdir()) == first
+    # 이전 실행의 결과물을 새 소스로 다시 스캔하지 않음
+    assert not (tmp_path / "result" / "result").exists()
+    assert sorted(p.relative_to(tmp_path / "result").as_posix() for p in (tmp_path / "result").rglob("*") if not p.name.startswith(".")) == ["no_date"] + [f"no_date/{n}" for n in first]
+    assert "총 1개의 처리 대상 파일을 찾았습니다." in [e[1] for e in events.queue]
+
+def test_reconcile_removes_outputs_of_interrupted_rename_plan(tmp_path):
+    """파일명 변경 계획 적용 중 중단된 경우, 완료 기록이 없는 파일의 최종 이름 결과물만 정리하는지 테스트합니다."""
+    (tmp_path / "IMG_AAAAA.jpg").write_bytes(b"done")
+    (tmp_path / "IMG_BBBBB.jpg").write_bytes(b"renamed but not done")
+    journal = RunJournal(tmp_path)
+    journal.record_rename_plan(tmp_path, [("a.jpg", str(tmp_path / ".mdns_stage_0_a.jpg"), str(tmp_path / "IMG_AAAAA.jpg")),
+                                          ("b.jpg", str(tmp_path / ".mdns_stage_1_b.jpg"), str(tmp_path / "IMG_BBBBB.jpg"))])
+    journal.record("a.jpg", STAGE_DONE, path=str(tmp_path / "IMG_AAAAA.jpg"), offset_scope=None)
+    journal.close()
+
+    resumed = RunJournal(tmp_path, resume=True)
+    assert [key for key, _ in resumed.incomplete_items()] == []
+    assert reconcile_partial_outputs(resumed, queue.Queue()) == 1
+    resumed.close()
+    assert sorted(p.name for p in tmp_path.iterdir()) == [".mdns_journal.jsonl", "IMG_AAAAA.jpg"]
@@ -0,0 +1,33 @@
+# tests/test_metadata_registry.py
+import subprocess
+import sys
+from src.metadata.base import get_metadata_processor, reset_processor_cache
+
+def test_processor_instances_are_reused_per_run():
+    """같은 형식의 프로세서는 reset 전까지 같은 인스턴스를 재사용하는지 테스트합니다."""
+    reset_processor_cache()
+    first = get_metadata_processor('.jpg')
+    assert get_metadata_processor('.JPEG') is first
+    reset_processor_cache()
+    assert get_metadata_processor('.jpg') is not first
+    assert get_metadata_processor('.png') is None
+
+def test_orchestrator_import_is_lazy():
+    """orchestrator 임포트만으로는 Pillow/piexif가 로드되지 않는지 테스트합니다."""
+    probe = "import sys, src.orchestrator; print('PIL' in sys.modules, 'piexif' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+    assert out.stdout.split() == ["False", "False"]
+
+def test_exiftool_backend_is_selected_per_extension(monkeypatch):
+    """확장자별 백엔드 선택이 get_metadata_processor의 조회와 워커용 환경 변수에 반영되는지 테스트합니다."""
+    from src.metadata import base
+    monkeypatch.setattr(base, "_backend_overrides", {})
+    monkeypatch.delenv(base.BACKEND_ENV_VAR, raising=False)
+    base.set_metadata_backend('exiftool', ['.mp4'])
+    try:
+        assert base.resolve_processor_entry('.MP4') == ('exiftool_unified', 'ExiftoolUnifiedProcessor')
+        assert base.resolve_processor_entry('.jpg') == ('jpg_piexif', 'JpgPiexifProcessor')
+        assert base._load_backend_overrides() == {'.mp4': 'exiftool'}
+    finally:
+        base.set_metadata_backend(None, ['.mp4'])
+    assert base.resolve_processor_entry('.mp4') == ('video_ffmpeg', 'VideoFfmpegProcessor')
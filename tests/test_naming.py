@@ -1,4 +1,5 @@
 # tests/test_naming.py
+import os
 import pytest
 from src.naming import PASS_REGEX, standardize_filename
 
@@ -35,3 +36,68 @@ def test_duplicate_suffix_logic(tmp_path):
     # - 동일한 이름의 파일을 여러 개 생성 시도
     # - ...1, ...2, ...3 과 같이 생성되는지 확인
     pass
+
+def test_name_index_matches_filesystem_checks(tmp_path):
+    """NameIndex를 사용한 중복 처리가 os.path.exists 기반 처리와 같은 이름을 만드는지 테스트합니다."""
+    from src.naming import NameIndex, handle_duplicates_and_rename
+    (tmp_path / "IMG_A1B2C.jpg").write_text("existing")
+    (tmp_path / "IMG_A1B2C1.jpg").write_text("existing")
+    (tmp_path / "new.jpg").write_text("new")
+    index = NameIndex.from_directory(tmp_path)
+
+    final_path = handle_duplicates_and_rename(str(tmp_path / "new.jpg"), "IMG_A1B2C.jpg", {}, name_index=index)
+    assert final_path.endswith("IMG_A1B2C2.jpg")
+    assert "IMG_A1B2C2.jpg" in index and "new.jpg" not in index
+
+def test_batch_plan_matches_sequential_calls(tmp_path):
+    """배치 이름 계획이 채워진 디렉토리에 standardize_filename을 순서대로 호출한 결과와 같은지 테스트합니다."""
+    from src.naming import NameIndex, RenameRequest, plan_batch_renames, apply_rename_plan
+    existing = ["IMG_AAAAA.jpg", "IMG_AAAAA2.jpg", "IMG_12.jpg"]
+    files = [("DSC1.jpg", "aaaaa1"), ("img_12.jpg", "x"), ("DSC2.jpg", "aaaaa2"), ("IMG_AAAAA1.jpg", "y"),
+             ("DSC3.JPG", "aaaaa3"), ("IMG_12.JPG", "z"), ("photo.jpg", "12000")]
+    for root in (tmp_path / "seq", tmp_path / "batch"):
+        root.mkdir()
+        for name in existing + [name for name, _ in files]:
+            (root / name).write_text(name)
+
+    seq_summary, seq_index = {}, NameIndex.from_directory(tmp_path / "seq")
+    expected = [os.path.basename(standardize_filename(str(tmp_path / "seq" / name), content_hash, seq_summary, name_index=seq_index))
+                for name, content_hash in files]
+
+    batch_summary, batch_index = {}, NameIndex.from_directory(tmp_path / "batch")
+    plan = plan_batch_renames([RenameRequest(name, content_hash) for name, content_hash in files], batch_index, batch_summary)
+    apply_rename_plan(tmp_path / "batch", plan)
+
+    assert [entry.final_name for entry in plan] == expected
+    assert batch_summary == seq_summary
+    assert sorted(os.listdir(tmp_path / "batch")) == sorted(os.listdir(tmp_path / "seq"))
+    assert expected[0] == "IMG_AAAAA3.jpg" # 기존 접미사를 건너뛰는 경우가 실제로 발생
+
+def test_batch_plan_many_identical_names_is_linear():
+    """같은 이름을 원하는 파일이 많아도 접미사 탐색을 처음부터 반복하지 않는지 테스트합니다."""
+    from src.naming import NameIndex, RenameRequest, plan_batch_renames
+    requests = [RenameRequest(f".mdns_stage_{i}_DSC{i}.jpg", "abcde") for i in range(3000)]
+    index = NameIndex(r.current_name for r in requests)
+    probes = []
+    original_contains = NameIndex.__contains__
+    NameIndex.__contains__ = lambda self, name: probes.append(name) or original_contains(self, name)
+    try:
+        plan = plan_batch_renames(requests, index, {})
+    finally:
+        NameIndex.__contains__ = original_contains
+    assert plan[0].final_name == "IMG_ABCDE.jpg" and plan[-1].final_name == "IMG_ABCDE2999.jpg"
+    assert len(probes) < 3 * len(requests)
+
+def test_apply_rename_plan_rolls_back_on_conflict(tmp_path):
+    """계획 후 다른 파일이 최종 이름을 차지하면 덮어쓰지 않고 적용분을 되돌리는지 테스트합니다."""
+    from src.naming import NameIndex, RenameRequest, plan_batch_renames, apply_rename_plan
+    from src.errors import NameConflictError
+    for name in ("DSC1.jpg", "DSC2.jpg"):
+        (tmp_path / name).write_text(name)
+    plan = plan_batch_renames([RenameRequest("DSC1.jpg", "aaaaa1"), RenameRequest("DSC2.jpg", "bbbbb2")], NameIndex.from_directory(tmp_path), {})
+    (tmp_path / plan[1].final_name).write_text("foreign") # 계획과 적용 사이에 다른 프로세스가 생성
+
+    with pytest.raises(NameConflictError):
+        apply_rename_plan(tmp_path, plan)
+    assert sorted(os.listdir(tmp_path)) == sorted(["DSC1.jpg", "DSC2.jpg", plan[1].final_name])
+    assert (tmp_path / plan[1].final_name).read_text() == "foreign"
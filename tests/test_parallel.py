@@ -0,0 +1,32 @@
+# tests/test_parallel.py
+import queue
+from src.orchestrator import process_files
+from src.parallel import process_files_parallel
+from src.context import OffsetAllocator
+from tests.test_async_engine import _build_tree, _snapshot
+
+def test_offset_allocator_is_order_independent():
+    """완료 순서와 관계없이 스코프의 정렬 순서대로 오프셋이 할당되는지 테스트합니다."""
+    allocator = OffsetAllocator()
+    for index in range(4):
+        allocator.register("scope", index)
+    assert allocator.ready("scope", 2) == [] # 앞 파일이 준비되지 않음
+    assert allocator.ready("scope", 1, needs_offset=False) == []
+    assert allocator.ready("scope", 0) == [(0, 0)]
+    assert allocator.complete("scope", 0, used_offset=True) == [(2, 1)] # 1은 건너뜀
+    assert allocator.ready("scope", 3) == []
+    assert allocator.complete("scope", 2, used_offset=False) == [(3, 1)]
+
+def test_process_pool_engine_matches_sequential(tmp_path):
+    """프로세스 풀 엔진의 결과(파일명, 시간 오프셋)와 요약이 순차 실행과 같은지 테스트합니다."""
+    _build_tree(tmp_path / "seq")
+    _build_tree(tmp_path / "parallel")
+    seq_queue = queue.Queue()
+    process_files(str(tmp_path / "seq"), seq_queue)
+    q = queue.Queue()
+    process_files_parallel(str(tmp_path / "parallel"), q, workers=2)
+
+    assert _snapshot(tmp_path / "parallel") == _snapshot(tmp_path / "seq")
+    assert q.queue[-1][0] == 'done'
+    reports = [[e[1] for e in events if e[0] == 'log' and e[1].startswith("--- 처리 요약")][-1] for events in (seq_queue.queue, q.queue)]
+    assert reports[0].split("\n")[:14] == reports[1].split("\n")[:14]
@@ -0,0 +1,106 @@
+# tests/test_planner.py
+import os
+import queue
+import sys
+import piexif
+import pytest
+from collections import defaultdict
+from PIL import Image
+from src.scanner import FileInfo
+from src.date_resolver import resolve_date
+from src.steps import handle_conversion_or_copy, _handle_metadata
+from src.planner import plan_output, produce_planned
+from src.logging_i18n import get_log_message
+
+def _run_both(tmp_path, name):
+    """같은 원본을 기존 순서(복사/변환 후 메타데이터)와 계획 실행으로 처리하여 (계획, 기존 결과, 새 결과, 요약들)을 반환합니다."""
+    source = FileInfo(tmp_path / "src" / "2026-01-05" / name, tmp_path / "src")
+    date_info = resolve_date(source.absolute_path)
+    outputs, summaries = [], []
+    for label in ("old", "new"):
+        result_dir = tmp_path / label
+        result_dir.mkdir(exist_ok=True)
+        summary, counters = defaultdict(int), defaultdict(int)
+        if label == "old":
+            path = handle_conversion_or_copy(source, result_dir, summary, queue.Queue())
+            _handle_metadata(path, date_info, counters, summary, queue.Queue())
+        else:
+            plan = plan_output(source, date_info, counters)
+            path, _ = produce_planned(source, plan, result_dir, date_info, counters, summary, queue.Queue())
+        outputs.append(path.read_bytes())
+        summaries.append((dict(summary), dict(counters)))
+    return plan, outputs, summaries
+
+def test_planned_output_matches_copy_then_write(tmp_path):
+    """원본에서 미리 판정하고 한 번에 기록한 결과가 복사/변환 후 기록한 결과와 같은지 테스트합니다."""
+    folder = tmp_path / "src" / "2026-01-05"
+    folder.mkdir(parents=True)
+    Image.new("RGB", (16, 16), (10, 20, 30)).save(folder / "a.jpg")
+    Image.new("RGBA", (16, 16), (10, 20, 30, 128)).save(folder / "b.png")
+    exif = piexif.dump({"Exif": {piexif.ExifIFD.DateTimeOriginal: b"2026:01:05 12:00:00"}})
+    Image.new("RGB", (16, 16), (10, 20, 30)).save(folder / "c.jpg", exif=exif)
+
+    for name, decision in (("a.jpg", "set"), ("b.png", "set"), ("c.jpg", "pass")):
+        plan, (old, new), (old_summary, new_summary) = _run_both(tmp_path, name)
+        assert plan.metadata == decision
+        assert new == old
+        assert new_summary == old_summary
+
+# 가짜 ImageMagick: 원본(테스트에서는 JPEG)을 그대로 결과 경로 또는 표준 출력(jpg:-)으로 내보내고 인자를 기록
+FAKE_MAGICK = """
+import sys
+with open(sys.argv[0] + ".calls", "a") as log:
+    log.write(" ".join(sys.argv[1:]) + "\\n")
+data = open(sys.argv[2], "rb").read()
+if sys.argv[3] == "jpg:-":
+    sys.stdout.buffer.write(data)
+else:
+    open(sys.argv[3], "wb").write(data)
+"""
+
+@pytest.mark.skipif(sys.platform == "win32", reason="셔뱅 스크립트로 가짜 도구를 만듦")
+def test_heic_is_written_once_with_date(tmp_path, monkeypatch):
+    """HEIC 변환 결과를 표준 출력으로 받아 날짜를 넣으며 한 번에 기록하고, 결과가 변환 후 기록한 것과 같은지 테스트합니다."""
+    magick = tmp_path / "magick"
+    magick.write_text(f"#!{sys.executable}\n{FAKE_MAGICK}")
+    os.chmod(magick, 0o755)
+    monkeypatch.setattr("src.convert.image_to_jpg.get_magick_path", lambda: str(magick))
+    folder = tmp_path / "src" / "2026-01-05"
+    folder.mkdir(parents=True)
+    Image.new("RGB", (16, 16), (10, 20, 30)).save(folder / "d.heic", format="JPEG")
+    exif = piexif.dump({"Exif": {piexif.ExifIFD.DateTimeOriginal: b"2026:01:05 12:00:00"}})
+    Image.new("RGB", (16, 16), (10, 20, 30)).save(folder / "e.heic", format="JPEG", exif=exif)
+
+    for name, changed in (("d.heic", 1), ("e.heic", 0)):
+        plan, (old, new), (old_summary, new_summary) = _run_both(tmp_path, name)
+        assert plan.metadata == "decide"
+        assert new == old
+        assert new_summary == old_summary
+        assert new_summary[0].get("metadata_changed", 0) == changed
+    calls = (tmp_path / "magick.calls").read_text().splitlines()
+    assert [call.split()[-1] == "jpg:-" for call in calls] == [False, True, False, True] # 기존 순서, 계획 실행
+
+def test_unsupported_reason_is_logged_like_copy_then_write(tmp_path):
+    """날짜 정보의 reason이 unsupported_format이면 기존 순서와 같이 META_FAIL_UNSUPPORTED로 기록되는지 테스트합니다."""
+    folder = tmp_path / "src"
+    folder.mkdir()
+    Image.new("RGB", (16, 16), (10, 20, 30)).save(folder / "a.jpg")
+    source = FileInfo(folder / "a.jpg", folder)
+    date_info = {"found": False, "reason": "unsupported_format"}
+    logs, summaries = [], []
+    for label in ("old", "new"):
+        result_dir = tmp_path / label
+        result_dir.mkdir()
+        events, summary, counters = queue.Queue(), defaultdict(int), defaultdict(int)
+        if label == "old":
+            path = handle_conversion_or_copy(source, result_dir, summary, events)
+            _handle_metadata(path, date_info, counters, summary, events)
+        else:
+            plan = plan_output(source, date_info, counters)
+            assert plan.metadata == 'unsupported'
+            produce_planned(source, plan, result_dir, date_info, counters, summary, events)
+        logs.append([e[1] for e in events.queue])
+        summaries.append(dict(summary))
+    assert logs[0] == logs[1]
+    assert any(get_log_message('META_FAIL_UNSUPPORTED') in line for line in logs[1])
+    assert summaries[0] == summaries[1]
@@ -0,0 +1,75 @@
+# tests/test_preflight.py
+import asyncio
+import os
+import queue
+import sys
+
+import pytest
+
+from src import paths
+from src.metadata import base
+from src.orchestrator import process_files
+from src.parallel import process_files_parallel
+from src.async_engine import process_files_async
+from src.logging_i18n import get_log_message
+from src.preflight import Preflight, required_tools
+
+def test_required_tools_follow_processor_and_conversion():
+    assert required_tools('.mp4') == ('ffmpeg', 'ffprobe')
+    assert required_tools('.heic') == ('magick',)
+    assert required_tools('.jpg') == ()
+    base.set_metadata_backend('exiftool', ['.jpg'])
+    try:
+        assert required_tools('.png') == ('exiftool',)
+        assert required_tools('.heic') == ('magick', 'exiftool')
+    finally:
+        base.set_metadata_backend(None, ['.jpg'])
+
+def _run_sequential(source, events):
+    process_files(source, events)
+
+def _run_parallel(source, events):
+    process_files_parallel(source, events, workers=2)
+
+def _run_async(source, events):
+    asyncio.run(process_files_async(source, events))
+
+@pytest.mark.parametrize("run", [_run_sequential, _run_parallel, _run_async])
+def test_missing_tools_skip_only_metadata_with_one_error_entry(tmp_path, monkeypatch, run):
+    """필요한 외부 도구가 없는 형식도 결과 폴더로 복사하고, 메타데이터 보정만 건너뛰며 오류 로그는 한 항목만 남기는지 테스트합니다."""
+    monkeypatch.chdir(tmp_path) # error.log 위치
+    monkeypatch.setattr("src.preflight.check_binaries", lambda: list(paths.VERSION_ARGS)) # 도구가 설치된 환경에서도 없다고 가정
+    source = tmp_path / "src"
+    (source / "2026-01-05_trip").mkdir(parents=True)
+    for name in ("a.jpg", "b.mp4", "c.mov", "d.cr3", "e.heic"):
+        (source / "2026-01-05_trip" / name).write_bytes(name.encode())
+    assert Preflight().unavailable('.cr3') == ('exiftool',)
+
+    events = queue.Queue()
+    run(str(source), events)
+    messages = [e[1] for e in list(events.queue) if e[0] == 'log']
+    report = next(m for m in messages if m.startswith("--- 처리 요약"))
+    assert "외부 도구가 없어 메타데이터 보정을 건너뛴 파일 수: 4" in report
+    assert "처리 실패 파일 수: 0" in report
+    assert "변환 실패 파일 수: 0" in report
+    # 동영상, RAW, 변환 도구가 없는 HEIC(원본 그대로)까지 결과 폴더에 있어야 함
+    outputs = sorted(p.suffix.lower() for p in (source / "result" / "2026-01-05_trip").iterdir())
+    assert outputs == [".cr3", ".heic", ".jpg", ".mov", ".mp4"]
+    assert sum(get_log_message('META_FAIL_UNSUPPORTED') in m for m in messages) == 4
+    error_log = (tmp_path / "logs" / "error.log").read_text(encoding="utf-8")
+    assert error_log.count("Stage: PREFLIGHT") == 1
+    assert "MAIN_PIPELINE" not in error_log
+
+@pytest.mark.skipif(sys.platform == "win32", reason="셔뱅 스크립트로 가짜 도구를 만듦")
+def test_tool_installed_during_session_is_found(tmp_path, monkeypatch):
+    """GUI 시작 시 없던 도구를 같은 세션에서 설치하면 다음 실행의 사전 확인에서 찾는지 테스트합니다."""
+    fake = tmp_path / "exiftool"
+    monkeypatch.setattr(paths, "get_exiftool_path", lambda: str(fake))
+    monkeypatch.setitem(paths._BINARY_GETTERS, "exiftool", lambda: str(fake))
+    assert paths.get_binary_versions()["exiftool"] is None # 시작 작업(StartupTasks)의 확인
+    assert Preflight().unavailable('.cr3') == ('exiftool',)
+
+    fake.write_text(f"#!{sys.executable}\nprint('12.76')\n")
+    os.chmod(fake, 0o755)
+    assert Preflight().unavailable('.cr3') == ()
+    assert paths.get_binary_versions()["exiftool"] == "12.76"
@@ -0,0 +1,43 @@
+# tests/test_records.py
+import queue
+from src.orchestrator import process_files
+from src.records import RecordWriter, aggregate, find_records, main, ACTION_BITS, RECORDS_FILENAME
+
+def test_record_writer_row_groups_and_truncated_tail(tmp_path):
+    """여러 행 그룹에 걸친 레코드가 그대로 읽히고, 끊긴 마지막 그룹은 재개 시 잘려나가는지 테스트합니다."""
+    writer = RecordWriter(tmp_path, row_group_size=3)
+    for i in range(7):
+        writer.append(f"src/{i}.jpg", str(tmp_path / f"IMG_{i}.jpg"), ACTION_BITS["COPY_TO_RESULT"], i * 10)
+    writer.close()
+    with open(writer.path, 'ab') as f:
+        f.write(b"\x03\x00\x00\x00\x10") # 헤더 도중 끊긴 그룹
+
+    report = aggregate(writer.path, top=2)
+    assert report["files"] == 7
+    assert report["actions"]["COPY_TO_RESULT"] == 7
+    assert report["slowest"] == [(60, "src/6.jpg"), (50, "src/5.jpg")]
+
+    writer = RecordWriter(tmp_path, resume=True)
+    writer.append("src/7.jpg", None, ACTION_BITS["FAILED"], 5)
+    writer.close()
+    rows = list(find_records(writer.path))
+    assert len(rows) == 8
+    assert rows[3] == ("src/3.jpg", "IMG_3.jpg", ["COPY_TO_RESULT"], 30)
+    assert rows[-1] == ("src/7.jpg", "", ["FAILED"], 5)
+
+def test_pipeline_records_where_each_file_went(tmp_path, capsys):
+    """파이프라인이 소스별 결과 경로와 결과 코드를 기록하고, 조회 도구로 찾을 수 있는지 테스트합니다."""
+    (tmp_path / "no_date").mkdir()
+    (tmp_path / "no_date" / "DSC0001.jpg").write_text("content")
+    (tmp_path / "no_date" / "img_0002.jpg").write_text("content 2")
+
+    process_files(str(tmp_path), queue.Queue())
+
+    records_path = tmp_path / "result" / RECORDS_FILENAME
+    rows = {source: (output, actions) for source, output, actions, _ in find_records(records_path)}
+    assert rows["no_date/img_0002.jpg"] == ("no_date/IMG_0002.jpg", ["COPY_TO_RESULT", "META_SKIP_NO_DATE", "NAME_SET_UPPERCASE"])
+    output, actions = rows["no_date/DSC0001.jpg"]
+    assert output.startswith("no_date/IMG_") and "NAME_SET_HASH" in actions
+
+    main([str(tmp_path / "result"), "--find", "DSC0001"])
+    assert "no_date/DSC0001.jpg -> no_date/IMG_" in capsys.readouterr().out
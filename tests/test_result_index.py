@@ -0,0 +1,49 @@
+# tests/test_result_index.py
+import queue
+
+from src import result_index
+from src.orchestrator import process_files
+from src.records import RecordWriter, ACTION_BITS
+from src.result_index import ResultIndex, build_index, main, INDEX_FILENAME
+
+def _write_records(result_root):
+    writer = RecordWriter(result_root, row_group_size=2)
+    copied = ACTION_BITS["COPY_TO_RESULT"]
+    writer.append("a/1.jpg", str(result_root / "a" / "IMG_00001.jpg"), copied, 1)
+    writer.append("a/2.jpg", None, ACTION_BITS["FAILED"], 1)
+    writer.append("a/3.jpg", str(result_root / "a" / "IMG_00001.jpg"), ACTION_BITS["DEDUP_HARDLINK"], 1)
+    writer.append("b/4.jpg", str(result_root / "b" / "IMG_00004.jpg"), copied, 1)
+    writer.append("a/1.jpg", str(result_root / "a" / "IMG_00001_1.jpg"), ACTION_BITS["RESUMED"], 1) # 재개 시 다시 기록
+    writer.close()
+
+def test_lookup_both_directions(tmp_path):
+    _write_records(tmp_path)
+    assert build_index(tmp_path) == 4
+    with ResultIndex(tmp_path) as index:
+        assert len(index) == 4
+        assert index.output_for("a/1.jpg") == "a/IMG_00001_1.jpg"
+        assert index.output_for("a/2.jpg") is None
+        assert index.output_for("missing.jpg") is None
+        assert index.sources_for("a/IMG_00001.jpg") == ["a/1.jpg", "a/3.jpg"]
+        assert index.sources_for("b/IMG_00004.jpg") == ["b/4.jpg"]
+
+def test_hash_collisions_are_resolved_by_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_index, "path_hash", lambda path: 7)
+    _write_records(tmp_path)
+    build_index(tmp_path)
+    with ResultIndex(tmp_path / INDEX_FILENAME) as index:
+        assert index.output_for("b/4.jpg") == "b/IMG_00004.jpg"
+        assert index.sources_for("a/IMG_00001_1.jpg") == ["a/1.jpg"]
+
+def test_pipeline_writes_index_and_cli_finds_files(tmp_path, capsys):
+    (tmp_path / "no_date").mkdir()
+    (tmp_path / "no_date" / "img_0002.jpg").write_text("content 2")
+    process_files(str(tmp_path), queue.Queue())
+
+    result_root = tmp_path / "result"
+    assert (result_root / INDEX_FILENAME).exists()
+    assert main([str(result_root), "--source", "no_date/img_0002.jpg", "--output", str(result_root / "no_date" / "IMG_0002.jpg")]) == 0
+    out = capsys.readouterr().out
+    assert "no_date/img_0002.jpg -> no_date/IMG_0002.jpg" in out
+    assert "no_date/IMG_0002.jpg <- no_date/img_0002.jpg" in out
+    assert main([str(result_root), "--source", "nope.jpg"]) == 1
@@ -0,0 +1,13 @@
+# tests/test_scanner.py
+import hashlib
+import pytest
+from src.scanner import calculate_md5
+
+@pytest.mark.parametrize("size", [0, 1, 8191, 1024 * 1024 + 7])
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_calculate_md5_matches_hashlib(tmp_path, size, use_mmap):
+    """버퍼/mmap 경로 모두 hashlib 결과와 동일한지 테스트합니다."""
+    data = bytes(i % 251 for i in range(size))
+    file_path = tmp_path / "sample.bin"
+    file_path.write_bytes(data)
+    assert calculate_md5(file_path, chunk_size=4096, use_mmap=use_mmap) == hashlib.md5(data).hexdigest()
@@ -0,0 +1,25 @@
+# tests/test_scheduling.py
+from src.scanner import FileInfo
+from src.scheduling import ByteProgress, order_by_cost
+
+def _files(tmp_path, names):
+    return [FileInfo(tmp_path / name, tmp_path) for name in names]
+
+def test_order_by_cost_starts_slow_items_first(tmp_path):
+    """큰 동영상/HEIC가 먼저 시작되고, 같은 스코프에서 앞선 파일은 큰 파일의 우선순위를 물려받는지 테스트합니다."""
+    files = _files(tmp_path, ["a.jpg", "b.jpg", "c.mp4", "d.heic", "e.jpg"])
+    sizes = [1_000_000, 1_000_000, 3_000_000_000, 50_000_000, 2_000_000]
+    assert order_by_cost(files, sizes) == [2, 3, 4, 0, 1]
+    # a, b가 c와 같은 스코프: 메타데이터 순서를 위해 c보다 먼저(정렬 순서대로) 시작
+    assert order_by_cost(files, sizes, ["s", "s", "s", None, None]) == [0, 1, 2, 3, 4]
+
+def test_byte_progress_reports_bytes_and_eta():
+    """진행률이 파일 수가 아닌 바이트 기준이며 처리 속도로 남은 시간을 계산하는지 테스트합니다."""
+    now = [0.0]
+    progress = ByteProgress(total_files=4, total_bytes=1000, clock=lambda: now[0])
+    assert "계산 중" in progress.text()
+    now[0] = 10.0
+    percent, text = progress.add(250)
+    assert percent == 25.0
+    assert progress.eta_seconds() == 30.0
+    assert text.startswith("1/4개") and "남은 시간 약 30초" in text
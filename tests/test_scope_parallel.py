@@ -0,0 +1,58 @@
+# tests/test_scope_parallel.py
+import queue
+
+import piexif
+import pytest
+from PIL import Image
+
+from src.orchestrator import process_files
+from src.records import find_records, RECORDS_FILENAME
+from src.scanner import scan_files
+from src.scope_parallel import group_by_scope
+from tests.test_async_engine import _build_tree, _snapshot
+
+def _build_scopes(root):
+    """_build_tree + 날짜가 이미 맞는 파일(오프셋을 쓰지 않음)과 PNG가 섞인 스코프."""
+    _build_tree(root)
+    scope = root / "2026-03-10 party"
+    scope.mkdir()
+    exif = piexif.dump({"Exif": {piexif.ExifIFD.DateTimeOriginal: b"2026:03:10 20:00:00"}})
+    for i in range(6):
+        image = Image.new("RGB", (8, 8), (i * 40, 10, 10))
+        if i % 3 == 0:
+            image.save(scope / f"P{i}.jpg", exif=exif) # 날짜 일치: PASS
+        elif i % 3 == 1:
+            image.save(scope / f"P{i}.png")
+        else:
+            image.save(scope / f"P{i}.jpg")
+
+def test_scope_groups_keep_directories_together(tmp_path):
+    _build_scopes(tmp_path)
+    files = sorted(scan_files(str(tmp_path)), key=lambda x: (str(x.relative_path), x.filename.lower()))
+    groups = group_by_scope(files)
+    assert sorted(len(g) for g in groups) == [5, 5, 6, 10] # 여행/inner는 상위 날짜 스코프에 포함
+    for group in groups:
+        assert group == [f for f in files if f in group] # 정렬 순서 유지
+
+def test_scope_parallel_matches_sequential(tmp_path):
+    """스코프 병렬 처리의 결과(파일명, 시간 오프셋), 요약, 결과 레코드가 순차 실행과 같은지 검증합니다."""
+    _build_scopes(tmp_path / "seq")
+    _build_scopes(tmp_path / "scopes")
+    seq_queue, q = queue.Queue(), queue.Queue()
+    process_files(str(tmp_path / "seq"), seq_queue)
+    process_files(str(tmp_path / "scopes"), q, scope_workers=3)
+
+    expected = _snapshot(tmp_path / "seq")
+    assert _snapshot(tmp_path / "scopes") == expected
+    party_dates = sorted(date for name, date in expected if "party" in name)
+    assert party_dates[-3:] == [b"2026:03:10 09:00:03", b"2026:03:10 20:00:00", b"2026:03:10 20:00:00"] # PASS는 오프셋을 쓰지 않음
+    assert q.queue[-1][0] == 'done'
+    reports = [[e[1] for e in events if e[0] == 'log' and e[1].startswith("--- 처리 요약")][-1] for events in (seq_queue.queue, q.queue)]
+    assert reports[0].split("\n")[:14] == reports[1].split("\n")[:14]
+    records = [sorted((s, o, tuple(a)) for s, o, a, _ in find_records(root / "result" / RECORDS_FILENAME)) for root in (tmp_path / "seq", tmp_path / "scopes")]
+    assert records[0] == records[1]
+    assert q.queue[-2][0] == 'log' and [e for e in q.queue if e[0] == 'progress'][-1][1] == 100
+
+def test_scope_workers_reject_dedup(tmp_path):
+    with pytest.raises(ValueError):
+        process_files(str(tmp_path), queue.Queue(), dedup_mode='skip', scope_workers=2)
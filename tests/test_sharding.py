@@ -0,0 +1,37 @@
+# tests/test_sharding.py
+import queue
+from src.orchestrator import process_files
+from src.scanner import scan_files
+from src.records import aggregate
+from src.sharding import assign_shards, partition_key, run_local_shards
+from tests.test_async_engine import _build_tree, _snapshot
+
+def test_assign_shards_keeps_scopes_together(tmp_path):
+    """같은 날짜 스코프(하위 폴더 포함)의 파일이 모두 한 샤드에 배정되는지 테스트합니다."""
+    _build_tree(tmp_path)
+    file_list = sorted(scan_files(str(tmp_path)), key=lambda x: (str(x.relative_path), x.filename.lower()))
+    shards = assign_shards(file_list, 3)
+    by_key = {}
+    for file_info, shard in zip(file_list, shards):
+        by_key.setdefault(partition_key(file_info), set()).add(shard)
+    assert all(len(s) == 1 for s in by_key.values())
+    assert len(by_key) == 3 and len(set(shards)) == 3 # 스코프 2개 + 날짜 없는 폴더
+    assert assign_shards(file_list, 3) == shards
+
+def test_local_shards_match_sequential(tmp_path):
+    """샤드 작업자를 로컬에서 실행하고 합친 결과가 순차 실행과 같은지 테스트합니다."""
+    _build_tree(tmp_path / "seq")
+    _build_tree(tmp_path / "sharded")
+    process_files(str(tmp_path / "seq"), queue.Queue())
+    q = queue.Queue()
+    run_local_shards(str(tmp_path / "sharded"), 2, q)
+
+    assert q.queue[-1][0] == 'done'
+    assert _snapshot(tmp_path / "sharded") == _snapshot(tmp_path / "seq")
+    merged = aggregate(tmp_path / "sharded" / "result" / ".mdns_records.bin")
+    assert merged["files"] == aggregate(tmp_path / "seq" / "result" / ".mdns_records.bin")["files"] == 20
+
+    # 합친 저널로 일반 모드 재개 시 모든 파일을 건너뜀
+    resumed = queue.Queue()
+    process_files(str(tmp_path / "sharded"), resumed, resume=True)
+    assert "이전 실행에서 완료되어 건너뛴 파일 수: 20" in [e[1] for e in resumed.queue if e[0] == 'log'][-1]
@@ -0,0 +1,40 @@
+# tests/test_startup.py
+import queue
+import subprocess
+import sys
+
+from src import paths
+from src.startup import StartupTasks, prewarm
+
+def test_binary_versions_are_probed_once(monkeypatch):
+    """바뀌지 않은 도구의 버전 확인은 캐시되어 한 번만 실행되는지 테스트합니다."""
+    calls = []
+    original = paths.subprocess.run
+    monkeypatch.setattr(paths.subprocess, "run", lambda *a, **k: calls.append(a) or original(*a, **k))
+    first = paths.get_binary_versions()
+    count = len(calls)
+    assert set(first) == set(paths.VERSION_ARGS)
+    assert paths.get_binary_versions() == first
+    assert len(calls) == count
+
+def test_tasks_report_tools_and_prewarm():
+    """시작 작업이 도구 확인 결과를 로그 이벤트로 보내고 모듈을 미리 임포트하는지 테스트합니다."""
+    events = queue.Queue()
+    tasks = StartupTasks(events, modules=("json", ".summary", "no_such_module_mdns"))
+    tasks.start()
+    tasks.join(timeout=30)
+    assert not tasks.is_alive()
+    kind, message = events.get_nowait()
+    assert kind == 'log' and "외부 도구" in message
+    assert "src.summary" in sys.modules
+    assert tasks.prewarm_seconds >= 0.0
+
+def test_gui_import_does_not_load_heavy_modules():
+    """gui 임포트만으로는 orchestrator/Pillow/piexif가 로드되지 않는지 테스트합니다. (창 표시 지연 방지)"""
+    probe = "import sys, src.gui; print(any(m in sys.modules for m in ('src.orchestrator', 'PIL', 'piexif')))"
+    out = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+
+def test_prewarm_ignores_import_errors():
+    """임포트에 실패한 모듈은 예열에서 무시되는지 테스트합니다."""
+    assert prewarm(("no_such_module_mdns",)) >= 0.0
@@ -0,0 +1,52 @@
+# tests/test_thumbnails.py
+import io
+import queue
+import piexif
+from PIL import Image
+from src.orchestrator import process_files
+from src.thumbnails import ThumbnailCache, read_thumbnail_index, THUMBNAIL_CACHE_FILENAME
+
+def test_thumbnail_cache_ignores_truncated_tail_and_resumes(tmp_path):
+    """끊긴 마지막 레코드는 무시되고, 재개 시 잘라낸 뒤 이어서 기록되는지 테스트합니다."""
+    cache = ThumbnailCache(tmp_path)
+    cache.add(tmp_path / "a" / "IMG_1.jpg", b"first")
+    cache.add(tmp_path / "IMG_2.jpg", b"second")
+    cache.close()
+    with open(cache.path, 'ab') as f:
+        f.write(b"\x05\x00\xff") # 헤더 도중 끊김
+
+    index, _ = read_thumbnail_index(cache.path)
+    assert sorted(index) == ["IMG_2.jpg", "a/IMG_1.jpg"]
+
+    cache = ThumbnailCache(tmp_path, resume=True)
+    cache.add(tmp_path / "IMG_2.jpg", b"replaced")
+    cache.close()
+    index, valid_end = read_thumbnail_index(cache.path)
+    assert valid_end == cache.path.stat().st_size
+    offset, length = index["IMG_2.jpg"]
+    with open(cache.path, 'rb') as f:
+        f.seek(offset)
+        assert f.read(length) == b"replaced"
+
+def test_pipeline_writes_thumbnails_under_final_names(tmp_path):
+    """EXIF 내장 썸네일은 그대로, 없으면 생성한 썸네일이 최종 파일명으로 기록되는지 테스트합니다."""
+    (tmp_path / "2026-01-05").mkdir()
+    embedded = io.BytesIO()
+    Image.new("RGB", (4, 4), (0, 255, 0)).save(embedded, "jpeg")
+    exif = piexif.dump({"0th": {}, "Exif": {}, "1st": {piexif.ImageIFD.JPEGInterchangeFormat: 0}, "thumbnail": embedded.getvalue()})
+    Image.new("RGB", (64, 64), (255, 0, 0)).save(tmp_path / "2026-01-05" / "img_0001.jpg", exif=exif)
+    Image.new("RGB", (640, 480), (0, 0, 255)).save(tmp_path / "2026-01-05" / "DSC0002.jpg")
+
+    process_files(str(tmp_path), queue.Queue(), thumbnails=True)
+
+    cache_path = tmp_path / "result" / THUMBNAIL_CACHE_FILENAME
+    index, _ = read_thumbnail_index(cache_path)
+    generated = [name for name in index if name != "2026-01-05/IMG_0001.jpg"]
+    assert len(index) == 2 and len(generated) == 1
+    with open(cache_path, 'rb') as f:
+        offset, length = index["2026-01-05/IMG_0001.jpg"]
+        f.seek(offset)
+        assert f.read(length) == piexif.load(str(tmp_path / "result" / "2026-01-05" / "IMG_0001.jpg"))["thumbnail"]
+        offset, length = index[generated[0]]
+        f.seek(offset)
+        assert max(Image.open(io.BytesIO(f.read(length))).size) <= 160
@@ -0,0 +1,79 @@
+# tests/test_watcher.py
+import sys
+import queue
+import piexif
+import pytest
+from PIL import Image
+from src.daemon import WatchDaemon
+from src.watcher import Debouncer, InotifyWatcher
+
+def _date_time_original(path):
+    return piexif.load(str(path))["Exif"][piexif.ExifIFD.DateTimeOriginal].decode()
+
+def test_debouncer_waits_until_file_is_stable(tmp_path):
+    """마지막 변경 후 대기 시간이 지나고 크기가 그대로인 파일만 준비된 것으로 보는지 테스트합니다."""
+    now = [0.0]
+    debouncer = Debouncer(settle_seconds=5, clock=lambda: now[0])
+    path = tmp_path / "clip.mp4"
+    path.write_bytes(b"a")
+    debouncer.touch(str(path))
+    now[0] = 3
+    assert debouncer.ready() == []
+    path.write_bytes(b"ab") # 아직 기록 중
+    now[0] = 6
+    assert debouncer.ready() == [] # 바뀐 것을 확인하고 다시 대기
+    now[0] = 12
+    assert debouncer.ready() == [str(path)]
+    assert len(debouncer) == 0
+
+def test_watch_daemon_processes_new_files_and_keeps_offsets(tmp_path):
+    """감시 모드가 새 파일만 처리하고, 스코프 오프셋이 재시작 후에도 이어지는지 테스트합니다."""
+    scope = tmp_path / "2026-01-05"
+    scope.mkdir()
+    Image.new("RGB", (8, 8), (255, 0, 0)).save(scope / "DSC0001.jpg")
+    result = tmp_path / "result" / "2026-01-05"
+
+    daemon = WatchDaemon(str(tmp_path), queue.Queue(), settle_seconds=0, poll_interval=0, use_inotify=False)
+    assert daemon.run_once(timeout=0) == 1
+    Image.new("RGB", (8, 8), (0, 255, 0)).save(scope / "DSC0002.jpg")
+    assert daemon.run_once(timeout=0) == 1
+    assert daemon.run_once(timeout=0) == 0 # 이미 처리한 파일은 다시 처리하지 않음
+    daemon.close()
+
+    daemon = WatchDaemon(str(tmp_path), queue.Queue(), settle_seconds=0, poll_interval=0, use_inotify=False)
+    Image.new("RGB", (8, 8), (0, 0, 255)).save(scope / "DSC0003.jpg")
+    assert daemon.run_once(timeout=0) == 1
+    assert daemon.metrics_snapshot()["files"] == 1
+    daemon.close()
+
+    times = sorted(_date_time_original(p) for p in result.iterdir())
+    assert times == ["2026:01:05 09:00:00", "2026:01:05 09:00:01", "2026:01:05 09:00:02"]
+    assert (tmp_path / "result" / ".mdns_watch_metrics.json").exists()
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify는 Linux 전용")
+def test_inotify_watcher_reports_files_in_new_directories(tmp_path):
+    """새로 만든 하위 디렉토리의 파일도 보고하고, 결과 폴더는 감시하지 않는지 테스트합니다."""
+    (tmp_path / "result").mkdir()
+    watcher = InotifyWatcher(tmp_path, exclude=tmp_path / "result")
+    try:
+        (tmp_path / "dump").mkdir()
+        (tmp_path / "dump" / "IMG_1.jpg").write_bytes(b"x")
+        (tmp_path / "result" / "IMG_2.jpg").write_bytes(b"x")
+        changed = set()
+        for _ in range(5):
+            changed.update(watcher.poll(0.2))
+        assert changed == {str(tmp_path / "dump" / "IMG_1.jpg")}
+    finally:
+        watcher.close()
+
+def test_watch_cli_exits_with_error_when_worker_fails(tmp_path, monkeypatch):
+    """감시 작업이 예외로 멈추면 'error' 이벤트를 보내고 CLI가 멈추지 않고 0이 아닌 코드로 끝나는지 테스트합니다."""
+    from src import daemon
+    monkeypatch.chdir(tmp_path) # error.log 위치
+    def fail(self, timeout=1.0):
+        raise OSError(28, "inotify watch limit reached")
+    monkeypatch.setattr(daemon.WatchDaemon, "run_once", fail)
+    source = tmp_path / "src"
+    source.mkdir()
+    assert daemon.main([str(source), "--polling", "--settle", "0", "--poll-interval", "0"]) == 1
+    assert "Stage: WATCH" in (tmp_path / "logs" / "error.log").read_text(encoding="utf-8")